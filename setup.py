@@ -26,7 +26,13 @@ setup(
     author="R. Moorman <rob@vicktor.nl>",
     install_requires=install_requires,
     tests_requires=tests_requires,
-    extras_require={"test": tests_requires},
+    extras_require={
+        "test": tests_requires,
+        "orjson": ["orjson"],
+        "columnar": ["pyarrow"],
+        "zstd": ["zstandard"],
+        "pdf": ["pypdf"],
+    },
     package_dir={"": "src"},
     packages=find_packages("src"),
     include_package_data=True,
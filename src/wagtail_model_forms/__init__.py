@@ -1,54 +1,62 @@
+from functools import lru_cache
+
 from django.core.exceptions import ImproperlyConfigured
 
 from wagtail_model_forms import settings
 
 
-def get_form_model():
+@lru_cache(maxsize=None)
+def get_model_from_setting(name):
+    """
+    Returns the model of a WAGTAIL_MODEL_FORMS_*_MODEL setting, resolved once per process.
+    """
     from django.apps import apps
 
-    model_string = settings.FORM_MODEL
+    model_string = getattr(settings, name)
     try:
         return apps.get_model(model_string, require_ready=False)
     except ValueError:
         raise ImproperlyConfigured(
-            "WAGTAIL_MODEL_FORMS_FORM_MODEL must be of the form 'app_label.model_name'"
+            "WAGTAIL_MODEL_FORMS_%s must be of the form 'app_label.model_name'" % name
         )
     except LookupError:
         raise ImproperlyConfigured(
-            "WAGTAIL_MODEL_FORMS_FORM_MODEL refers to model '%s' that has not been installed"
-            % model_string
+            "WAGTAIL_MODEL_FORMS_%s refers to model '%s' that has not been installed"
+            % (name, model_string)
         )
 
 
-def get_submission_model():
-    from django.apps import apps
+def get_form_model():
+    return get_model_from_setting("FORM_MODEL")
 
-    model_string = settings.SUBMISSION_MODEL
-    try:
-        return apps.get_model(model_string, require_ready=False)
-    except ValueError:
-        raise ImproperlyConfigured(
-            "WAGTAIL_MODEL_FORMS_SUBMISSION_MODEL must be of the form 'app_label.model_name'"
-        )
-    except LookupError:
-        raise ImproperlyConfigured(
-            "WAGTAIL_MODEL_FORMS_SUBMISSION_MODEL refers to model '%s' that has not been installed"
-            % model_string
-        )
+
+def get_submission_model():
+    return get_model_from_setting("SUBMISSION_MODEL")
 
 
 def get_uploaded_file_model():
-    from django.apps import apps
+    return get_model_from_setting("UPLOADED_FILE_MODEL")
 
-    model_string = settings.UPLOADED_FILE_MODEL
-    try:
-        return apps.get_model(model_string, require_ready=False)
-    except ValueError:
-        raise ImproperlyConfigured(
-            "WAGTAIL_MODEL_FORMS_UPLOADED_FILE_MODEL must be of the form 'app_label.model_name'"
-        )
-    except LookupError:
-        raise ImproperlyConfigured(
-            "WAGTAIL_MODEL_FORMS_UPLOADED_FILE_MODEL refers to model '%s' that has not been installed"
-            % model_string
-        )
+
+def get_statistic_model():
+    return get_model_from_setting("STATISTIC_MODEL")
+
+
+def get_webhook_queue_model():
+    return get_model_from_setting("WEBHOOK_QUEUE_MODEL")
+
+
+def get_webhook_delivery_model():
+    return get_model_from_setting("WEBHOOK_DELIVERY_MODEL")
+
+
+def get_export_job_model():
+    return get_model_from_setting("EXPORT_JOB_MODEL")
+
+
+def get_schema_model():
+    return get_model_from_setting("SCHEMA_MODEL")
+
+
+def get_erasure_checkpoint_model():
+    return get_model_from_setting("ERASURE_CHECKPOINT_MODEL")
@@ -0,0 +1,52 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+
+from wagtail_model_forms import get_form_model
+from wagtail_model_forms.choices import get_choice_source
+from wagtail_model_forms.definitions import get_form_definition
+from wagtail_model_forms.settings import FORM_DEFINITION_MAX_AGE
+
+CHOICE_SOURCE_PAGE_SIZE = 20
+
+
+@require_GET
+def choice_source_autocomplete(request, name):
+    try:
+        source = get_choice_source(name)
+    except KeyError:
+        raise Http404
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+
+    choices, more = source.search(
+        request.GET.get("q", ""), page=page, page_size=CHOICE_SOURCE_PAGE_SIZE
+    )
+    return JsonResponse(
+        {
+            "results": [{"id": value, "text": label} for value, label in choices],
+            "pagination": {"more": more},
+        }
+    )
+
+
+@require_GET
+def form_definition(request, pk):
+    form = get_object_or_404(get_form_model(), pk=pk)
+    content = json.dumps(
+        get_form_definition(form), cls=DjangoJSONEncoder, separators=(",", ":")
+    ).encode()
+
+    # A strong ETag of the content, so clients and caches can revalidate
+    etag = '"%s"' % hashlib.sha256(content).hexdigest()[:32]
+    response = HttpResponse(content, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=FORM_DEFINITION_MAX_AGE)
+    return get_conditional_response(request, etag=etag, response=response)
@@ -0,0 +1,31 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete
+
+
+class WagtailModelFormsAppConfig(AppConfig):
+    name = "wagtail_model_forms"
+
+    def ready(self):
+        from wagtail_model_forms import get_submission_model, get_uploaded_file_model
+        from wagtail_model_forms.settings import (
+            STATISTIC_MODEL,
+            SUBMISSION_MODEL,
+            UPLOADED_FILE_DEDUPLICATION,
+            UPLOADED_FILE_MODEL,
+        )
+        from wagtail_model_forms.statistics import form_submission_deleted
+        from wagtail_model_forms.uploads import uploaded_file_deleted
+
+        if UPLOADED_FILE_DEDUPLICATION and UPLOADED_FILE_MODEL:
+            post_delete.connect(
+                uploaded_file_deleted,
+                sender=get_uploaded_file_model(),
+                dispatch_uid="wagtail_model_forms_uploaded_file_deleted",
+            )
+
+        if STATISTIC_MODEL and SUBMISSION_MODEL:
+            post_delete.connect(
+                form_submission_deleted,
+                sender=get_submission_model(),
+                dispatch_uid="wagtail_model_forms_form_submission_deleted",
+            )
@@ -7,6 +7,9 @@ from wagtail.blocks import StructBlockValidationError
 from wagtail.fields import StreamField
 from wagtail.snippets.blocks import SnippetChooserBlock
 
+from wagtail_model_forms.choices import get_choice_source_choices
+from wagtail_model_forms.mixins import get_form_action
+from wagtail_model_forms.prefetch import get_form_map, prefetch_forms
 from wagtail_model_forms.settings import FORM_MODEL
 
 
@@ -184,7 +187,32 @@ class MultipleSelectFieldBlock(ChoicesMixin, AbstractFormFieldBlock):
         label = _("Multiselect")
 
 
+class ChoiceSourceFieldBlock(PlaceholderMixin, AbstractFormFieldBlock):
+    source = blocks.ChoiceBlock(
+        choices=get_choice_source_choices,
+        label=_("Source"),
+        help_text=_("The registered source the choices are loaded from"),
+    )
+
+    class Meta:
+        icon = "list-ul"
+        label = _("Choices from source")
+
+
 class FileFieldBlock(AbstractFormFieldBlock):
+    max_size = blocks.IntegerBlock(
+        required=False,
+        min_value=1,
+        label=_("Max size (MB)"),
+    )
+    allowed_types = blocks.CharBlock(
+        required=False,
+        label=_("Allowed file types"),
+        help_text=_(
+            "Comma-separated list of MIME types, e.g. application/pdf, image/*"
+        ),
+    )
+
     class Meta:
         icon = "doc-full"
         label = _("File")
@@ -205,6 +233,7 @@ CHOICE_FIELDBLOCKS = [
     ("radio", RadioFieldBlock()),
     ("checkbox", CheckboxFieldBlock()),
     ("checkboxes", CheckboxesFieldBlock()),
+    ("choicesource", ChoiceSourceFieldBlock()),
 ]
 
 UTILITY_FIELDBLOCKS = [
@@ -264,6 +293,7 @@ FIELDBLOCKS = StreamField(
         ("checkbox", CheckboxFieldBlock()),
         ("checkboxes", CheckboxesFieldBlock()),
         ("multiselect", MultipleSelectFieldBlock()),
+        ("choicesource", ChoiceSourceFieldBlock()),
         ("file", FileFieldBlock()),
         ("hidden", HiddenFieldBlock()),
     ],
@@ -274,8 +304,25 @@ FIELDBLOCKS = StreamField(
 )
 
 
+class FormChooserBlock(SnippetChooserBlock):
+    """
+    Resolves the forms from the identity map of the page being served, so the forms of
+    all FormBlocks on a page are loaded with a single query.
+    """
+
+    def to_python(self, value):
+        return self.bulk_to_python([value])[0]
+
+    def bulk_to_python(self, values):
+        form_map = get_form_map()
+        if form_map is None:
+            return super().bulk_to_python(values)
+        prefetch_forms(values, form_map)
+        return [form_map.get(int(x)) if x is not None else None for x in values]
+
+
 class AbstractFormBlock(blocks.StructBlock):
-    form = SnippetChooserBlock(FORM_MODEL)
+    form = FormChooserBlock(FORM_MODEL)
 
     class Meta:
         abstract = True
@@ -289,8 +336,12 @@ class AbstractFormBlock(blocks.StructBlock):
 
         if request.method == "POST" and "form_id" in request.POST:
             user = request.user
+            bound_forms = getattr(request, "_wagtail_model_forms_bound", {})
 
-            if str(form_obj.id) == str(request.POST.get("form_id")):
+            if form_obj.id in bound_forms:
+                # Reuse the form which handle_form_request already validated
+                form = bound_forms[form_obj.id]
+            elif str(form_obj.id) == str(request.POST.get("form_id")):
                 form = form_obj.get_form(
                     request.POST, request.FILES, page=page, user=user
                 )
@@ -301,6 +352,7 @@ class AbstractFormBlock(blocks.StructBlock):
             form = form_obj.get_form(page=page, user=user)
 
         context["form"] = form
+        context["form_action"] = get_form_action(request, form_obj.id)
         return context
 
 
@@ -340,6 +392,28 @@ class WebhookBlock(blocks.StructBlock):
         help_text=_("Optional mapping template for the webhook request"),
     )
 
+    batch_enabled = blocks.BooleanBlock(
+        required=False,
+        label=_("Batch requests"),
+        help_text=_(
+            "Queue the payloads and send them as a JSON array in a single request per endpoint"
+        ),
+    )
+    batch_size = blocks.IntegerBlock(
+        default=100,
+        min_value=1,
+        required=False,
+        label=_("Batch size"),
+        help_text=_("Maximum number of payloads per request"),
+    )
+    batch_max_latency = blocks.IntegerBlock(
+        default=60,
+        min_value=0,
+        required=False,
+        label=_("Batch max latency"),
+        help_text=_("Maximum number of seconds a payload waits before it is sent"),
+    )
+
     class Meta:
         label = _("Webhook")
 
@@ -353,3 +427,53 @@ class WebhookBlock(blocks.StructBlock):
                     block_errors={"request_body": ValidationError(str(err))}
                 )
         return result
+
+
+class ErasureRuleBlock(blocks.StructBlock):
+    field_type = blocks.ChoiceBlock(
+        required=False,
+        label=_("Field type"),
+        choices=[
+            (name, block.meta.label or name) for name, block in COMMON_FIELDBLOCKS
+        ],
+        help_text=_("Apply the rule to all fields of this type"),
+    )
+    field_name = blocks.CharBlock(
+        required=False,
+        label=_("Field name"),
+        help_text=_(
+            "Apply the rule to the field with this name, e.g. email or details.email"
+        ),
+    )
+    action = blocks.ChoiceBlock(
+        label=_("Action"),
+        choices=(
+            ("erase", _("Erase")),
+            ("pseudonymize", _("Pseudonymize")),
+        ),
+        default="erase",
+        help_text=_(
+            "Erasing a file field deletes the uploaded files of the submission"
+        ),
+    )
+    after_days = blocks.IntegerBlock(
+        default=90,
+        min_value=0,
+        label=_("After days"),
+        help_text=_("Apply the rule to submissions older than this number of days"),
+    )
+
+    class Meta:
+        label = _("Erasure rule")
+
+    def clean(self, value):
+        result = super().clean(value)
+        if not result.get("field_type") and not result.get("field_name"):
+            raise StructBlockValidationError(
+                block_errors={
+                    "field_name": ValidationError(
+                        _("Enter a field name or choose a field type")
+                    )
+                }
+            )
+        return result
@@ -0,0 +1,177 @@
+import threading
+import time
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.urls import NoReverseMatch, reverse
+from django.utils.translation import gettext_lazy as _
+
+_choice_sources = {}
+
+
+class ChoiceSource:
+    """
+    A named source of choices, loaded from a callable or a queryset and cached for `ttl` seconds.
+
+    The values are kept in a set as well, so validating a submitted value is a
+    constant time lookup regardless of the number of choices.
+    """
+
+    def __init__(
+        self, name, source, label=None, ttl=300, value_field="pk", label_field=None
+    ):
+        self.name = name
+        self.source = source
+        self.label = label or name
+        self.ttl = ttl
+        self.value_field = value_field
+        self.label_field = label_field
+        self._lock = threading.Lock()
+        self._expires_at = 0
+        self._choices = []
+        self._values = frozenset()
+
+    def load_choices(self):
+        if isinstance(self.source, QuerySet):
+            queryset = self.source.all()
+            if self.label_field:
+                return [
+                    (str(value), str(label))
+                    for value, label in queryset.values_list(
+                        self.value_field, self.label_field
+                    )
+                ]
+            return [(str(getattr(x, self.value_field)), str(x)) for x in queryset]
+
+        choices = []
+        for choice in self.source():
+            if isinstance(choice, (list, tuple)):
+                choices.append((str(choice[0]), str(choice[1])))
+            else:
+                choices.append((str(choice), str(choice)))
+        return choices
+
+    def refresh(self):
+        choices = self.load_choices()
+        with self._lock:
+            self._choices = choices
+            self._values = frozenset(value for value, label in choices)
+            self._expires_at = time.monotonic() + self.ttl
+
+    def clear(self):
+        with self._lock:
+            self._expires_at = 0
+
+    def ensure_loaded(self):
+        if time.monotonic() >= self._expires_at:
+            self.refresh()
+
+    def get_choices(self):
+        self.ensure_loaded()
+        return self._choices
+
+    def get_values(self):
+        self.ensure_loaded()
+        return self._values
+
+    def search(self, query="", page=1, page_size=20):
+        """
+        Returns a page of (value, label) choices whose label contains the query and
+        whether there are more results.
+
+        Queryset sources with a label field are searched in the database, the
+        choices of other sources are scanned.
+        """
+        start = (page - 1) * page_size
+        if query and isinstance(self.source, QuerySet) and self.label_field:
+            queryset = self.source.filter(
+                **{"%s__icontains" % self.label_field: query}
+            ).values_list(self.value_field, self.label_field)
+            # One extra row tells whether there are more results
+            choices = [
+                (str(value), str(label))
+                for value, label in queryset[start : start + page_size + 1]
+            ]
+            return choices[:page_size], len(choices) > page_size
+
+        query = query.casefold()
+        choices = self.get_choices()
+        if query:
+            choices = [x for x in choices if query in x[1].casefold()]
+        return choices[start : start + page_size], len(choices) > start + page_size
+
+    def get_label(self, value):
+        for choice_value, label in self.get_choices():
+            if choice_value == value:
+                return label
+        return value
+
+
+def register_choice_source(name, source, **kwargs):
+    """
+    Register a callable returning choices ([(value, label),] or [value,]) or a queryset
+    as a choice source which can be selected by the choice source field.
+    """
+    _choice_sources[name] = ChoiceSource(name, source, **kwargs)
+    return _choice_sources[name]
+
+
+def get_choice_source(name):
+    return _choice_sources[name]
+
+
+def get_choice_source_choices():
+    return [(name, source.label) for name, source in _choice_sources.items()]
+
+
+class ChoiceSourceInput(forms.TextInput):
+    """
+    A text input pointing to the autocomplete endpoint of the choice source, the options
+    are not rendered into the HTML.
+    """
+
+    class Media:
+        js = ["wagtail_model_forms/js/choice-source.js"]
+
+    def __init__(self, source_name, attrs=None):
+        self.source_name = source_name
+        super().__init__(attrs)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        try:
+            context["widget"]["attrs"]["data-autocomplete-url"] = reverse(
+                "wagtail_model_forms_choice_source", args=[self.source_name]
+            )
+        except NoReverseMatch:
+            pass
+        return context
+
+
+class ChoiceSourceField(forms.CharField):
+    default_error_messages = {
+        "invalid_choice": _(
+            "Select a valid choice. %(value)s is not one of the available choices."
+        ),
+    }
+
+    def __init__(self, source_name, **kwargs):
+        self.source_name = source_name
+        kwargs.setdefault("widget", ChoiceSourceInput(source_name))
+        super().__init__(**kwargs)
+
+    def validate(self, value):
+        super().validate(value)
+        if value in self.empty_values:
+            return
+        try:
+            values = get_choice_source(self.source_name).get_values()
+        except KeyError:
+            values = frozenset()
+        if value not in values:
+            raise ValidationError(
+                self.error_messages["invalid_choice"],
+                code="invalid_choice",
+                params={"value": value},
+            )
@@ -0,0 +1,218 @@
+import datetime
+from decimal import Context, Decimal, InvalidOperation
+
+from django.utils.dateparse import parse_date, parse_datetime
+
+from wagtail_model_forms.schema import get_schema_fields, get_schemas
+from wagtail_model_forms.settings import SCHEMA_MODEL
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+COLUMNAR_FORMATS = ["parquet", "arrow"]
+
+DECIMAL_PRECISION = 38
+DECIMAL_SCALE = 10
+# Independent of the decimal context of the thread, which defaults to 28 digits
+DECIMAL_CONTEXT = Context(prec=DECIMAL_PRECISION)
+DECIMAL_QUANTUM = Decimal(1).scaleb(-DECIMAL_SCALE)
+DECIMAL_MAX = Decimal(10) ** (DECIMAL_PRECISION - DECIMAL_SCALE)
+
+FIELD_TYPES = {
+    "number": "decimal",
+    "date": "date",
+    "datetime": "timestamp",
+    "checkbox": "bool",
+    "checkboxes": "list",
+    "multiselect": "list",
+    "file": None,
+}
+
+BASE_COLUMNS = [
+    ("id", "int"),
+    ("form_id", "int"),
+    ("page_id", "int"),
+    ("submit_time", "timestamp"),
+    ("status", "string"),
+]
+
+
+def get_field_columns(fields):
+    """
+    Returns [(name, type),] for a field spec, the types are derived from the
+    field blocks.
+    """
+    columns = []
+    for field in fields:
+        column_type = FIELD_TYPES.get(field["type"], "string")
+        if column_type:
+            columns.append((field["name"], column_type))
+    return columns
+
+
+def get_columns(field_specs):
+    """
+    Returns the columns of the submissions made with the field specs, a field
+    which has different types across the specs becomes a string column.
+    """
+    columns = dict(BASE_COLUMNS)
+    for fields in field_specs:
+        for name, column_type in get_field_columns(fields):
+            if name in columns and columns[name] != column_type:
+                columns[name] = "string"
+            else:
+                columns[name] = column_type
+    return list(columns.items())
+
+
+def get_queryset_columns(queryset):
+    """
+    Returns the columns of a submission queryset, from the stored schemas of
+    the submissions and the current fields of their forms.
+    """
+    from wagtail_model_forms import get_form_model
+
+    forms = get_form_model().objects.filter(pk__in=queryset.order_by().values("form"))
+    field_specs = [get_schema_fields(form) for form in forms]
+    if SCHEMA_MODEL:
+        digests = queryset.order_by().values_list("schema_digest", flat=True)
+        field_specs += get_schemas(digests.distinct()).values()
+    return get_columns(field_specs)
+
+
+def get_arrow_type(column_type):
+    return {
+        "int": pyarrow.int64(),
+        "string": pyarrow.string(),
+        "decimal": pyarrow.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE),
+        "date": pyarrow.date32(),
+        "timestamp": pyarrow.timestamp("us", tz="UTC"),
+        "bool": pyarrow.bool_(),
+        "list": pyarrow.list_(pyarrow.string()),
+    }[column_type]
+
+
+def get_arrow_schema(columns):
+    return pyarrow.schema(
+        [(name, get_arrow_type(column_type)) for name, column_type in columns]
+    )
+
+
+def convert_decimal(value):
+    """
+    Returns a number rounded to the scale of the decimal column, or None when it
+    is not a number. Raises ValueError when it does not fit in the column.
+    """
+    try:
+        number = DECIMAL_CONTEXT.create_decimal(str(value))
+    except InvalidOperation:
+        return None
+    if not number.is_finite():
+        return None
+    if abs(number) >= DECIMAL_MAX:
+        raise ValueError(
+            "%s does not fit in a decimal(%s, %s) column"
+            % (value, DECIMAL_PRECISION, DECIMAL_SCALE)
+        )
+    return number.quantize(DECIMAL_QUANTUM, context=DECIMAL_CONTEXT)
+
+
+def convert_value(value, column_type):
+    if value is None or value == "":
+        return None
+    if column_type == "decimal":
+        return convert_decimal(value)
+    try:
+        if column_type == "string":
+            return value if isinstance(value, str) else str(value)
+        if column_type == "date":
+            return value if isinstance(value, datetime.date) else parse_date(value)
+        if column_type == "timestamp":
+            if isinstance(value, datetime.datetime):
+                return value
+            return parse_datetime(value)
+        if column_type == "bool":
+            return bool(value)
+        if column_type == "list":
+            if isinstance(value, (list, tuple)):
+                return [str(x) for x in value]
+            return [str(value)]
+    except (ValueError, TypeError):
+        return None
+    return value
+
+
+class ColumnarWriter:
+    """
+    Writes submissions to a Parquet or Arrow IPC file in record batches.
+    """
+
+    def __init__(self, output, columns, file_format="parquet", batch_size=10000):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required for the columnar export")
+        if file_format not in COLUMNAR_FORMATS:
+            raise ValueError("Unknown columnar format '%s'" % file_format)
+
+        self.columns = columns
+        self.schema = get_arrow_schema(columns)
+        self.batch_size = batch_size
+        self.rows = {name: [] for name, column_type in columns}
+        self.count = 0
+        self.mappings = {}
+
+        if file_format == "parquet":
+            self.writer = pyarrow.parquet.ParquetWriter(output, self.schema)
+        else:
+            self.writer = pyarrow.ipc.new_file(output, self.schema)
+
+    def get_mapping(self, form_submission):
+        """
+        Returns [(name, type, exported),] for the data columns, mapped once per
+        schema instead of once per submission.
+        """
+        key = form_submission.schema_digest or form_submission.form_id
+        if key not in self.mappings:
+            names = {x["name"] for x in form_submission.get_schema_fields()}
+            self.mappings[key] = [
+                (name, column_type, name in names)
+                for name, column_type in self.columns[len(BASE_COLUMNS) :]
+            ]
+        return self.mappings[key]
+
+    def write(self, form_submission):
+        self.rows["id"].append(form_submission.pk)
+        self.rows["form_id"].append(form_submission.form_id)
+        self.rows["page_id"].append(form_submission.page_id)
+        self.rows["submit_time"].append(form_submission.submit_time)
+        self.rows["status"].append(form_submission.status)
+        data = form_submission.data
+        for name, column_type, exported in self.get_mapping(form_submission):
+            if exported:
+                try:
+                    value = convert_value(data.get(name), column_type)
+                except ValueError as err:
+                    raise ValueError(
+                        "Submission #%s, field %s: %s" % (form_submission.pk, name, err)
+                    )
+                self.rows[name].append(value)
+            else:
+                self.rows[name].append(None)
+        self.count += 1
+        if self.count >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.count:
+            return
+        batch = pyarrow.RecordBatch.from_pydict(self.rows, schema=self.schema)
+        self.writer.write_batch(batch)
+        self.rows = {name: [] for name in self.rows}
+        self.count = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
@@ -0,0 +1,104 @@
+import base64
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from wagtail_model_forms.settings import (
+    FORM_DATA_COMPRESSION,
+    FORM_DATA_COMPRESSION_MIN_SIZE,
+)
+
+try:
+    from compression import zstd
+except ImportError:  # pragma: no cover
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+COMPRESSION_ALGORITHMS = ["zlib", "zstd"]
+
+# Plain form data is a JSON object and starts with "{", compressed form data
+# is a header and the base64 encoded payload: "~zlib:eJy..."
+COMPRESSION_HEADER = "~%s:"
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def compress(data, algorithm):
+    if algorithm == "zlib":
+        return zlib.compress(data, ZLIB_LEVEL)
+    if algorithm == "zstd":
+        if zstd is None:
+            raise ImportError("zstandard is required for zstd compression")
+        return zstd.compress(data, ZSTD_LEVEL)
+    raise ValueError("Unknown compression algorithm '%s'" % algorithm)
+
+
+def decompress(data, algorithm):
+    if algorithm == "zlib":
+        return zlib.decompress(data)
+    if algorithm == "zstd":
+        if zstd is None:
+            raise ImportError("zstandard is required for zstd compression")
+        return zstd.decompress(data)
+    raise ValueError("Unknown compression algorithm '%s'" % algorithm)
+
+
+def get_compression(value):
+    """
+    Returns the algorithm a stored form data value is compressed with, or None.
+    """
+    if isinstance(value, str) and value.startswith("~"):
+        algorithm = value[1 : value.find(":")]
+        if algorithm in COMPRESSION_ALGORITHMS:
+            return algorithm
+    return None
+
+
+def encode_form_data(value, algorithm=None, min_size=None):
+    """
+    Compresses the JSON text of form data when it is at least min_size
+    characters and the compressed value is smaller.
+    """
+    if algorithm is None:
+        algorithm = FORM_DATA_COMPRESSION
+    if min_size is None:
+        min_size = FORM_DATA_COMPRESSION_MIN_SIZE
+    if not algorithm or not isinstance(value, str) or len(value) < min_size:
+        return value
+    encoded = (COMPRESSION_HEADER % algorithm) + base64.b64encode(
+        compress(value.encode(), algorithm)
+    ).decode("ascii")
+    return encoded if len(encoded) < len(value) else value
+
+
+def decode_form_data(value):
+    """
+    Returns the JSON text of a stored form data value, compressed or not.
+    """
+    algorithm = get_compression(value)
+    if algorithm is None:
+        return value
+    payload = value[len(COMPRESSION_HEADER % algorithm) :]
+    return decompress(base64.b64decode(payload), algorithm).decode()
+
+
+def dump_form_data(form_data):
+    """
+    Returns the value to store of the form data, compressed with the
+    WAGTAIL_MODEL_FORMS_FORM_DATA_COMPRESSION algorithm.
+    """
+    return encode_form_data(json.dumps(form_data, cls=DjangoJSONEncoder))
+
+
+def recompress_form_data(value, algorithm, min_size=None):
+    """
+    Returns a stored form data value encoded with another algorithm, or
+    decompressed when algorithm is empty.
+    """
+    if not isinstance(value, str):
+        return value
+    return encode_form_data(decode_form_data(value), algorithm, min_size=min_size)
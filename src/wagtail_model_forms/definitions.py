@@ -0,0 +1,145 @@
+from django.urls import NoReverseMatch, reverse
+from django.utils.text import slugify
+
+from wagtail_model_forms.schema import get_schema_digest, get_schema_fields
+from wagtail_model_forms.uploads import parse_allowed_types
+
+JSON_SCHEMA_DIALECT = "https://json-schema.org/draft/2020-12/schema"
+
+JSON_SCHEMA_TYPES = {
+    "singleline": {"type": "string", "maxLength": 255},
+    "multiline": {"type": "string"},
+    "email": {"type": "string", "format": "email"},
+    "url": {"type": "string", "format": "uri"},
+    "number": {"type": "number"},
+    "date": {"type": "string", "format": "date"},
+    "datetime": {"type": "string", "format": "date-time"},
+    "dropdown": {"type": "string"},
+    "radio": {"type": "string"},
+    "checkbox": {"type": "boolean"},
+    "checkboxes": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+    "multiselect": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+    "choicesource": {"type": "string"},
+    "hidden": {"type": "string"},
+    "file": {"type": "string", "format": "binary"},
+}
+
+
+def get_field_definition(block_type, value, clean_name):
+    """
+    Returns the definition of a field as the form builder compiles it.
+    """
+    field = {
+        "name": clean_name,
+        "type": block_type,
+        "label": value["label"],
+        "help_text": str(value.get("help_text") or ""),
+        "required": bool(value.get("required")),
+    }
+    if value.get("placeholder"):
+        field["placeholder"] = value["placeholder"]
+    if value.get("default_value") not in (None, ""):
+        field["default_value"] = value["default_value"]
+    if "choices" in value:
+        field["choices"] = [
+            {"value": str(x["value"]), "default": bool(x["default_value"])}
+            for x in value["choices"]
+        ]
+    if block_type == "choicesource":
+        field["source"] = value["source"]
+        try:
+            field["choices_url"] = reverse(
+                "wagtail_model_forms_choice_source", args=[value["source"]]
+            )
+        except NoReverseMatch:
+            pass
+    if block_type == "file":
+        if value.get("max_size"):
+            field["max_size"] = value["max_size"] * 1024 * 1024
+        field["allowed_types"] = parse_allowed_types(value.get("allowed_types"))
+    return field
+
+
+def get_field_json_schema(field):
+    schema = dict(JSON_SCHEMA_TYPES.get(field["type"], {"type": "string"}))
+    schema["title"] = field["label"]
+    choices = [x["value"] for x in field.get("choices", [])]
+    if schema["type"] == "array":
+        schema["items"] = dict(schema["items"], enum=choices)
+        if field["required"]:
+            schema["minItems"] = 1
+    elif "choices" in field:
+        schema["enum"] = choices
+    elif schema["type"] == "boolean":
+        if field["required"]:
+            schema["const"] = True
+    elif schema["type"] == "string" and field["required"]:
+        schema["minLength"] = 1
+    return schema
+
+
+def get_json_schema(form, fields):
+    """
+    Returns a JSON Schema which validates the submitted values of the fields.
+    """
+    return {
+        "$schema": JSON_SCHEMA_DIALECT,
+        "title": form.title,
+        "type": "object",
+        "properties": {x["name"]: get_field_json_schema(x) for x in fields},
+        "required": [x["name"] for x in fields if x["required"]],
+    }
+
+
+def get_layout(stream, fields, namespace=""):
+    """
+    Returns the fieldsets, fieldrows and fields of the stream as a tree which
+    refers to the fields by name, and collects the field definitions.
+    """
+    from wagtail_model_forms.models import get_field_clean_name
+
+    layout = []
+    for structvalue in stream:
+        block_type = str(structvalue.block_type)
+        value = structvalue.value
+        if block_type == "fieldset":
+            layout.append(
+                {
+                    "type": "fieldset",
+                    "legend": value["legend"],
+                    "children": get_layout(
+                        value["form_fields"], fields, slugify(value["legend"])
+                    ),
+                }
+            )
+        elif block_type == "fieldrow":
+            layout.append(
+                {
+                    "type": "fieldrow",
+                    "children": get_layout(value["form_fields"], fields, namespace),
+                }
+            )
+        else:
+            field = get_field_definition(
+                block_type, value, get_field_clean_name(value, namespace)
+            )
+            fields.append(field)
+            layout.append({"type": "field", "name": field["name"]})
+    return layout
+
+
+def get_form_definition(form):
+    """
+    Returns the definition of a form for headless front ends: the fields,
+    their layout and a JSON Schema of the submitted values.
+    """
+    fields = []
+    layout = get_layout(form.get_form_fields(), fields)
+    return {
+        "id": form.pk,
+        "title": form.title,
+        "schema_digest": get_schema_digest(get_schema_fields(form)),
+        "fields": fields,
+        "layout": layout,
+        "json_schema": get_json_schema(form, fields),
+    }
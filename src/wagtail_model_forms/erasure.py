@@ -0,0 +1,246 @@
+import datetime
+import hashlib
+import json
+import logging
+import time
+
+from django.db import router, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from wagtail_model_forms import (
+    get_erasure_checkpoint_model,
+    get_submission_model,
+    get_uploaded_file_model,
+    get_webhook_delivery_model,
+    get_webhook_queue_model,
+)
+from wagtail_model_forms.compression import dump_form_data
+from wagtail_model_forms.settings import (
+    UPLOADED_FILE_DEDUPLICATION,
+    WEBHOOK_DELIVERY_MODEL,
+    WEBHOOK_QUEUE_MODEL,
+)
+from wagtail_model_forms.uploads import delete_file_if_unreferenced
+
+logger = logging.getLogger(__name__)
+
+ERASE = "erase"
+PSEUDONYMIZE = "pseudonymize"
+
+# Marks pseudonymized values, so they are not hashed again when a rule is rerun
+PSEUDONYM_PREFIX = "pseudonym:"
+
+
+def get_rule_digest(rule):
+    data = json.dumps(rule, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def get_erasure_rules(form):
+    """
+    Returns [(rule_id, rule)] for the erasure rules of a form.
+    """
+    rules = []
+    for block in getattr(form, "erasure_rules", None) or []:
+        rule = {
+            "field_type": block.value.get("field_type") or "",
+            "field_name": block.value.get("field_name") or "",
+            "action": block.value.get("action") or ERASE,
+            "after_days": block.value.get("after_days") or 0,
+        }
+        rules.append((block.id or get_rule_digest(rule)[:36], rule))
+    return rules
+
+
+def get_rule_fields(form, rule):
+    """
+    Returns the names of the fields a rule applies to, and whether it applies
+    to a file field.
+    """
+    from wagtail_model_forms.models import iter_form_fields
+
+    field_names = []
+    has_files = False
+    for clean_name, block_type, value in iter_form_fields(form.get_form_fields()):
+        if rule["field_type"] and block_type != rule["field_type"]:
+            continue
+        if rule["field_name"] and clean_name != rule["field_name"]:
+            continue
+        if block_type == "file":
+            has_files = True
+        else:
+            field_names.append(clean_name)
+    return field_names, has_files
+
+
+def pseudonymize(value):
+    # A hash of a checkbox would keep its value recognizable, it is cleared instead
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, str) and value.startswith(PSEUDONYM_PREFIX):
+        return value
+    digest = salted_hmac("wagtail_model_forms.erasure", str(value), algorithm="sha256")
+    return PSEUDONYM_PREFIX + digest.hexdigest()[:32]
+
+
+def apply_rule(form_data, field_names, action):
+    """
+    Erases or pseudonymizes the fields in form_data, returns whether it changed.
+    """
+    changed = False
+    for field_name in field_names:
+        value = form_data.get(field_name)
+        if value in (None, "", [], False):
+            continue
+        if action == PSEUDONYMIZE:
+            if isinstance(value, list):
+                new_value = [pseudonymize(x) for x in value]
+            else:
+                new_value = pseudonymize(value)
+        elif isinstance(value, list):
+            new_value = []
+        elif isinstance(value, bool):
+            new_value = False
+        else:
+            new_value = ""
+        if new_value != value:
+            form_data[field_name] = new_value
+            changed = True
+    return changed
+
+
+def purge_uploaded_files(form_submission_pks, using=None):
+    """
+    Deletes the uploaded files of the submissions, and their stored files
+    once the transaction is committed. Returns the pks of the submissions
+    which had files.
+    """
+    UploadedFile = get_uploaded_file_model()
+    queryset = UploadedFile.objects.using(using).filter(
+        form_submission__in=form_submission_pks
+    )
+    rows = list(queryset.values_list("form_submission", "file"))
+    names = {name for pk, name in rows if name}
+    queryset.delete()
+    if names and not UPLOADED_FILE_DEDUPLICATION:
+        # With deduplication the post_delete handler deletes the stored files
+        transaction.on_commit(
+            lambda: [
+                delete_file_if_unreferenced(UploadedFile, x, using=using) for x in names
+            ],
+            using=using,
+        )
+    return {pk for pk, name in rows}
+
+
+def purge_webhooks(form_submission_pks, using=None):
+    """
+    Deletes the queued webhook payloads and the webhook deliveries of the
+    submissions, which hold copies of their data.
+    """
+    if WEBHOOK_QUEUE_MODEL:
+        get_webhook_queue_model().objects.using(using).filter(
+            form_submission__in=form_submission_pks
+        ).delete()
+    if WEBHOOK_DELIVERY_MODEL:
+        get_webhook_delivery_model().objects.using(using).filter(
+            form_submission__in=form_submission_pks
+        ).delete()
+
+
+def run_erasure_rule(form, rule_id, rule, batch_size=500, sleep=0, now=None):
+    """
+    Applies a rule to the submissions of a form in keyset ordered batches,
+    each in a short transaction which also stores the checkpoint, so an
+    interrupted run continues after the last committed batch.
+
+    Returns the number of submissions which were changed.
+    """
+    FormSubmission = get_submission_model()
+    Checkpoint = get_erasure_checkpoint_model()
+    using = router.db_for_write(FormSubmission)
+
+    field_names, has_files = get_rule_fields(form, rule)
+    if not field_names and not has_files:
+        return 0
+
+    digest = get_rule_digest(rule)
+    checkpoint, _ = Checkpoint.objects.using(using).get_or_create(
+        form=form, rule=rule_id, defaults={"digest": digest}
+    )
+    if checkpoint.digest != digest:
+        # The rule changed, the submissions before the checkpoint are processed again
+        checkpoint.digest = digest
+        checkpoint.last_pk = 0
+        checkpoint.save(update_fields=["digest", "last_pk", "updated_at"])
+
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=rule["after_days"])
+    queryset = (
+        FormSubmission.objects.using(using)
+        .filter(form=form, submit_time__lt=cutoff)
+        .order_by("pk")
+    )
+
+    total = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=checkpoint.last_pk).values_list("pk", flat=True)[
+                :batch_size
+            ]
+        )
+        if not pks:
+            break
+
+        with transaction.atomic(using=using):
+            purged = set()
+            if has_files and rule["action"] == ERASE:
+                purged = purge_uploaded_files(pks, using=using)
+
+            changed = []
+            if field_names or purged:
+                UploadedFile = get_uploaded_file_model()
+                batch = (
+                    FormSubmission.objects.using(using)
+                    .select_for_update()
+                    .filter(pk__in=pks if field_names else purged)
+                    .only("pk", "form_data")
+                    .prefetch_related(
+                        Prefetch(
+                            "uploaded_files",
+                            queryset=UploadedFile.objects.using(using).only(
+                                "pk", "form_submission", "text"
+                            ),
+                        )
+                    )
+                )
+                for form_submission in batch:
+                    form_data = dict(form_submission.data)
+                    if apply_rule(form_data, field_names, rule["action"]):
+                        form_submission.form_data = dump_form_data(form_data)
+                        del form_submission.data
+                    elif form_submission.pk not in purged:
+                        continue
+                    # Keeps the text of the remaining uploaded files searchable
+                    form_submission.search_document = (
+                        form_submission.get_search_document()
+                    )
+                    changed.append(form_submission)
+                FormSubmission.objects.using(using).bulk_update(
+                    changed, ["form_data", "search_document"]
+                )
+                purge_webhooks([x.pk for x in changed], using=using)
+
+            checkpoint.last_pk = pks[-1]
+            checkpoint.processed += len(changed)
+            checkpoint.save(update_fields=["last_pk", "processed", "updated_at"])
+
+        total += len(changed)
+        logger.info(
+            "Erasure rule %s of form %s: processed up to #%s"
+            % (rule_id, form.pk, checkpoint.last_pk)
+        )
+        if sleep:
+            time.sleep(sleep)
+    return total
@@ -0,0 +1,311 @@
+import csv
+import json
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.core.files import File
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router, transaction
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils import timezone
+
+from wagtail_model_forms import get_export_job_model
+from wagtail_model_forms.settings import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_JOB_TIMEOUT,
+    EXPORT_JOBS_MAX_CONCURRENT,
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_PARAMETERS = ["export", "p", "page"]
+
+
+def get_export_filters(query_params):
+    """
+    Returns the report filters of the query parameters as {name: [value,]}.
+    """
+    return {
+        key: values
+        for key, values in query_params.lists()
+        if key not in EXPORT_PARAMETERS and any(values)
+    }
+
+
+def create_export_job(request, export_format):
+    ExportJob = get_export_job_model()
+    return ExportJob.objects.create(
+        user=request.user if request.user.is_authenticated else None,
+        format=export_format,
+        filters=get_export_filters(request.GET),
+    )
+
+
+def get_report_view():
+    from wagtail_model_forms.views import FormSubmissionReportView
+
+    return FormSubmissionReportView()
+
+
+def get_export_queryset(view, filters):
+    """
+    Returns the submissions of the report with the captured filters applied, in
+    the order of the report.
+    """
+    data = QueryDict(mutable=True)
+    for key, values in filters.items():
+        data.setlist(key, values)
+    queryset = view.get_queryset().prefetch_related("uploaded_files")
+    return view.filterset_class(data, queryset=queryset).qs.order_by(
+        "-submit_time", "-pk"
+    )
+
+
+def iter_chunks(queryset, chunk_size, order_field="pk"):
+    """
+    Yields the items of the queryset in chunks, ordered by order_field and pk
+    descending. A chunk starts after the last item of the previous chunk
+    instead of at an offset.
+    """
+    if order_field == "pk":
+        queryset = queryset.order_by("-pk")
+    else:
+        queryset = queryset.order_by("-%s" % order_field, "-pk")
+    last = None
+    while True:
+        chunk = queryset
+        if last is not None and order_field == "pk":
+            chunk = chunk.filter(pk__lt=last.pk)
+        elif last is not None:
+            value = getattr(last, order_field)
+            chunk = chunk.filter(
+                Q(**{"%s__lt" % order_field: value})
+                | Q(**{order_field: value, "pk__lt": last.pk})
+            )
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            break
+        yield chunk
+        last = chunk[-1]
+
+
+class CsvExportWriter:
+    extension = "csv"
+    mode = "w"
+
+    def __init__(self, view, queryset, output):
+        self.view = view
+        self.writer = csv.DictWriter(output, fieldnames=view.list_export)
+        self.writer.writerow(
+            {field: view.get_heading(queryset, field) for field in view.list_export}
+        )
+
+    def write(self, item):
+        self.view.write_csv_row(self.writer, self.view.to_row_dict(item))
+
+    def close(self):
+        pass
+
+
+class XlsxExportWriter:
+    extension = "xlsx"
+    mode = "wb"
+
+    def __init__(self, view, queryset, output):
+        from openpyxl import Workbook
+        from wagtail.admin.views.mixins import ExcelDateFormatter
+
+        self.view = view
+        self.output = output
+        self.workbook = Workbook(write_only=True, iso_dates=True)
+        self.worksheet = self.workbook.create_sheet(title="Sheet1")
+        self.worksheet.append(
+            view.get_heading(queryset, field) for field in view.list_export
+        )
+        self.date_format = ExcelDateFormatter().get()
+
+    def write(self, item):
+        self.worksheet.append(
+            self.view.generate_xlsx_row(
+                self.worksheet,
+                self.view.to_row_dict(item),
+                date_format=self.date_format,
+            )
+        )
+
+    def close(self):
+        self.workbook.save(self.output)
+
+
+class JsonLinesExportWriter:
+    extension = "jsonl"
+    mode = "w"
+
+    def __init__(self, view, queryset, output):
+        self.output = output
+
+    def write(self, item):
+        row = {
+            "id": item.pk,
+            "form": item.form_id,
+            "form_title": item.form.title,
+            "page": item.page_id,
+            "submit_time": item.submit_time,
+            "status": item.status,
+            "schema_digest": item.schema_digest,
+            "data": dict(item.data),
+            "files": [x.download_url for x in item.uploaded_files.all() if x.file],
+        }
+        self.output.write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+
+    def close(self):
+        pass
+
+
+class ColumnarExportWriter:
+    mode = "wb"
+    file_format = "parquet"
+
+    def __init__(self, view, queryset, output):
+        from wagtail_model_forms.columnar import ColumnarWriter, get_queryset_columns
+
+        self.writer = ColumnarWriter(
+            output, get_queryset_columns(queryset), file_format=self.file_format
+        )
+
+    def write(self, item):
+        self.writer.write(item)
+
+    def close(self):
+        self.writer.close()
+
+
+class ParquetExportWriter(ColumnarExportWriter):
+    extension = "parquet"
+    file_format = "parquet"
+
+
+class ArrowExportWriter(ColumnarExportWriter):
+    extension = "arrow"
+    file_format = "arrow"
+
+
+EXPORT_WRITERS = {
+    "csv": CsvExportWriter,
+    "xlsx": XlsxExportWriter,
+    "jsonl": JsonLinesExportWriter,
+    "parquet": ParquetExportWriter,
+    "arrow": ArrowExportWriter,
+}
+
+
+def run_export_job(job, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write the export of a job to storage in chunks, updating its progress after each chunk.
+    """
+    view = get_report_view()
+    queryset = get_export_queryset(view, job.filters)
+    writer_class = EXPORT_WRITERS[job.format]
+
+    job.total = queryset.count()
+    job.save(update_fields=["total"])
+
+    newline = "" if "b" not in writer_class.mode else None
+    encoding = "utf-8" if "b" not in writer_class.mode else None
+    with tempfile.TemporaryFile(
+        mode=writer_class.mode + "+", newline=newline, encoding=encoding
+    ) as output:
+        writer = writer_class(view, queryset, output)
+        for chunk in iter_chunks(queryset, chunk_size, order_field="submit_time"):
+            for item in chunk:
+                writer.write(item)
+            job.processed += len(chunk)
+            job.save(update_fields=["processed"])
+        writer.close()
+
+        output.seek(0)
+        filename = "%s-%s.%s" % (view.get_filename(), job.pk, writer_class.extension)
+        job.file.save(filename, File(output), save=False)
+
+    job.status = job.Status.COMPLETED
+    job.finished_at = timezone.now()
+    job.save(update_fields=["file", "status", "finished_at"])
+
+
+def reset_stale_export_jobs(timeout=None):
+    """
+    Queue the jobs again which are running for longer than timeout seconds
+    (EXPORT_JOB_TIMEOUT by default), e.g. when their worker was killed. Returns
+    the number of jobs reset.
+    """
+    ExportJob = get_export_job_model()
+    if timeout is None:
+        timeout = EXPORT_JOB_TIMEOUT
+    stale = ExportJob.objects.filter(
+        status=ExportJob.Status.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    total = stale.update(status=ExportJob.Status.PENDING, processed=0, started_at=None)
+    if total:
+        logger.warning("Reset %s stale export jobs" % total)
+    return total
+
+
+def claim_export_job():
+    """
+    Claim the oldest pending job unless the maximum of concurrently running jobs is reached.
+
+    The running jobs are counted and the pending job is claimed in one
+    transaction, jobs which are being claimed by another worker are skipped.
+    """
+    ExportJob = get_export_job_model()
+
+    using = router.db_for_write(ExportJob)
+    with transaction.atomic(using=using):
+        running = len(
+            ExportJob.objects.using(using)
+            .select_for_update()
+            .filter(status=ExportJob.Status.RUNNING)
+            .values_list("pk", flat=True)
+        )
+        if running >= EXPORT_JOBS_MAX_CONCURRENT:
+            return None
+
+        job = (
+            ExportJob.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(status=ExportJob.Status.PENDING)
+            .order_by("pk")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def process_export_jobs(timeout=None):
+    """
+    Run pending export jobs until there are none left, returns the number of jobs run.
+
+    Stale running jobs are queued again first, see reset_stale_export_jobs.
+    """
+    reset_stale_export_jobs(timeout=timeout)
+    total = 0
+    while True:
+        job = claim_export_job()
+        if job is None:
+            return total
+        try:
+            run_export_job(job)
+        except Exception as err:
+            logger.exception("Export job #%s failed" % job.pk)
+            job.status = job.Status.FAILED
+            job.error = str(err)
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at"])
+        total += 1
@@ -0,0 +1,141 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections, router, transaction
+
+from wagtail_model_forms.settings import DEFERRED_HANDLERS, HANDLER_WORKERS
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class SubmissionHandler:
+    """
+    An action which runs after a form is submitted, called as
+    func(form, form_submission, request).
+
+    Handlers run in the order of `order`. A deferred handler runs once the
+    submission is committed, concurrently with the other deferred handlers on
+    a bounded thread pool and without the request, so it is not part of the
+    response time. Its errors are logged and do not affect the other handlers.
+
+    Handlers are deferred with deferred=True or by listing their name in
+    WAGTAIL_MODEL_FORMS_DEFERRED_HANDLERS.
+    """
+
+    def __init__(self, name, func, deferred=False, order=100):
+        self.name = name
+        self.func = func
+        self.deferred = deferred or name in DEFERRED_HANDLERS
+        self.order = order
+
+    def __repr__(self):
+        return "<SubmissionHandler %s%s>" % (
+            self.name,
+            " (deferred)" if self.deferred else "",
+        )
+
+    def __call__(self, form, form_submission, request=None):
+        start = time.perf_counter()
+        try:
+            return self.func(form, form_submission, request)
+        finally:
+            logger.info(
+                "Submission handler %s (FormSubmission#%s) took %.1f ms"
+                % (self.name, form_submission.pk, (time.perf_counter() - start) * 1000)
+            )
+
+
+def register_submission_handler(name, func=None, deferred=False, order=100):
+    """
+    Registers a handler for the submissions of all forms, as a function or as
+    a decorator.
+    """
+    if func is None:
+
+        def decorator(func):
+            register_submission_handler(name, func, deferred=deferred, order=order)
+            return func
+
+        return decorator
+
+    _handlers[name] = SubmissionHandler(name, func, deferred=deferred, order=order)
+    return _handlers[name]
+
+
+def unregister_submission_handler(name):
+    _handlers.pop(name, None)
+
+
+def get_submission_handlers():
+    return list(_handlers.values())
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=HANDLER_WORKERS, thread_name_prefix="wagtail_model_forms"
+            )
+        return _executor
+
+
+def run_deferred_handler(handler, form, form_submission):
+    try:
+        handler(form, form_submission)
+    except Exception:
+        logger.exception(
+            "Submission handler %s failed (FormSubmission#%s)"
+            % (handler.name, form_submission.pk)
+        )
+
+
+def run_deferred_handler_in_thread(handler, form, form_submission):
+    try:
+        run_deferred_handler(handler, form, form_submission)
+    finally:
+        # The connections of the worker thread are not managed by a request
+        connections.close_all()
+
+
+def run_submission_handlers(form, form_submission, handlers, request=None):
+    """
+    Runs the sync handlers now and schedules the deferred handlers to run
+    once the transaction of the submission is committed.
+    """
+    handlers = sorted(handlers, key=lambda x: x.order)
+    deferred = [x for x in handlers if x.deferred]
+
+    for handler in handlers:
+        if not handler.deferred:
+            handler(form, form_submission, request)
+
+    if not deferred:
+        return
+
+    # Deferred handlers keep the context, e.g. reading from the write database
+    context = contextvars.copy_context()
+
+    def run_deferred_handlers():
+        for handler in deferred:
+            if HANDLER_WORKERS:
+                get_executor().submit(
+                    context.copy().run,
+                    run_deferred_handler_in_thread,
+                    handler,
+                    form,
+                    form_submission,
+                )
+            else:
+                context.copy().run(run_deferred_handler, handler, form, form_submission)
+
+    transaction.on_commit(
+        run_deferred_handlers, using=router.db_for_write(type(form_submission))
+    )
@@ -0,0 +1,216 @@
+import csv
+import json
+
+from django.db import router, transaction
+from django.utils import timezone
+from django.utils.datastructures import MultiValueDict
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from wagtail_model_forms import get_submission_model
+from wagtail_model_forms.compression import dump_form_data
+from wagtail_model_forms.utils import get_search_document, preserve_auto_now_add
+
+MULTIPLE_VALUE_TYPES = ["checkboxes", "multiselect"]
+
+TRUE_VALUES = ["1", "true", "yes", "on", "y", "t"]
+
+
+def get_field_mapping(form, columns, mapping=None, labels=None):
+    """
+    Returns {column: (clean_name, block_type)} for the columns which match a
+    field of the form, by the explicit mapping {column: clean_name} or else
+    by the clean name or the label of the field. labels {column: label} are
+    matched against the labels of the fields as well.
+    """
+    from wagtail_model_forms.models import iter_form_fields
+
+    fields = {}
+    lookup = {}
+    for clean_name, block_type, value in iter_form_fields(form.get_form_fields()):
+        if block_type == "file":
+            continue
+        fields[clean_name] = block_type
+        for key in [clean_name, value["label"], slugify(value["label"])]:
+            lookup.setdefault(key, clean_name)
+
+    mapping = mapping or {}
+    labels = labels or {}
+    result = {}
+    for column in columns:
+        if column in mapping:
+            clean_name = mapping[column]
+            if clean_name not in fields:
+                raise ValueError(
+                    "%s is not a field of %s, choose one of %s"
+                    % (clean_name, form, ", ".join(fields))
+                )
+        else:
+            clean_name = (
+                lookup.get(column)
+                or lookup.get(slugify(column))
+                or lookup.get(labels.get(column))
+            )
+        if clean_name:
+            result[column] = (clean_name, fields[clean_name])
+    return result
+
+
+def convert_value(block_type, value):
+    """
+    Converts a value read from a CSV cell to the value form data stores.
+    """
+    if not isinstance(value, str):
+        return value
+    if block_type in MULTIPLE_VALUE_TYPES:
+        return [x.strip() for x in value.split(",") if x.strip()]
+    if block_type == "checkbox":
+        return value.strip().lower() in TRUE_VALUES
+    return value
+
+
+def get_form_data(row, field_mapping):
+    return {
+        clean_name: convert_value(block_type, row[column])
+        for column, (clean_name, block_type) in field_mapping.items()
+        if row.get(column) not in (None, "")
+    }
+
+
+def get_submit_time(value):
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = parse_datetime(value.strip())
+        if value is None:
+            return None
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def validate_form_data(form_class, form_data):
+    """
+    Validates the form data with the compiled form class, ignoring file fields,
+    returns the errors as {field_name: [messages]}.
+    """
+    data = MultiValueDict()
+    for key, value in form_data.items():
+        if isinstance(value, list):
+            data.setlist(key, [str(x) for x in value])
+        elif isinstance(value, bool):
+            if value:
+                data[key] = "on"
+        else:
+            data[key] = str(value)
+    form = form_class(data)
+    for name, field in form.fields.items():
+        if getattr(field.widget, "needs_multipart_form", False):
+            field.required = False
+    if form.is_valid():
+        return {}
+    return {key: list(errors) for key, errors in form.errors.items()}
+
+
+def iter_csv_rows(path, start=0, delimiter=",", encoding="utf-8-sig"):
+    """
+    Streams (position, row) from a CSV file, skipping the first start rows.
+    """
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        for position, row in enumerate(reader, start=1):
+            if position > start:
+                yield position, row
+
+
+def iter_wagtail_rows(page_id, start=0, batch_size=1000):
+    """
+    Streams (pk, row) from the submissions of a wagtail.contrib.forms form
+    page, in keyset ordered batches after the pk start.
+    """
+    from wagtail.contrib.forms.models import FormSubmission
+
+    queryset = FormSubmission.objects.filter(page_id=page_id).order_by("pk")
+    last_pk = start
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).values_list(
+                "pk", "form_data", "submit_time"
+            )[:batch_size]
+        )
+        if not batch:
+            break
+        for pk, form_data, submit_time in batch:
+            if isinstance(form_data, str):
+                form_data = json.loads(form_data)
+            yield pk, dict(form_data, submit_time=submit_time)
+        last_pk = batch[-1][0]
+
+
+class SubmissionImporter:
+    """
+    Inserts the rows as submissions of a form with batched bulk_create. The
+    handlers of the form (notifications, webhooks, statistics) are not run.
+    """
+
+    def __init__(
+        self,
+        form,
+        field_mapping,
+        page=None,
+        submit_time_column="submit_time",
+        batch_size=1000,
+    ):
+        self.form = form
+        self.field_mapping = field_mapping
+        self.page = page
+        self.submit_time_column = submit_time_column
+        self.batch_size = batch_size
+        self.Submission = get_submission_model()
+        self.using = router.db_for_write(self.Submission)
+        self.schema_digest = form.get_schema_digest()
+        self.now = timezone.now()
+
+    def get_submission(self, row):
+        form_data = get_form_data(row, self.field_mapping)
+        submission = self.Submission(
+            form=self.form,
+            page=self.page,
+            form_data=dump_form_data(form_data),
+            search_document=get_search_document(form_data),
+            schema_digest=self.schema_digest,
+        )
+        submission.submit_time = (
+            get_submit_time(row.get(self.submit_time_column)) or self.now
+        )
+        return submission
+
+    def write(self, rows):
+        with transaction.atomic(using=self.using):
+            with preserve_auto_now_add(self.Submission, "submit_time"):
+                self.Submission.objects.using(self.using).bulk_create(
+                    [self.get_submission(x) for x in rows]
+                )
+
+    def run(self, rows, checkpoint=None):
+        """
+        Imports the (position, row) items in batches, calls checkpoint with
+        the position of the last row after every committed batch.
+        """
+        total = 0
+        batch = []
+        position = None
+        for position, row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.write(batch)
+                total += len(batch)
+                batch = []
+                if checkpoint:
+                    checkpoint(position, total)
+        if batch:
+            self.write(batch)
+            total += len(batch)
+            if checkpoint:
+                checkpoint(position, total)
+        return total
@@ -0,0 +1,170 @@
+import base64
+import json
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import CharField, Func, IntegerField
+
+from wagtail_model_forms import get_form_model, get_submission_model
+from wagtail_model_forms.compression import (
+    COMPRESSION_ALGORITHMS,
+    COMPRESSION_HEADER,
+    decode_form_data,
+    encode_form_data,
+    get_compression,
+    zstd,
+)
+from wagtail_model_forms.models import iter_form_fields
+from wagtail_model_forms.settings import FORM_DATA_COMPRESSION_MIN_SIZE
+from wagtail_model_forms.synthetic import get_random_fields, get_random_form_data
+from wagtail_model_forms.utils import json_loads
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the storage saved by compressing form data against the time it "
+        "adds to storing a submission and to reading it in the exports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=int,
+            action="append",
+            dest="forms",
+            help="Use the latest stored submissions of the form with this id "
+            "(repeatable, default: generated submissions)",
+        )
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1000,
+            help="Number of submissions (default: 1000)",
+        )
+        parser.add_argument(
+            "--fields",
+            type=int,
+            default=20,
+            help="Number of top level fields of generated submissions (default: 20)",
+        )
+        parser.add_argument(
+            "--min-size",
+            type=int,
+            default=FORM_DATA_COMPRESSION_MIN_SIZE,
+            help="Only compress form data of at least this many characters "
+            "(default: WAGTAIL_MODEL_FORMS_FORM_DATA_COMPRESSION_MIN_SIZE)",
+        )
+        parser.add_argument(
+            "--seed", type=int, help="Seed of the generated submissions"
+        )
+
+    def get_stored_queryset(self, forms, count):
+        FormSubmission = get_submission_model()
+        return FormSubmission.objects.filter(form__in=forms).order_by("-pk")[:count]
+
+    def get_stored_form_data(self, queryset):
+        values = queryset.values_list("form_data", flat=True)
+        return [
+            json_loads(decode_form_data(x)) if isinstance(x, str) else x for x in values
+        ]
+
+    def get_postgresql_sizes(self, queryset):
+        """
+        Returns the number of uncompressed form data values and their size on
+        disk, after the TOAST compression of PostgreSQL.
+        """
+        rows = queryset.annotate(
+            kind=Func("form_data", function="jsonb_typeof", output_field=CharField()),
+            stored=Func(
+                "form_data", function="pg_column_size", output_field=IntegerField()
+            ),
+        ).values_list("kind", "stored")
+        sizes = [stored for kind, stored in rows if kind == "object"]
+        return len(sizes), sum(sizes)
+
+    def get_payload_size(self, value):
+        """
+        Returns the size of a stored form data value without the header and
+        the base64 encoding of a compressed payload.
+        """
+        algorithm = get_compression(value)
+        if algorithm is None:
+            return len(value)
+        return len(base64.b64decode(value[len(COMPRESSION_HEADER % algorithm) :]))
+
+    def get_generated_form_data(self, count, fields, seed):
+        rng = random.Random(seed)
+        form = get_form_model()(
+            title="Benchmark", fields=get_random_fields(rng, count=fields)
+        )
+        fields = list(iter_form_fields(form.get_form_fields()))
+        return [get_random_form_data(rng, fields) for _ in range(count)]
+
+    def handle(self, *args, **options):
+        queryset = None
+        if options["forms"]:
+            queryset = self.get_stored_queryset(options["forms"], options["count"])
+            items = self.get_stored_form_data(queryset)
+            if not items:
+                raise CommandError("The forms have no submissions")
+        else:
+            items = self.get_generated_form_data(
+                options["count"], options["fields"], options["seed"]
+            )
+
+        algorithms = [""] + [
+            x for x in COMPRESSION_ALGORITHMS if x != "zstd" or zstd is not None
+        ]
+        self.stdout.write(
+            "%s submissions, compressed from %s characters\n"
+            % (len(items), options["min_size"])
+        )
+        self.stdout.write(
+            "%-10s %14s %14s %8s %14s %14s"
+            % ("Algorithm", "Stored", "Payload", "Ratio", "Store (us)", "Read (us)")
+        )
+        raw = None
+        for algorithm in algorithms:
+            start = time.perf_counter()
+            values = [
+                encode_form_data(
+                    json.dumps(x, cls=DjangoJSONEncoder),
+                    algorithm,
+                    min_size=options["min_size"],
+                )
+                for x in items
+            ]
+            store = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for value in values:
+                json_loads(decode_form_data(value))
+            read = time.perf_counter() - start
+
+            size = sum(len(x) for x in values)
+            if raw is None:
+                raw = size
+            self.stdout.write(
+                "%-10s %14s %14s %7.1f%% %14.1f %14.1f"
+                % (
+                    algorithm or "none",
+                    size,
+                    sum(self.get_payload_size(x) for x in values),
+                    size / raw * 100,
+                    store / len(items) * 10**6,
+                    read / len(items) * 10**6,
+                )
+            )
+
+        if queryset is not None and connections[queryset.db].vendor == "postgresql":
+            # PostgreSQL compresses large values itself (TOAST), compare the
+            # compressed values with the disk size of the uncompressed ones
+            count, stored = self.get_postgresql_sizes(queryset)
+            if count:
+                self.stdout.write(
+                    "\nPostgreSQL stores the %s uncompressed form data values of "
+                    "these submissions in %s bytes" % (count, stored)
+                )
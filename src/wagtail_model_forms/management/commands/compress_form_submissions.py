@@ -0,0 +1,111 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from wagtail_model_forms import get_submission_model
+from wagtail_model_forms.compression import (
+    COMPRESSION_ALGORITHMS,
+    recompress_form_data,
+)
+from wagtail_model_forms.settings import (
+    FORM_DATA_COMPRESSION,
+    FORM_DATA_COMPRESSION_MIN_SIZE,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compress the form data of the existing submissions in batches, or "
+        "decompress it with --algorithm none."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--algorithm",
+            choices=COMPRESSION_ALGORITHMS + ["none"],
+            default=FORM_DATA_COMPRESSION or "none",
+            help="Compression algorithm (default: WAGTAIL_MODEL_FORMS_FORM_DATA_COMPRESSION)",
+        )
+        parser.add_argument(
+            "--min-size",
+            type=int,
+            default=FORM_DATA_COMPRESSION_MIN_SIZE,
+            help="Only compress form data of at least this many characters "
+            "(default: WAGTAIL_MODEL_FORMS_FORM_DATA_COMPRESSION_MIN_SIZE)",
+        )
+        parser.add_argument(
+            "--form",
+            type=int,
+            action="append",
+            dest="forms",
+            help="Only process the submissions of the form with this id (repeatable)",
+        )
+        parser.add_argument(
+            "--start-after",
+            type=int,
+            default=0,
+            help="Continue after the submission with this id",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of submissions processed per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between the batches (default: 0.1)",
+        )
+
+    def handle(self, *args, **options):
+        FormSubmission = get_submission_model()
+        using = router.db_for_write(FormSubmission)
+        algorithm = "" if options["algorithm"] == "none" else options["algorithm"]
+
+        queryset = FormSubmission.objects.using(using).order_by("pk")
+        if options["forms"]:
+            queryset = queryset.filter(form__in=options["forms"])
+
+        last_pk = options["start_after"]
+        total = before = after = 0
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                    : options["batch_size"]
+                ]
+            )
+            if not pks:
+                break
+
+            with transaction.atomic(using=using):
+                batch = FormSubmission.objects.using(using).select_for_update()
+                changed = []
+                for form_submission in batch.filter(pk__in=pks).only("pk", "form_data"):
+                    value = form_submission.form_data
+                    new_value = recompress_form_data(
+                        value, algorithm, min_size=options["min_size"]
+                    )
+                    if new_value != value:
+                        before += len(value)
+                        after += len(new_value)
+                        form_submission.form_data = new_value
+                        changed.append(form_submission)
+                FormSubmission.objects.using(using).bulk_update(changed, ["form_data"])
+
+            last_pk = pks[-1]
+            total += len(changed)
+            self.stdout.write(
+                "Processed up to #%s, changed %s submissions" % (last_pk, total)
+            )
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done, changed %s submissions from %s to %s characters"
+                % (total, before, after)
+            )
+        )
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_model_forms import get_form_model
+from wagtail_model_forms.erasure import get_erasure_rules, run_erasure_rule
+from wagtail_model_forms.settings import ERASURE_CHECKPOINT_MODEL
+
+
+class Command(BaseCommand):
+    help = "Apply the erasure rules of the forms to their submissions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=int,
+            action="append",
+            dest="forms",
+            help="Only apply the rules of the form with this id (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of submissions changed per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.1,
+            help="Seconds to pause between the batches (default: 0.1)",
+        )
+
+    def handle(self, *args, **options):
+        if not ERASURE_CHECKPOINT_MODEL:
+            raise CommandError(
+                "Set WAGTAIL_MODEL_FORMS_ERASURE_CHECKPOINT_MODEL to apply erasure rules"
+            )
+
+        Form = get_form_model()
+        forms = Form.objects.order_by("pk")
+        if options["forms"]:
+            forms = forms.filter(pk__in=options["forms"])
+
+        for form in forms.iterator():
+            for rule_id, rule in get_erasure_rules(form):
+                total = run_erasure_rule(
+                    form,
+                    rule_id,
+                    rule,
+                    batch_size=options["batch_size"],
+                    sleep=options["sleep"],
+                )
+                self.stdout.write(
+                    "%s: %s %s after %s days, changed %s submissions"
+                    % (
+                        form,
+                        rule["action"],
+                        rule["field_name"] or rule["field_type"],
+                        rule["after_days"],
+                        total,
+                    )
+                )
+
+        self.stdout.write(self.style.SUCCESS("Done"))
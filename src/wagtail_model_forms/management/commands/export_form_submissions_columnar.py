@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_model_forms import get_submission_model
+from wagtail_model_forms.columnar import (
+    COLUMNAR_FORMATS,
+    ColumnarWriter,
+    get_queryset_columns,
+)
+from wagtail_model_forms.exports import iter_chunks
+
+
+class Command(BaseCommand):
+    help = "Export form submissions to a Parquet or Arrow IPC file with a typed schema."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the file to write")
+        parser.add_argument(
+            "--form",
+            type=int,
+            action="append",
+            dest="forms",
+            help="Only export the submissions of the form with this id (repeatable)",
+        )
+        parser.add_argument(
+            "--format",
+            choices=COLUMNAR_FORMATS,
+            default="parquet",
+            help="File format (default: parquet)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=10000,
+            help="Number of submissions read and written per batch (default: 10000)",
+        )
+
+    def handle(self, *args, **options):
+        FormSubmission = get_submission_model()
+
+        queryset = FormSubmission.objects.order_by("-pk")
+        if options["forms"]:
+            queryset = queryset.filter(form__in=options["forms"])
+
+        try:
+            writer = ColumnarWriter(
+                options["output"],
+                get_queryset_columns(queryset),
+                file_format=options["format"],
+                batch_size=options["chunk_size"],
+            )
+        except ImportError as err:
+            raise CommandError(str(err))
+
+        total = 0
+        for chunk in iter_chunks(queryset, options["chunk_size"]):
+            for form_submission in chunk:
+                try:
+                    writer.write(form_submission)
+                except ValueError as err:
+                    raise CommandError(str(err))
+            total += len(chunk)
+            self.stdout.write("Exported %s submissions" % total)
+        writer.close()
+
+        self.stdout.write(self.style.SUCCESS("Done, exported %s submissions" % total))
@@ -0,0 +1,126 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_model_forms import (
+    get_form_model,
+    get_submission_model,
+    get_uploaded_file_model,
+)
+from wagtail_model_forms.synthetic import SyntheticSubmissionWriter, get_random_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate forms with nested fieldsets and fieldrows and bulk insert "
+        "synthetic submissions and uploaded file rows for them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--forms",
+            type=int,
+            default=10,
+            help="Number of forms to create (default: 10)",
+        )
+        parser.add_argument(
+            "--form",
+            type=int,
+            action="append",
+            dest="form_ids",
+            help="Add the submissions to the existing form with this id instead (repeatable)",
+        )
+        parser.add_argument(
+            "--submissions",
+            type=int,
+            default=100000,
+            help="Number of submissions to insert (default: 100000)",
+        )
+        parser.add_argument(
+            "--files",
+            type=float,
+            default=0.1,
+            help="Share of the submissions with an uploaded file row (default: 0.1)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread the submit times over this number of days (default: 365)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of submissions inserted per batch (default: 5000)",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_false",
+            dest="use_copy",
+            default=None,
+            help="Use bulk_create on PostgreSQL instead of COPY",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed of the random generator, for repeatable data",
+        )
+
+    def handle(self, *args, **options):
+        Form = get_form_model()
+        rng = random.Random(options["seed"])
+
+        if options["form_ids"]:
+            forms = list(Form.objects.filter(pk__in=options["form_ids"]))
+            if len(forms) != len(set(options["form_ids"])):
+                raise CommandError("Not all forms exist")
+        else:
+            forms = [
+                Form.objects.create(
+                    title="Synthetic form %s" % (i + 1),
+                    fields=get_random_fields(
+                        rng,
+                        count=rng.randint(3, 12),
+                        fieldsets=rng.randint(0, 3),
+                        rows=rng.randint(0, 2),
+                    ),
+                )
+                for i in range(options["forms"])
+            ]
+            self.stdout.write("Created %s forms" % len(forms))
+
+        writer = SyntheticSubmissionWriter(
+            get_submission_model(),
+            get_uploaded_file_model(),
+            file_ratio=options["files"],
+            days=options["days"],
+            batch_size=options["batch_size"],
+            use_copy=options["use_copy"],
+            seed=options["seed"],
+        )
+
+        start = time.perf_counter()
+        total = files = 0
+        for count, file_count in writer.generate(forms, options["submissions"]):
+            total += count
+            files += file_count
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                "Inserted %s submissions and %s files (%.0f/s)"
+                % (total, files, total / elapsed if elapsed else total)
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done, inserted %s submissions and %s files in %.1fs with %s. "
+                "Run rebuild_form_statistics to count them in the statistics."
+                % (
+                    total,
+                    files,
+                    time.perf_counter() - start,
+                    "COPY" if writer.use_copy else "bulk_create",
+                )
+            )
+        )
@@ -0,0 +1,257 @@
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.models import Page
+
+from wagtail_model_forms import get_form_model
+from wagtail_model_forms.imports import (
+    SubmissionImporter,
+    get_field_mapping,
+    get_form_data,
+    iter_csv_rows,
+    iter_wagtail_rows,
+    validate_form_data,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import submissions into a form from a CSV file or a wagtail.contrib.forms "
+        "form page, without running the handlers of the form."
+    )
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--csv", help="Path of the CSV file to import")
+        source.add_argument(
+            "--wagtail-page",
+            type=int,
+            help="Id of the wagtail.contrib.forms form page to import the submissions of",
+        )
+        parser.add_argument(
+            "--form",
+            type=int,
+            required=True,
+            help="Id of the form to import the submissions into",
+        )
+        parser.add_argument(
+            "--page",
+            type=int,
+            help="Id of the page to link the submissions to "
+            "(default: the wagtail form page, or none)",
+        )
+        parser.add_argument(
+            "--map",
+            action="append",
+            default=[],
+            metavar="COLUMN=FIELD",
+            help="Map a column to the clean name of a field (repeatable), other "
+            "columns are matched by the clean name or label of the fields",
+        )
+        parser.add_argument(
+            "--submit-time-column",
+            default="submit_time",
+            help="Column with the submit times (default: submit_time)",
+        )
+        parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+        parser.add_argument(
+            "--encoding", default="utf-8-sig", help="CSV encoding (default: utf-8-sig)"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of submissions inserted per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="File to store the progress in, an interrupted import which is "
+            "started again with the same file continues after the last batch",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only validate the rows with the form, do not import them",
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Validate the rows with the form while importing and skip the "
+            "invalid ones, by default all rows are imported as they are",
+        )
+        parser.add_argument(
+            "--max-errors",
+            type=int,
+            default=20,
+            help="Number of invalid rows reported (default: 20)",
+        )
+
+    def handle(self, *args, **options):
+        Form = get_form_model()
+        try:
+            form = Form.objects.get(pk=options["form"])
+        except Form.DoesNotExist:
+            raise CommandError("Form %s does not exist" % options["form"])
+
+        mapping = {}
+        for item in options["map"]:
+            column, sep, field_name = item.partition("=")
+            if not sep:
+                raise CommandError("--map must be of the form COLUMN=FIELD")
+            mapping[column] = field_name
+
+        start, total = self.read_checkpoint(options["checkpoint"], options)
+        page = None
+        if options["csv"]:
+            try:
+                with open(
+                    options["csv"], newline="", encoding=options["encoding"]
+                ) as f:
+                    columns = next(csv.reader(f, delimiter=options["delimiter"]), [])
+            except OSError as err:
+                raise CommandError(str(err))
+            labels = {}
+            rows = iter_csv_rows(
+                options["csv"],
+                start=start,
+                delimiter=options["delimiter"],
+                encoding=options["encoding"],
+            )
+        else:
+            try:
+                page = Page.objects.get(pk=options["wagtail_page"]).specific
+            except Page.DoesNotExist:
+                raise CommandError("Page %s does not exist" % options["wagtail_page"])
+            if not hasattr(page, "get_data_fields"):
+                raise CommandError("%s is not a form page" % page)
+            labels = {name: str(label) for name, label in page.get_data_fields()}
+            columns = list(labels)
+            rows = iter_wagtail_rows(
+                page.pk, start=start, batch_size=options["batch_size"]
+            )
+
+        if options["page"]:
+            page = Page.objects.filter(pk=options["page"]).first()
+            if page is None:
+                raise CommandError("Page %s does not exist" % options["page"])
+
+        try:
+            field_mapping = get_field_mapping(
+                form, columns, mapping=mapping, labels=labels
+            )
+        except ValueError as err:
+            raise CommandError(str(err))
+        if not field_mapping:
+            raise CommandError("None of the columns match a field of %s" % form)
+        for column, (clean_name, block_type) in field_mapping.items():
+            self.stdout.write("%s -> %s (%s)" % (column, clean_name, block_type))
+        ignored = [
+            x
+            for x in columns
+            if x not in field_mapping and x != options["submit_time_column"]
+        ]
+        if ignored:
+            self.stdout.write("Ignored: %s" % ", ".join(ignored))
+
+        if options["dry_run"]:
+            self.validate(form, field_mapping, rows, options["max_errors"])
+            return
+        if options["skip_invalid"]:
+            rows = self.iter_valid_rows(
+                form, field_mapping, rows, options["max_errors"]
+            )
+
+        importer = SubmissionImporter(
+            form,
+            field_mapping,
+            page=page,
+            submit_time_column=options["submit_time_column"],
+            batch_size=options["batch_size"],
+        )
+
+        def checkpoint(position, count):
+            self.write_checkpoint(
+                options["checkpoint"], options, position, total + count
+            )
+            self.stdout.write("Imported %s submissions" % (total + count))
+
+        count = importer.run(rows, checkpoint=checkpoint)
+        if options["skip_invalid"]:
+            self.stdout.write(
+                self.style.WARNING("Skipped %s invalid rows" % self.invalid)
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Done, imported %s submissions. Run rebuild_form_statistics to "
+                "count them in the statistics." % (total + count)
+            )
+        )
+
+    def iter_valid_rows(self, form, field_mapping, rows, max_errors):
+        """
+        Yields the (position, row) items which are valid for the form, reports
+        the first max_errors invalid rows and counts them in self.invalid.
+        """
+        form_class = form.get_form_class()
+        self.invalid = 0
+        for position, row in rows:
+            errors = validate_form_data(form_class, get_form_data(row, field_mapping))
+            if not errors:
+                yield position, row
+                continue
+            self.invalid += 1
+            if self.invalid <= max_errors:
+                self.stdout.write(
+                    "Row %s: %s"
+                    % (
+                        position,
+                        "; ".join(
+                            "%s: %s" % (key, " ".join(messages))
+                            for key, messages in errors.items()
+                        ),
+                    )
+                )
+
+    def validate(self, form, field_mapping, rows, max_errors):
+        valid = sum(
+            1 for _ in self.iter_valid_rows(form, field_mapping, rows, max_errors)
+        )
+        style = self.style.SUCCESS if not self.invalid else self.style.WARNING
+        self.stdout.write(style("%s valid and %s invalid rows" % (valid, self.invalid)))
+
+    def get_source(self, options):
+        if options["csv"]:
+            return "csv:%s" % os.path.abspath(options["csv"])
+        return "wagtail:%s" % options["wagtail_page"]
+
+    def read_checkpoint(self, path, options):
+        """
+        Returns the position to continue after and the number of imported rows.
+        """
+        if not path or not os.path.exists(path):
+            return 0, 0
+        with open(path) as f:
+            data = json.load(f)
+        if (
+            data.get("source") != self.get_source(options)
+            or data.get("form") != options["form"]
+        ):
+            raise CommandError("%s belongs to another import" % path)
+        self.stdout.write("Continuing after %s imported submissions" % data["total"])
+        return data["position"], data["total"]
+
+    def write_checkpoint(self, path, options, position, total):
+        if not path:
+            return
+        data = {
+            "source": self.get_source(options),
+            "form": options["form"],
+            "position": position,
+            "total": total,
+        }
+        # Replace the file at once, so an interruption never leaves half a checkpoint
+        with open(path + ".tmp", "w") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
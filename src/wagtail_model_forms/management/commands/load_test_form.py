@@ -0,0 +1,210 @@
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_model_forms import get_form_model
+from wagtail_model_forms.models import iter_form_fields
+from wagtail_model_forms.synthetic import get_percentile, get_random_post_data
+
+FORM_ID_RE = re.compile(r'name="form_id" value="(\d+)"')
+CSRF_TOKEN_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class WebhookReceiver(ThreadingHTTPServer):
+    """
+    Accepts every request with a 200 response and counts them.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address):
+        self.received = 0
+        self.lock = threading.Lock()
+        super().__init__(address, WebhookRequestHandler)
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    def handle_request(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        with self.server.lock:
+            self.server.received += 1
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Submit a form concurrently through the page it is placed on and report "
+        "the throughput and latency percentiles."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "url", help="URL of a page with the form, e.g. on runserver"
+        )
+        parser.add_argument(
+            "--form",
+            type=int,
+            dest="form_id",
+            help="Id of the form to submit (default: the first form on the page)",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Total number of submissions (default: 1000)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=10,
+            help="Number of concurrent clients (default: 10)",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=30,
+            help="Timeout of a request in seconds (default: 30)",
+        )
+        parser.add_argument(
+            "--webhook-port",
+            type=int,
+            help="Run a stub webhook receiver on this port of 127.0.0.1",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed of the random generator, for repeatable data",
+        )
+
+    def handle(self, *args, **options):
+        import requests
+
+        self.url = options["url"]
+        self.timeout = options["timeout"]
+
+        try:
+            res = requests.get(self.url, timeout=self.timeout)
+            res.raise_for_status()
+        except requests.RequestException as err:
+            raise CommandError("Could not load %s: %s" % (self.url, err))
+
+        form_id = options["form_id"]
+        if form_id is None:
+            match = FORM_ID_RE.search(res.text)
+            if match is None:
+                raise CommandError("No form found on %s" % self.url)
+            form_id = int(match.group(1))
+
+        try:
+            form = get_form_model().objects.get(pk=form_id)
+        except get_form_model().DoesNotExist:
+            raise CommandError("Form %s does not exist" % form_id)
+        self.fields = list(iter_form_fields(form.get_form_fields()))
+        self.form_id = form_id
+        self.form_marker = 'name="form_id" value="%s"' % form_id
+
+        receiver = None
+        if options["webhook_port"]:
+            receiver = WebhookReceiver(("127.0.0.1", options["webhook_port"]))
+            threading.Thread(target=receiver.serve_forever, daemon=True).start()
+            self.stdout.write(
+                "Webhook receiver listening on http://127.0.0.1:%s/"
+                % options["webhook_port"]
+            )
+
+        concurrency = max(options["concurrency"], 1)
+        total = options["requests"]
+        rng = random.Random(options["seed"])
+        counts = [
+            total // concurrency + (1 if i < total % concurrency else 0)
+            for i in range(concurrency)
+        ]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(
+                executor.map(
+                    self.run_client,
+                    counts,
+                    [random.Random(rng.random()) for _ in counts],
+                )
+            )
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(x for latencies, errors in results for x in latencies)
+        errors = sum(errors for latencies, errors in results)
+
+        if receiver is not None:
+            receiver.shutdown()
+            receiver.server_close()
+
+        self.stdout.write("Requests:    %s (%s failed)" % (len(latencies), errors))
+        self.stdout.write("Duration:    %.2fs" % elapsed)
+        self.stdout.write(
+            "Throughput:  %.1f requests/s"
+            % (len(latencies) / elapsed if elapsed else 0)
+        )
+        for percentile in [50, 95, 99]:
+            self.stdout.write(
+                "p%s:         %.1f ms"
+                % (percentile, get_percentile(latencies, percentile) * 1000)
+            )
+        if receiver is not None:
+            self.stdout.write("Webhooks:    %s received" % receiver.received)
+
+    def run_client(self, count, rng):
+        """
+        Submits the form count times with one session, returns the latencies
+        of the successful submissions and the number of failed ones.
+        """
+        import requests
+
+        latencies = []
+        errors = 0
+        session = requests.Session()
+        try:
+            res = session.get(self.url, timeout=self.timeout)
+            match = CSRF_TOKEN_RE.search(res.text)
+        except requests.RequestException:
+            return latencies, count
+        csrf_token = match.group(1) if match else ""
+
+        for _ in range(count):
+            data, files = get_random_post_data(rng, self.fields)
+            data["form_id"] = self.form_id
+            data["csrfmiddlewaretoken"] = csrf_token
+            start = time.perf_counter()
+            try:
+                res = session.post(
+                    self.url,
+                    params={"form_id": self.form_id},
+                    data=data,
+                    files=files or None,
+                    headers={"Referer": self.url},
+                    allow_redirects=False,
+                    timeout=self.timeout,
+                )
+            except requests.RequestException:
+                errors += 1
+                continue
+            # An invalid submission renders the form again
+            if res.status_code >= 400 or (
+                res.status_code == 200 and self.form_marker in res.text
+            ):
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+        return latencies, errors
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail_model_forms.exports import process_export_jobs
+
+
+class Command(BaseCommand):
+    help = "Run the pending form submission export jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and check for pending jobs every N seconds",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=None,
+            help="Run jobs again which are running for longer than N seconds (default: WAGTAIL_MODEL_FORMS_EXPORT_JOB_TIMEOUT)",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            total = process_export_jobs(timeout=options["timeout"])
+            self.stdout.write("Processed %s export jobs" % total)
+            if not interval:
+                break
+            time.sleep(interval)
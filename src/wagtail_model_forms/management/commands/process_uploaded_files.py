@@ -0,0 +1,82 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router
+
+from wagtail_model_forms import get_uploaded_file_model
+from wagtail_model_forms.processing import process_uploaded_files
+from wagtail_model_forms.settings import UPLOAD_PROCESSING_WORKERS
+
+
+class Command(BaseCommand):
+    help = "Run the post-processing of the pending uploaded files in worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=UPLOAD_PROCESSING_WORKERS,
+            help="Number of worker processes, 1 processes the files in this process "
+            "(default: WAGTAIL_MODEL_FORMS_UPLOAD_PROCESSING_WORKERS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of files claimed per batch (default: 100)",
+        )
+        parser.add_argument(
+            "--retry",
+            action="store_true",
+            help="Process the failed files and the files of interrupted runs again",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and check for pending files every N seconds",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=None,
+            help="Process files again which are processing for longer than N seconds "
+            "(default: WAGTAIL_MODEL_FORMS_UPLOAD_PROCESSING_TIMEOUT)",
+        )
+
+    def handle(self, *args, **options):
+        if options["retry"]:
+            UploadedFile = get_uploaded_file_model()
+            count = (
+                UploadedFile.objects.using(router.db_for_write(UploadedFile))
+                .filter(
+                    status__in=[
+                        UploadedFile.Status.PROCESSING,
+                        UploadedFile.Status.FAILED,
+                    ]
+                )
+                .update(status=UploadedFile.Status.PENDING)
+            )
+            self.stdout.write("Retrying %s files" % count)
+
+        interval = options["interval"]
+        while True:
+            totals = process_uploaded_files(
+                workers=options["workers"],
+                batch_size=options["batch_size"],
+                timeout=options["timeout"],
+            )
+            self.stdout.write(
+                "Processed %s files%s"
+                % (
+                    sum(totals.values()),
+                    "".join(
+                        ", %s %s" % (count, status)
+                        for status, count in sorted(totals.items())
+                        if status != "processed"
+                    ),
+                )
+            )
+            if not interval:
+                break
+            time.sleep(interval)
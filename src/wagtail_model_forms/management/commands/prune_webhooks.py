@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from wagtail_model_forms.webhooks import PRUNE_BATCH_SIZE, prune_webhooks
+
+
+class Command(BaseCommand):
+    help = "Delete the sent and failed webhook payloads and the webhook deliveries past their retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Keep the rows of the last N days (default: WAGTAIL_MODEL_FORMS_WEBHOOK_RETENTION_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=PRUNE_BATCH_SIZE,
+            help="Number of rows deleted per query (default: %s)" % PRUNE_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        items, deliveries = prune_webhooks(
+            days=options["days"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            "Deleted %s webhook payloads and %s webhook deliveries"
+            % (items, deliveries)
+        )
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from wagtail_model_forms import get_form_model
+from wagtail_model_forms.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the aggregated statistics of the forms from their submissions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--form",
+            type=int,
+            action="append",
+            dest="forms",
+            help="Only rebuild the statistics of the form with this id (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of submissions read per batch (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        Form = get_form_model()
+
+        forms = Form.objects.order_by("pk")
+        if options["forms"]:
+            forms = forms.filter(pk__in=options["forms"])
+
+        for form in forms.iterator():
+            total = rebuild_statistics(form, batch_size=options["batch_size"])
+            self.stdout.write("%s: counted %s submissions" % (form, total))
+
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail_model_forms.webhooks import send_webhook_batches
+
+
+class Command(BaseCommand):
+    help = "Send the queued webhook payloads which are due as batched requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Keep running and check for due batches every N seconds",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=None,
+            help="Send payloads again which are sending for longer than N seconds (default: WAGTAIL_MODEL_FORMS_WEBHOOK_SENDING_TIMEOUT)",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        while True:
+            total = send_webhook_batches(timeout=options["timeout"])
+            self.stdout.write("Sent %s webhook payloads" % total)
+            if not interval:
+                break
+            time.sleep(interval)
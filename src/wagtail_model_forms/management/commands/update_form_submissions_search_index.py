@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from wagtail_model_forms import get_submission_model, get_uploaded_file_model
+
+
+class Command(BaseCommand):
+    help = "Rebuild the search documents of the form submissions in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of submissions processed per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only backfill submissions without a search document",
+        )
+
+    def handle(self, *args, **options):
+        FormSubmission = get_submission_model()
+        batch_size = options["batch_size"]
+
+        UploadedFile = get_uploaded_file_model()
+        queryset = FormSubmission.objects.order_by("pk").prefetch_related(
+            # The text extracted from the uploaded files is part of the document
+            Prefetch(
+                "uploaded_files",
+                queryset=UploadedFile.objects.exclude(text="").only(
+                    "pk", "form_submission", "text"
+                ),
+            )
+        )
+        if options["missing_only"]:
+            queryset = queryset.filter(search_document="")
+
+        last_pk = 0
+        total = 0
+        while True:
+            batch = list(
+                queryset.filter(pk__gt=last_pk).only("pk", "form_data")[:batch_size]
+            )
+            if not batch:
+                break
+            for form_submission in batch:
+                form_submission.search_document = form_submission.get_search_document()
+            FormSubmission.objects.bulk_update(batch, ["search_document"])
+            last_pk = batch[-1].pk
+            total += len(batch)
+            self.stdout.write("Indexed %s submissions" % total)
+
+        self.stdout.write(self.style.SUCCESS("Done, indexed %s submissions" % total))
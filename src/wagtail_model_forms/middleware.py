@@ -0,0 +1,52 @@
+from django.http import HttpResponse
+from django.utils.translation import gettext as _
+
+from wagtail_model_forms.prefetch import get_request_form
+from wagtail_model_forms.settings import UPLOADED_FILE_DEDUPLICATION
+from wagtail_model_forms.uploads import (
+    LimitedUploadHandler,
+    get_file_limits,
+    get_max_request_size,
+)
+
+
+class UploadLimitMiddleware:
+    """
+    Installs the streaming upload handler enforcing the file limits of the posted form.
+
+    The handler is installed for deduplicated storage as well, to hash the files while
+    they are received. Must be placed before CsrfViewMiddleware, which reads the request body. The
+    form is taken from the form_id in the query string of the form action. A
+    request which is larger than all the limits together is refused before its
+    body is read.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (
+            request.method == "POST"
+            and request.content_type == "multipart/form-data"
+            and "form_id" in request.GET
+        ):
+            limits = self.get_limits(request)
+            if limits or (limits is not None and UPLOADED_FILE_DEDUPLICATION):
+                max_request_size = get_max_request_size(limits)
+                try:
+                    content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+                except ValueError:
+                    content_length = 0
+                if max_request_size and content_length > max_request_size:
+                    return HttpResponse(_("The upload is too large."), status=413)
+                request.upload_handlers.insert(0, LimitedUploadHandler(request, limits))
+        return self.get_response(request)
+
+    def get_limits(self, request):
+        try:
+            form = get_request_form(request, request.GET["form_id"])
+        except ValueError:
+            return None
+        if form is None:
+            return None
+        return get_file_limits(form.get_form_fields())
@@ -1,24 +1,94 @@
-from django.shortcuts import get_object_or_404
-from django.utils.cache import add_never_cache_headers
+from django.http import Http404
+from django.shortcuts import redirect
+from django.utils.cache import add_never_cache_headers, patch_cache_control
 from django.utils.functional import cached_property
 
-from wagtail_model_forms import get_form_model
-from wagtail_model_forms.settings import ADD_NEVER_CACHE_HEADERS
+from wagtail_model_forms.prefetch import (
+    activate_form_map,
+    deactivate_form_map,
+    get_form_map,
+    get_request_form,
+    prefetch_forms,
+)
+from wagtail_model_forms.routers import use_write_database
+from wagtail_model_forms.settings import (
+    ADD_NEVER_CACHE_HEADERS,
+    POST_REDIRECT_GET,
+    SUCCESS_CACHE_MAX_AGE,
+)
+from wagtail_model_forms.uploads import get_upload_errors
+from wagtail_model_forms.utils import get_success_form_id, get_success_token
+
+SUCCESS_PARAMETER = "form_success"
+
+# Query parameters of the form action, left out of the success redirect
+FORM_PARAMETERS = ["form_id", SUCCESS_PARAMETER]
+
+
+def get_success_url(request, form_id):
+    """
+    Returns the url of the page with the success token of the form, keeping the
+    other query parameters, e.g. campaign parameters.
+    """
+    params = request.GET.copy()
+    for key in FORM_PARAMETERS:
+        params.pop(key, None)
+    params[SUCCESS_PARAMETER] = get_success_token(form_id)
+    return "%s?%s" % (request.path, params.urlencode())
+
+
+def get_form_action(request, form_id):
+    """
+    Returns the url a form posts to, the current url with the form_id the
+    upload limits are read from, keeping the other query parameters.
+    """
+    params = request.GET.copy()
+    for key in FORM_PARAMETERS:
+        params.pop(key, None)
+    params["form_id"] = form_id
+    return "%s?%s" % (request.path, params.urlencode())
 
 
 def handle_form_request(request, page):
     if request.method == "POST" and "form_id" in request.POST:
-        Form = get_form_model()
-
-        snippet = get_object_or_404(Form, id=int(request.POST.get("form_id")))
+        try:
+            snippet = get_request_form(request, request.POST.get("form_id"))
+        except ValueError:
+            snippet = None
+        if snippet is None:
+            raise Http404
 
         form = snippet.get_form(
             request.POST, request.FILES, page=page, user=request.user
         )
+        if not hasattr(request, "_wagtail_model_forms_bound"):
+            request._wagtail_model_forms_bound = {}
+        request._wagtail_model_forms_bound[snippet.id] = form
+
+        # Files rejected while streaming in are missing from request.FILES
+        for field_name, error in get_upload_errors(request).items():
+            if field_name in form.fields:
+                form.errors.pop(field_name, None)
+                form.add_error(field_name, error)
 
         if form.is_valid():
             request.form_success = snippet.id
-            snippet.process_form_submission(form, page=page, request=request)
+            # Notifications and handlers read the new submission back
+            with use_write_database():
+                snippet.process_form_submission(form, page=page, request=request)
+            if POST_REDIRECT_GET:
+                return redirect(get_success_url(request, snippet.id))
+    return None
+
+
+def add_success_cache_headers(request, response):
+    """
+    Makes a success page cacheable, unless a CSRF token was rendered on it.
+    """
+    if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+        add_never_cache_headers(response)
+    else:
+        patch_cache_control(response, public=True, max_age=SUCCESS_CACHE_MAX_AGE)
 
 
 class FormSnippetMixin:
@@ -27,20 +97,58 @@ class FormSnippetMixin:
 
     @cached_property
     def page_has_form(self):
+        # Use the raw data, so the blocks are not converted before the forms are prefetched
         for field in self.streamfields:
-            for block in getattr(self, field):
-                if block.block_type == self.block_type:
+            for block in getattr(self, field).raw_data:
+                if block["type"] == self.block_type:
                     return True
         return False
 
+    def get_form_ids(self):
+        """
+        Returns the ids of the forms referenced by the form blocks of the streamfields.
+        """
+        form_ids = []
+        for field in self.streamfields:
+            for block in getattr(self, field).raw_data:
+                if block["type"] == self.block_type and block["value"]:
+                    form_ids.append(block["value"].get("form"))
+        return form_ids
+
     def serve(self, request, *args, **kwargs):
-        if self.page_has_form:
-            if request.method == "POST" and "form_id" in request.POST:
-                handle_form_request(request, self)
+        activate_form_map(request)
+        # Deactivated once the response is rendered, or right away when the
+        # request fails or its response is not rendered later
+        rendered_later = False
+        try:
+            is_success = False
+            if self.page_has_form:
+                prefetch_forms(self.get_form_ids(), get_form_map(request))
+                if request.method == "POST" and "form_id" in request.POST:
+                    res = handle_form_request(request, self)
+                    if res is not None:
+                        return res
+                elif POST_REDIRECT_GET and SUCCESS_PARAMETER in request.GET:
+                    form_id = get_success_form_id(request.GET[SUCCESS_PARAMETER])
+                    if form_id is not None and form_id in get_form_map(request):
+                        request.form_success = form_id
+                        is_success = True
+
+            res = super().serve(request, *args, **kwargs)
 
-        res = super().serve(request, *args, **kwargs)
+            if hasattr(res, "add_post_render_callback"):
+                res.add_post_render_callback(deactivate_form_map)
+                rendered_later = True
+        finally:
+            if not rendered_later:
+                deactivate_form_map()
 
         if ADD_NEVER_CACHE_HEADERS and self.page_has_form:
-            add_never_cache_headers(res)
+            if is_success and hasattr(res, "add_post_render_callback"):
+                res.add_post_render_callback(
+                    lambda response: add_success_cache_headers(request, response)
+                )
+            else:
+                add_never_cache_headers(res)
 
         return res
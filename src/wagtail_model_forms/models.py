@@ -1,11 +1,10 @@
-import json
 import logging
 from collections import OrderedDict
+from types import MappingProxyType
 
 from django import forms
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
-from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.html import conditional_escape
@@ -28,9 +27,40 @@ from wagtail.contrib.forms.models import (
 from wagtail.fields import StreamField
 
 from wagtail_model_forms import get_submission_model, get_uploaded_file_model
-from wagtail_model_forms.blocks import FIELDBLOCKS, WebhookBlock
-from wagtail_model_forms.settings import SUBMISSION_MODEL
-from wagtail_model_forms.utils import trigger_webhook
+from wagtail_model_forms.blocks import FIELDBLOCKS, ErasureRuleBlock, WebhookBlock
+from wagtail_model_forms.choices import ChoiceSourceField, ChoiceSourceInput
+from wagtail_model_forms.compression import decode_form_data, dump_form_data
+from wagtail_model_forms.handlers import (
+    SubmissionHandler,
+    get_submission_handlers,
+    run_submission_handlers,
+)
+from wagtail_model_forms.schema import (
+    get_schema_digest,
+    get_schema_fields,
+    get_schemas,
+    store_schema,
+)
+from wagtail_model_forms.settings import (
+    FORM_MODEL,
+    SCHEMA_MODEL,
+    SUBMISSION_MODEL,
+    UPLOADED_FILE_DEDUPLICATION,
+    WEBHOOK_QUEUE_MODEL,
+)
+from wagtail_model_forms.statistics import record_form_submission
+from wagtail_model_forms.uploads import (
+    LimitedFileField,
+    get_upload_checksums,
+    parse_allowed_types,
+    restore_deduplicated_file,
+    store_deduplicated_file,
+)
+from wagtail_model_forms.utils import (
+    get_search_document,
+    json_loads,
+)
+from wagtail_model_forms.webhooks import enqueue_webhook, send_webhook
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +72,29 @@ def get_field_clean_name(field_value, namespace=""):
         return slugify(field_value["label"])
 
 
+def iter_form_fields(fields, namespace=""):
+    """
+    Yields (clean_name, block_type, value) for every field, flattening fieldsets and fieldrows.
+    """
+    for structvalue in fields:
+        block_type = str(structvalue.block_type)
+        if block_type == "fieldset":
+            yield from iter_form_fields(
+                structvalue.value["form_fields"],
+                namespace=slugify(structvalue.value["legend"]),
+            )
+        elif block_type == "fieldrow":
+            yield from iter_form_fields(
+                structvalue.value["form_fields"], namespace=namespace
+            )
+        else:
+            yield (
+                get_field_clean_name(structvalue.value, namespace),
+                block_type,
+                structvalue.value,
+            )
+
+
 class AbstractFormSubmission(WagtailAbstractFormSubmission):
     class Status(models.TextChoices):
         NEW = "new", _("New")
@@ -66,6 +119,20 @@ class AbstractFormSubmission(WagtailAbstractFormSubmission):
         default=Status.NEW,
         verbose_name=_("Status"),
     )
+    search_document = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Search document"),
+    )
+    schema_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+        editable=False,
+        verbose_name=_("Schema digest"),
+    )
 
     class Meta:
         abstract = True
@@ -73,26 +140,110 @@ class AbstractFormSubmission(WagtailAbstractFormSubmission):
     def __str__(self):
         return str(self.form)
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.search_document:
+            self.search_document = self.get_search_document()
+        super().save(*args, **kwargs)
+
+    @cached_property
+    def data(self):
+        """
+        Returns the decoded form data as a read-only mapping, decoded once per instance.
+        """
+        form_data = self.form_data
+        if isinstance(form_data, (str, bytes)):
+            form_data = json_loads(decode_form_data(form_data))
+        return MappingProxyType(form_data or {})
+
+    def get_search_document(self):
+        """
+        Returns the submitted values and the text extracted from the uploaded
+        files as a single string for the report search.
+        """
+        document = get_search_document(self.data)
+        if self.pk:
+            texts = [x.text for x in self.uploaded_files.all() if x.text]
+            document = " ".join([document] + texts) if texts else document
+        return document
+
+    def get_schema_fields(self):
+        """
+        Returns the field spec the submission was made with, or the current
+        fields of the form for submissions without a stored schema.
+        """
+        if SCHEMA_MODEL and self.schema_digest:
+            fields = get_schemas([self.schema_digest]).get(self.schema_digest)
+            if fields is not None:
+                return fields
+        return get_schema_fields(self.form)
+
     @property
     def uploaded_file_download_urls(self):
         urls = [
             settings.WAGTAILADMIN_BASE_URL + x.download_url
             for x in self.uploaded_files.all()
+            if x.file
         ]
         return ", ".join(urls)
 
 
 class AbstractUploadedFile(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        PROCESSING = "processing", _("Processing")
+        PROCESSED = "processed", _("Processed")
+        INFECTED = "infected", _("Infected")
+        FAILED = "failed", _("Failed")
+
     form_submission = models.ForeignKey(
         SUBMISSION_MODEL,
         on_delete=models.CASCADE,
         related_name="uploaded_files",
     )
     file = models.FileField()
+    checksum = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        editable=False,
+        verbose_name=_("Checksum"),
+    )
     created_at = models.DateTimeField(
         verbose_name=_("created at"),
         auto_now_add=True,
     )
+    status = models.CharField(
+        max_length=32,
+        choices=Status,
+        default=Status.PENDING,
+        db_index=True,
+        editable=False,
+        verbose_name=_("Status"),
+    )
+    processing_error = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Processing error"),
+    )
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Claimed at"),
+    )
+    processed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name=_("Processed at"),
+    )
+    text = models.TextField(
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Text"),
+    )
 
     class Meta:
         abstract = True
@@ -105,6 +256,360 @@ class AbstractUploadedFile(models.Model):
         return self.file.url
 
 
+class AbstractFormSchema(models.Model):
+    form = models.ForeignKey(
+        FORM_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Form"),
+    )
+    digest = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name=_("Digest"),
+    )
+    fields = models.JSONField(
+        default=list,
+        verbose_name=_("Fields"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Created at"),
+    )
+
+    class Meta:
+        abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["form", "digest"],
+                name="%(app_label)s_%(class)s_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return "%s %s" % (self.form_id, self.digest[:12])
+
+
+class AbstractErasureCheckpoint(models.Model):
+    form = models.ForeignKey(
+        FORM_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Form"),
+    )
+    rule = models.CharField(
+        max_length=64,
+        verbose_name=_("Rule"),
+    )
+    digest = models.CharField(
+        max_length=64,
+        verbose_name=_("Digest"),
+    )
+    last_pk = models.BigIntegerField(
+        default=0,
+        verbose_name=_("Last processed submission"),
+    )
+    processed = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_("Processed"),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("updated at"),
+    )
+
+    class Meta:
+        abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["form", "rule"],
+                name="%(app_label)s_%(class)s_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return "%s %s #%s" % (self.form_id, self.rule, self.last_pk)
+
+
+class AbstractFormSubmissionStatistic(models.Model):
+    form = models.ForeignKey(
+        FORM_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Form"),
+    )
+    date = models.DateField(
+        verbose_name=_("Date"),
+    )
+    field_name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("Field name"),
+    )
+    value = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_("Value"),
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Count"),
+    )
+
+    class Meta:
+        abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["form", "date", "field_name", "value"],
+                name="%(app_label)s_%(class)s_unique",
+            ),
+        ]
+
+    def __str__(self):
+        return "%s %s %s=%s" % (self.form_id, self.date, self.field_name, self.value)
+
+
+class AbstractWebhookQueueItem(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        SENDING = "sending", _("Sending")
+        SENT = "sent", _("Sent")
+        FAILED = "failed", _("Failed")
+
+    form_submission = models.ForeignKey(
+        SUBMISSION_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    endpoint = models.CharField(
+        max_length=64,
+        db_index=True,
+        verbose_name=_("Endpoint"),
+    )
+    method = models.CharField(
+        max_length=10,
+        verbose_name=_("Method"),
+    )
+    url = models.TextField(
+        verbose_name=_("URL"),
+    )
+    headers = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Request headers"),
+    )
+    payload = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name=_("Payload"),
+    )
+    batched = models.BooleanField(
+        default=True,
+        verbose_name=_("Batched"),
+    )
+    batch_size = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_("Batch size"),
+    )
+    max_latency = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Max latency"),
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status,
+        default=Status.PENDING,
+        db_index=True,
+        verbose_name=_("Status"),
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Attempts"),
+    )
+    next_attempt_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name=_("next attempt at"),
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_("Error"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("created at"),
+    )
+    claimed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("claimed at"),
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("sent at"),
+    )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return "%s %s" % (self.method, self.url)
+
+
+class AbstractWebhookDelivery(models.Model):
+    class Status(models.TextChoices):
+        SUCCESS = "success", _("Success")
+        FAILED = "failed", _("Failed")
+        SHORT_CIRCUITED = "short_circuited", _("Short-circuited")
+
+    form_submission = models.ForeignKey(
+        SUBMISSION_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    target = models.CharField(
+        max_length=255,
+        db_index=True,
+        verbose_name=_("Target"),
+    )
+    method = models.CharField(
+        max_length=10,
+        verbose_name=_("Method"),
+    )
+    url = models.TextField(
+        verbose_name=_("URL"),
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status,
+        verbose_name=_("Status"),
+    )
+    response_code = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name=_("Response code"),
+    )
+    response_body = models.TextField(
+        blank=True,
+        verbose_name=_("Response body"),
+    )
+    latency = models.FloatField(
+        null=True,
+        blank=True,
+        verbose_name=_("Latency (ms)"),
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_("Error"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name=_("created at"),
+    )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return "%s %s (%s)" % (self.method, self.url, self.status)
+
+
+class AbstractExportJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        RUNNING = "running", _("Running")
+        COMPLETED = "completed", _("Completed")
+        FAILED = "failed", _("Failed")
+
+    class Format(models.TextChoices):
+        CSV = "csv", _("CSV")
+        XLSX = "xlsx", _("Excel")
+        JSONL = "jsonl", _("JSON Lines")
+        PARQUET = "parquet", _("Parquet")
+        ARROW = "arrow", _("Arrow IPC")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name=_("User"),
+    )
+    format = models.CharField(
+        max_length=20,
+        choices=Format,
+        default=Format.CSV,
+        verbose_name=_("Format"),
+    )
+    filters = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_("Filters"),
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status,
+        default=Status.PENDING,
+        db_index=True,
+        verbose_name=_("Status"),
+    )
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Total"),
+    )
+    processed = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Processed"),
+    )
+    file = models.FileField(
+        upload_to="form-submission-exports/",
+        blank=True,
+        verbose_name=_("File"),
+    )
+    error = models.TextField(
+        blank=True,
+        verbose_name=_("Error"),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("created at"),
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("started at"),
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("finished at"),
+    )
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return "%s export #%s" % (self.get_format_display(), self.pk)
+
+    @property
+    def progress(self):
+        if self.status == self.Status.COMPLETED:
+            return 100
+        if not self.total:
+            return 0
+        return min(int(self.processed * 100 / self.total), 100)
+
+    @property
+    def is_finished(self):
+        return self.status in [self.Status.COMPLETED, self.Status.FAILED]
+
+
 class AbstractFormField(WagtailAbstractFormField):
     class Meta:
         abstract = True
@@ -173,8 +678,20 @@ class FormBuilder(BaseFormBuilder):
         options["initial"] = self.get_formatted_field_initial(field)
         return forms.MultipleChoiceField(widget=forms.CheckboxSelectMultiple, **options)
 
+    def create_choicesource_field(self, field, options, default_widget_attrs={}):
+        return ChoiceSourceField(
+            field["source"],
+            widget=ChoiceSourceInput(field["source"], attrs=default_widget_attrs),
+            **options,
+        )
+
     def create_file_field(self, field, options, default_widget_attrs={}):
-        return forms.FileField(**options)
+        max_size = field.get("max_size")
+        return LimitedFileField(
+            max_size=max_size * 1024 * 1024 if max_size else None,
+            allowed_types=parse_allowed_types(field.get("allowed_types")),
+            **options,
+        )
 
     def handle_normal_field(self, structvalue, formfields, namespace=""):
         field = structvalue.value
@@ -260,6 +777,27 @@ class FormBuilder(BaseFormBuilder):
         return values
 
 
+def send_email_notifications(form, form_submission, request=None):
+    form.handle_email_notifications(form_submission)
+
+
+def send_webhooks(form, form_submission, request=None):
+    form.handle_webhooks(form_submission)
+
+
+def record_statistics(form, form_submission, request=None):
+    form.handle_statistics(form_submission)
+
+
+# Sync unless listed in WAGTAIL_MODEL_FORMS_DEFERRED_HANDLERS, their errors
+# are raised like before the handlers existed
+EMAIL_NOTIFICATIONS_HANDLER = SubmissionHandler(
+    "email_notifications", send_email_notifications, order=50
+)
+WEBHOOKS_HANDLER = SubmissionHandler("webhooks", send_webhooks, order=60)
+STATISTICS_HANDLER = SubmissionHandler("statistics", record_statistics, order=10)
+
+
 class EmailNotificationsFormMixin(models.Model):
     email_notifications_enabled = models.BooleanField(
         default=False,
@@ -289,10 +827,9 @@ class EmailNotificationsFormMixin(models.Model):
         abstract = True
 
     def get_email_notification_context(self, form_submission):
-        form_data = json.loads(form_submission.form_data)
         context = {
             "form": form_submission.form,
-            "form_data": form_data,
+            "form_data": dict(form_submission.data),
             "page": form_submission.page,
             "submit_time": form_submission.submit_time,
         }
@@ -305,17 +842,17 @@ class EmailNotificationsFormMixin(models.Model):
         emails = [x.strip() for x in self.email_notifications_list.split(",")]
         for email in emails:
             logger.info(
-                "Email notification (ForSubmission#%s) for '%s'"
+                "Email notification (FormSubmission#%s) for '%s'"
                 % (form_submission.id, email)
             )
             context = self.get_email_notification_context(form_submission)
             self.handle_email_notification(email, form_submission, context)
 
-    def process_form_submission(self, form, page=None, request=None):
-        form_submission = super().process_form_submission(form, page, request=request)
+    def get_submission_handlers(self):
+        handlers = super().get_submission_handlers()
         if self.email_notifications_enabled:
-            self.handle_email_notifications(form_submission)
-        return form_submission
+            handlers.append(EMAIL_NOTIFICATIONS_HANDLER)
+        return handlers
 
 
 class WebhooksFormMixin(models.Model):
@@ -347,18 +884,59 @@ class WebhooksFormMixin(models.Model):
         abstract = True
 
     def handle_webhook(self, webhook, form_submission):
-        trigger_webhook(webhook, form_submission)
+        if webhook.get("batch_enabled") and WEBHOOK_QUEUE_MODEL:
+            enqueue_webhook(webhook, form_submission)
+        else:
+            send_webhook(webhook, form_submission)
 
     def handle_webhooks(self, form_submission):
         for webhook in self.webhooks:
-            logger.info("Webhook (ForSubmission#%s)" % form_submission.id)
+            logger.info("Webhook (FormSubmission#%s)" % form_submission.id)
             self.handle_webhook(dict(webhook.value), form_submission)
 
-    def process_form_submission(self, form, page=None, request=None):
-        form_submission = super().process_form_submission(form, page, request=request)
+    def get_submission_handlers(self):
+        handlers = super().get_submission_handlers()
         if self.webhooks_enabled:
-            self.handle_webhooks(form_submission)
-        return form_submission
+            handlers.append(WEBHOOKS_HANDLER)
+        return handlers
+
+
+class StatisticsFormMixin(models.Model):
+    class Meta:
+        abstract = True
+
+    def handle_statistics(self, form_submission):
+        try:
+            record_form_submission(form_submission)
+        except Exception:
+            logger.exception(
+                "Could not record statistics (FormSubmission#%s)" % form_submission.id
+            )
+
+    def get_submission_handlers(self):
+        return super().get_submission_handlers() + [STATISTICS_HANDLER]
+
+
+class ErasureFormMixin(models.Model):
+    erasure_rules = StreamField(
+        [
+            ("rule", ErasureRuleBlock()),
+        ],
+        null=True,
+        blank=True,
+        verbose_name=_("Erasure rules"),
+        help_text=_(
+            "Erase or pseudonymize fields of old submissions, applied by the "
+            "erase_form_submissions command"
+        ),
+    )
+
+    erasure_panels = [
+        FieldPanel("erasure_rules"),
+    ]
+
+    class Meta:
+        abstract = True
 
 
 class AbstractForm(ClusterableModel):
@@ -366,6 +944,13 @@ class AbstractForm(ClusterableModel):
         verbose_name=_("title"),
         max_length=255,
     )
+    schema_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name=_("Schema digest"),
+    )
 
     form_builder = FormBuilder
 
@@ -388,6 +973,16 @@ class AbstractForm(ClusterableModel):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # The digest only changes with the fields, compute it once per saved
+        # version of the form instead of on every submission
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "fields" in update_fields:
+            self.schema_digest = get_schema_digest(get_schema_fields(self))
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "schema_digest"}
+        super().save(*args, **kwargs)
+
     @cached_property
     def edit_url(self):
         return None
@@ -400,7 +995,10 @@ class AbstractForm(ClusterableModel):
             ("submit_time", _("Submission date")),
         ]
         data_fields += [
-            (field.clean_name, field.label) for field in self.get_form_fields()
+            (clean_name, value["label"])
+            for clean_name, block_type, value in iter_form_fields(
+                self.get_form_fields()
+            )
         ]
         return data_fields
 
@@ -435,26 +1033,73 @@ class AbstractForm(ClusterableModel):
             cleaned_form_data[key] = value
         return cleaned_form_data
 
+    def get_schema_digest(self):
+        """
+        Returns the digest of the current fields and stores a snapshot of them
+        when WAGTAIL_MODEL_FORMS_SCHEMA_MODEL is configured.
+        """
+        digest = self.schema_digest
+        if not digest:
+            # Forms saved before the digest was stored with them
+            digest = get_schema_digest(get_schema_fields(self))
+            if self.pk:
+                type(self).objects.filter(pk=self.pk).update(schema_digest=digest)
+            self.schema_digest = digest
+        if SCHEMA_MODEL:
+            store_schema(self, digest)
+        return digest
+
     def get_form_submission(self, form_data, page=None):
         form_submission = self.get_submission_class().objects.create(
-            form_data=form_data, form=self, page=page
+            form_data=form_data,
+            form=self,
+            page=page,
+            schema_digest=self.get_schema_digest(),
         )
         return form_submission
 
-    def process_form_submission(self, form, page=None, request=None):
-        form_data = json.dumps(
-            self.get_form_data(form, request=request), cls=DjangoJSONEncoder
+    def create_uploaded_file(self, form_submission, file, checksum=""):
+        UploadedFile = self.get_uploaded_file_class()
+        if UPLOADED_FILE_DEDUPLICATION:
+            name, checksum = store_deduplicated_file(
+                UploadedFile, file, checksum=checksum
+            )
+            uploaded_file = UploadedFile.objects.create(
+                form_submission=form_submission, file=name, checksum=checksum
+            )
+            restore_deduplicated_file(
+                UploadedFile, name, file, using=uploaded_file._state.db
+            )
+            return uploaded_file
+        return UploadedFile.objects.create(
+            form_submission=form_submission, file=file, checksum=checksum
         )
+
+    def process_form_submission(self, form, page=None, request=None):
+        form_data = dump_form_data(self.get_form_data(form, request=request))
         form_submission = self.get_form_submission(form_data, page=page)
         try:
+            checksums = get_upload_checksums(request)
             for field_name in request.FILES:
                 file = request.FILES[field_name]
-                self.get_uploaded_file_class().objects.create(
-                    form_submission=form_submission,
-                    file=file,
+                self.create_uploaded_file(
+                    form_submission, file, checksum=checksums.get(field_name, "")
                 )
         except AttributeError:
             logger.warning(
                 "Could not upload file, WAGTAIL_MODEL_FORMS_UPLOADED_FILE_MODEL is not configured"
             )
+        self.handle_submission(form_submission, request=request)
         return form_submission
+
+    def get_submission_handlers(self):
+        """
+        Returns the handlers to run after a submission, the registered handlers
+        and those of the mixins of the form.
+        """
+        return get_submission_handlers()
+
+    def handle_submission(self, form_submission, request=None):
+        run_submission_handlers(
+            self, form_submission, self.get_submission_handlers(), request=request
+        )
@@ -0,0 +1,184 @@
+import json
+from math import ceil
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.db import connections
+from django.utils.formats import number_format
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+from wagtail.admin.paginator import WagtailPaginator
+
+from wagtail_model_forms.settings import EXACT_COUNT_LIMIT
+
+EXACT = "exact"
+ESTIMATE = "estimate"
+LOWER_BOUND = "lower_bound"
+
+
+def get_estimated_count(queryset):
+    """
+    Returns the planner estimate of the number of rows on PostgreSQL, or None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) %s" % sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_capped_count(queryset, limit):
+    """
+    Counts at most limit + 1 rows.
+    """
+    return queryset.order_by()[: limit + 1].count()
+
+
+def get_approximate_count(queryset, limit=EXACT_COUNT_LIMIT):
+    """
+    Returns (count, kind). Counts below the limit are exact, larger counts are
+    the planner estimate on PostgreSQL or the limit as a lower bound elsewhere.
+    """
+    estimate = get_estimated_count(queryset)
+    if estimate is not None and estimate > limit:
+        return estimate, ESTIMATE
+    count = get_capped_count(queryset, limit)
+    if count > limit:
+        return limit, LOWER_BOUND
+    return count, EXACT
+
+
+def get_count_label(count, kind, verbose_name, verbose_name_plural):
+    number = number_format(count, force_grouping=True)
+    if kind == ESTIMATE:
+        return _("about %(count)s %(name)s") % {
+            "count": number,
+            "name": verbose_name_plural,
+        }
+    if kind == LOWER_BOUND:
+        return _("%(count)s+ %(name)s") % {"count": number, "name": verbose_name_plural}
+    if count == 1:
+        return "1 %s" % verbose_name
+    return "%s %s" % (number, verbose_name_plural)
+
+
+class CountlessPage(Page):
+    """
+    A page which knows whether there is a next page without a count.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountlessPaginator(WagtailPaginator):
+    """
+    Paginates with next and previous links only, the queryset is never counted.
+    One extra row is fetched to know whether there is a next page.
+    """
+
+    countless = True
+    num_page_buttons = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.last_page = None
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not object_list and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        has_next = len(object_list) > self.per_page
+        self.last_page = CountlessPage(
+            object_list[: self.per_page], number, self, has_next
+        )
+        return self.last_page
+
+    def get_page(self, number):
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            return self.page(1)
+
+    @property
+    def count(self):
+        """
+        Returns the number of rows up to and including the last page, which is a
+        lower bound when there is a next page.
+        """
+        if self.last_page is None:
+            return 0
+        return (self.last_page.number - 1) * self.per_page + len(
+            self.last_page.object_list
+        )
+
+    @property
+    def num_pages(self):
+        if self.last_page is None:
+            return 1
+        return self.last_page.number + int(self.last_page.has_next())
+
+    @property
+    def count_kind(self):
+        if self.last_page is not None and self.last_page.has_next():
+            return LOWER_BOUND
+        return EXACT
+
+    @property
+    def items_count_label(self):
+        return get_count_label(
+            self.count, self.count_kind, self.verbose_name, self.verbose_name_plural
+        )
+
+
+class ApproximateCountPaginator(CountlessPaginator):
+    """
+    Paginates with the approximate count of the queryset. Pages past an
+    estimate or lower bound remain reachable through the next link.
+    """
+
+    countless = False
+    num_page_buttons = WagtailPaginator.num_page_buttons
+
+    @cached_property
+    def counted(self):
+        return get_approximate_count(self.object_list)
+
+    @property
+    def count(self):
+        return self.counted[0]
+
+    @property
+    def count_kind(self):
+        return self.counted[1]
+
+    @property
+    def num_pages(self):
+        num_pages = ceil(max(self.count, 1) / self.per_page)
+        return max(num_pages, super().num_pages)
+
+
+PAGINATOR_CLASSES = {
+    "exact": WagtailPaginator,
+    "approximate": ApproximateCountPaginator,
+    "countless": CountlessPaginator,
+}
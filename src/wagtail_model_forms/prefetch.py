@@ -0,0 +1,42 @@
+from contextvars import ContextVar
+
+from wagtail_model_forms import get_form_model
+
+_form_map = ContextVar("wagtail_model_forms_form_map", default=None)
+
+
+def get_form_map(request=None):
+    """
+    Returns the identity map {id: form} of the request, or of the page being served.
+    """
+    if request is None:
+        return _form_map.get()
+    if not hasattr(request, "_wagtail_model_forms"):
+        request._wagtail_model_forms = {}
+    return request._wagtail_model_forms
+
+
+def activate_form_map(request):
+    """
+    Make the identity map of the request available to the form chooser blocks.
+    """
+    _form_map.set(get_form_map(request))
+
+
+def deactivate_form_map(*args):
+    _form_map.set(None)
+
+
+def prefetch_forms(form_ids, form_map):
+    """
+    Load the forms which are not in the identity map yet with a single query.
+    """
+    missing = {int(x) for x in form_ids if x is not None} - form_map.keys()
+    if missing:
+        form_map.update(get_form_model().objects.in_bulk(missing))
+    return form_map
+
+
+def get_request_form(request, form_id):
+    form_map = prefetch_forms([form_id], get_form_map(request))
+    return form_map.get(int(form_id))
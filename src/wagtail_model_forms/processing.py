@@ -0,0 +1,334 @@
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from wagtail_model_forms import get_uploaded_file_model
+from wagtail_model_forms.settings import (
+    UPLOAD_PROCESSING_TIMEOUT,
+    UPLOADED_FILE_DEDUPLICATION,
+    UPLOADED_IMAGE_MAX_SIZE,
+)
+from wagtail_model_forms.uploads import (
+    delete_file_if_unreferenced,
+    get_checksum,
+    restore_deduplicated_file,
+    store_deduplicated_file,
+)
+
+try:
+    import pypdf
+except ImportError:  # pragma: no cover
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+_processors = {}
+
+# The EICAR test file, which every virus scanner detects
+EICAR_SIGNATURE = (
+    rb"X5O!P%@AP[4\PZX54(P^)7CC)7}$EICAR-STANDARD-ANTIVIRUS-TEST-FILE!$H+H*"
+)
+
+DOWNSCALE_FORMATS = ["JPEG", "PNG", "WEBP"]
+
+TEXT_MAX_LENGTH = 100000
+
+
+class InfectedFile(Exception):
+    """
+    Raised by a processor which detects malware, the file is removed.
+    """
+
+
+class UploadProcessor:
+    """
+    A step of the post-processing of an uploaded file, called as
+    func(uploaded_file). Processors run in the order of `order` in a worker
+    process, they change the fields of the uploaded file which are saved
+    after the last one.
+    """
+
+    def __init__(self, name, func, order=100):
+        self.name = name
+        self.func = func
+        self.order = order
+
+    def __repr__(self):
+        return "<UploadProcessor %s>" % self.name
+
+    def __call__(self, uploaded_file):
+        return self.func(uploaded_file)
+
+
+def register_upload_processor(name, func=None, order=100):
+    """
+    Registers a processor for all uploaded files, as a function or as a
+    decorator. A processor replaces the registered processor of the same name.
+    """
+    if func is None:
+
+        def decorator(func):
+            register_upload_processor(name, func, order=order)
+            return func
+
+        return decorator
+
+    _processors[name] = UploadProcessor(name, func, order=order)
+    return _processors[name]
+
+
+def unregister_upload_processor(name):
+    _processors.pop(name, None)
+
+
+def get_upload_processors():
+    return sorted(_processors.values(), key=lambda x: x.order)
+
+
+def read_file(uploaded_file):
+    with uploaded_file.file.open("rb") as f:
+        return f.read()
+
+
+def replace_file(uploaded_file, content):
+    """
+    Stores new content for an uploaded file, the previous file is deleted
+    once no uploaded file references it anymore.
+
+    The names of the files written are kept in written_files, so they are
+    deleted again when the processing fails.
+    """
+    UploadedFile = type(uploaded_file)
+    old_name = uploaded_file.file.name
+    file = ContentFile(content, name=os.path.basename(old_name))
+    using = uploaded_file._state.db
+    if UPLOADED_FILE_DEDUPLICATION:
+        name, checksum = store_deduplicated_file(UploadedFile, file)
+        restore_deduplicated_file(UploadedFile, name, file, using=using)
+    else:
+        storage = UploadedFile._meta.get_field("file").storage
+        name, checksum = storage.save(old_name, file), ""
+    uploaded_file.written_files = getattr(uploaded_file, "written_files", []) + [name]
+    uploaded_file.file.name = name
+    uploaded_file.checksum = checksum
+    transaction.on_commit(
+        lambda: delete_file_if_unreferenced(UploadedFile, old_name, using=using),
+        using=using,
+    )
+
+
+@register_upload_processor("scan", order=10)
+def scan_file(uploaded_file):
+    """
+    Local stand-in for a malware scanner which detects the EICAR test file.
+    Register a processor named "scan" to use a real scanner.
+    """
+    if EICAR_SIGNATURE in read_file(uploaded_file):
+        raise InfectedFile("EICAR-Test-File")
+
+
+@register_upload_processor("downscale", order=20)
+def downscale_image(uploaded_file):
+    """
+    Downscales images larger than WAGTAIL_MODEL_FORMS_UPLOADED_IMAGE_MAX_SIZE.
+    """
+    if not UPLOADED_IMAGE_MAX_SIZE:
+        return
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        image = Image.open(io.BytesIO(read_file(uploaded_file)))
+    except UnidentifiedImageError:
+        return
+    if (
+        image.format not in DOWNSCALE_FORMATS
+        or getattr(image, "is_animated", False)
+        or max(image.size) <= UPLOADED_IMAGE_MAX_SIZE
+    ):
+        return
+
+    image_format = image.format
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((UPLOADED_IMAGE_MAX_SIZE, UPLOADED_IMAGE_MAX_SIZE))
+    output = io.BytesIO()
+    if image_format == "JPEG":
+        image.convert("RGB").save(output, image_format, quality=85, optimize=True)
+    else:
+        image.save(output, image_format)
+    replace_file(uploaded_file, output.getvalue())
+
+
+@register_upload_processor("checksum", order=30)
+def compute_checksum(uploaded_file):
+    if not uploaded_file.checksum:
+        with uploaded_file.file.open("rb") as f:
+            uploaded_file.checksum = get_checksum(f)
+
+
+@register_upload_processor("text", order=40)
+def extract_text(uploaded_file):
+    """
+    Extracts the text of PDF files for the report search, with pypdf when it
+    is installed.
+    """
+    if pypdf is None:
+        return
+    content = read_file(uploaded_file)
+    if not content.startswith(b"%PDF"):
+        return
+    reader = pypdf.PdfReader(io.BytesIO(content))
+    text = " ".join(
+        " ".join((page.extract_text() or "").split()) for page in reader.pages
+    )
+    uploaded_file.text = text[:TEXT_MAX_LENGTH]
+
+
+def delete_written_files(uploaded_file):
+    """
+    Deletes the files a failed processing wrote, which the rolled back
+    uploaded file does not reference.
+    """
+    UploadedFile = type(uploaded_file)
+    for name in getattr(uploaded_file, "written_files", []):
+        delete_file_if_unreferenced(UploadedFile, name, using=uploaded_file._state.db)
+
+
+def process_uploaded_file(pk):
+    """
+    Runs the processors on a claimed uploaded file and returns its new status.
+    """
+    UploadedFile = get_uploaded_file_model()
+    using = router.db_for_write(UploadedFile)
+    queryset = UploadedFile.objects.using(using)
+    uploaded_file = queryset.select_related("form_submission").get(pk=pk)
+    text = uploaded_file.text
+    try:
+        with transaction.atomic(using=using):
+            for processor in get_upload_processors():
+                processor(uploaded_file)
+            uploaded_file.status = UploadedFile.Status.PROCESSED
+            uploaded_file.processing_error = ""
+            uploaded_file.processed_at = timezone.now()
+            uploaded_file.save(
+                update_fields=[
+                    "file",
+                    "checksum",
+                    "text",
+                    "status",
+                    "processing_error",
+                    "processed_at",
+                ]
+            )
+            if uploaded_file.text != text:
+                form_submission = uploaded_file.form_submission
+                form_submission.search_document = form_submission.get_search_document()
+                form_submission.save(update_fields=["search_document"])
+    except InfectedFile as err:
+        logger.warning("Uploaded file #%s is infected: %s" % (pk, err))
+        delete_written_files(uploaded_file)
+        name = queryset.get(pk=pk).file.name
+        queryset.filter(pk=pk).update(
+            file="",
+            status=UploadedFile.Status.INFECTED,
+            processing_error=str(err),
+            processed_at=timezone.now(),
+        )
+        delete_file_if_unreferenced(UploadedFile, name, using=using)
+        return UploadedFile.Status.INFECTED
+    except Exception as err:
+        logger.exception("Processing uploaded file #%s failed" % pk)
+        delete_written_files(uploaded_file)
+        queryset.filter(pk=pk).update(
+            status=UploadedFile.Status.FAILED,
+            processing_error=str(err),
+            processed_at=timezone.now(),
+        )
+        return UploadedFile.Status.FAILED
+    return UploadedFile.Status.PROCESSED
+
+
+def reset_stale_uploaded_files(timeout=None):
+    """
+    Queue the files again which are processing for longer than timeout seconds
+    (UPLOAD_PROCESSING_TIMEOUT by default), e.g. when their worker was killed.
+    Returns the number of files reset.
+    """
+    UploadedFile = get_uploaded_file_model()
+    if timeout is None:
+        timeout = UPLOAD_PROCESSING_TIMEOUT
+    queryset = UploadedFile.objects.using(router.db_for_write(UploadedFile))
+    stale = queryset.filter(
+        Q(claimed_at__isnull=True)
+        | Q(claimed_at__lt=timezone.now() - timedelta(seconds=timeout)),
+        status=UploadedFile.Status.PROCESSING,
+    )
+    total = stale.update(status=UploadedFile.Status.PENDING, claimed_at=None)
+    if total:
+        logger.warning("Reset %s stale uploaded files" % total)
+    return total
+
+
+def claim_uploaded_files(limit):
+    """
+    Claims up to limit pending uploaded files, returns their pks.
+    """
+    UploadedFile = get_uploaded_file_model()
+    queryset = UploadedFile.objects.using(router.db_for_write(UploadedFile))
+    pending = queryset.filter(status=UploadedFile.Status.PENDING).order_by("pk")
+    pks = []
+    for pk in pending.values_list("pk", flat=True)[:limit]:
+        claimed = queryset.filter(pk=pk, status=UploadedFile.Status.PENDING).update(
+            status=UploadedFile.Status.PROCESSING, claimed_at=timezone.now()
+        )
+        if claimed:
+            pks.append(pk)
+    return pks
+
+
+def init_worker():
+    import django
+    from django.apps import apps
+
+    # Spawned workers start without Django, forked ones inherit it
+    if not apps.ready:
+        django.setup()
+
+
+def process_uploaded_files(workers=1, batch_size=100, timeout=None):
+    """
+    Processes the pending uploaded files in batches until there are none
+    left, in a pool of worker processes when workers > 1. Returns
+    {status: number of files}.
+
+    Stale processing files are queued again first, see reset_stale_uploaded_files.
+    """
+    reset_stale_uploaded_files(timeout=timeout)
+    totals = {}
+    executor = None
+    try:
+        while True:
+            pks = claim_uploaded_files(batch_size)
+            if not pks:
+                return totals
+            if workers > 1:
+                if executor is None:
+                    # The workers open their own connections
+                    connections.close_all()
+                    executor = ProcessPoolExecutor(
+                        max_workers=workers, initializer=init_worker
+                    )
+                statuses = executor.map(process_uploaded_file, pks)
+            else:
+                statuses = map(process_uploaded_file, pks)
+            for status in statuses:
+                totals[status] = totals.get(status, 0) + 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,114 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS
+
+from wagtail_model_forms.settings import (
+    ERASURE_CHECKPOINT_MODEL,
+    EXPORT_JOB_MODEL,
+    READ_DATABASE,
+    READ_YOUR_WRITES_TIMEOUT,
+    SCHEMA_MODEL,
+    STATISTIC_MODEL,
+    SUBMISSION_MODEL,
+    UPLOADED_FILE_MODEL,
+    WEBHOOK_DELIVERY_MODEL,
+    WEBHOOK_QUEUE_MODEL,
+    WRITE_DATABASE,
+)
+
+PINNED_SESSION_KEY = "wagtail_model_forms_pinned_until"
+
+_write_pinned = ContextVar("wagtail_model_forms_write_pinned", default=False)
+
+
+def get_routed_models():
+    return {
+        x.lower()
+        for x in [
+            SUBMISSION_MODEL,
+            UPLOADED_FILE_MODEL,
+            STATISTIC_MODEL,
+            SCHEMA_MODEL,
+            ERASURE_CHECKPOINT_MODEL,
+            EXPORT_JOB_MODEL,
+            WEBHOOK_QUEUE_MODEL,
+            WEBHOOK_DELIVERY_MODEL,
+        ]
+        if x
+    }
+
+
+def get_write_database():
+    return WRITE_DATABASE or None
+
+
+def get_read_database():
+    if _write_pinned.get():
+        return WRITE_DATABASE or DEFAULT_DB_ALIAS
+    return READ_DATABASE or WRITE_DATABASE or None
+
+
+@contextmanager
+def use_write_database(pinned=True):
+    """
+    Read the submission models from the write database within the block.
+    """
+    token = _write_pinned.set(pinned or _write_pinned.get())
+    try:
+        yield
+    finally:
+        _write_pinned.reset(token)
+
+
+def pin_write_database(request):
+    """
+    Read from the write database for the following requests of the session, so
+    an editor sees their own changes while the replica catches up.
+    """
+    if hasattr(request, "session"):
+        request.session[PINNED_SESSION_KEY] = time.time() + READ_YOUR_WRITES_TIMEOUT
+
+
+def is_write_database_pinned(request):
+    if not hasattr(request, "session"):
+        return False
+    return request.session.get(PINNED_SESSION_KEY, 0) > time.time()
+
+
+class FormSubmissionRouter:
+    """
+    Routes the models of this package which are configured (submissions,
+    uploaded files, statistics, schemas, erasure checkpoints, export jobs and
+    webhook payloads and deliveries) to WAGTAIL_MODEL_FORMS_WRITE_DATABASE and
+    WAGTAIL_MODEL_FORMS_READ_DATABASE. The form model is not routed.
+
+    The aliases must hold the complete schema (e.g. a dedicated connection to
+    the primary and a replica of it), submissions refer to forms and pages.
+    Migrations run on the primary, the read alias never gets any.
+    """
+
+    def is_routed(self, model):
+        return model._meta.label_lower in get_routed_models()
+
+    def db_for_read(self, model, **hints):
+        if self.is_routed(model):
+            return get_read_database()
+        return None
+
+    def db_for_write(self, model, **hints):
+        if self.is_routed(model):
+            return get_write_database()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if self.is_routed(obj1) or self.is_routed(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # A replica receives its schema from the primary
+        if db == READ_DATABASE and db != (WRITE_DATABASE or DEFAULT_DB_ALIAS):
+            return False
+        return None
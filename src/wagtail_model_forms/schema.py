@@ -0,0 +1,63 @@
+import hashlib
+import json
+
+from wagtail_model_forms import get_schema_model
+
+# Schemas are immutable, a digest which has been stored or loaded once never
+# needs to be written or queried again by this process.
+_stored_schemas = set()
+_schema_fields = {}
+
+
+def get_schema_fields(form):
+    """
+    Returns the compiled field spec of a form as [{"name", "type", "label"},].
+    """
+    from wagtail_model_forms.models import iter_form_fields
+
+    fields = []
+    for clean_name, block_type, value in iter_form_fields(form.get_form_fields()):
+        field = {"name": clean_name, "type": block_type, "label": value["label"]}
+        if value.get("choices"):
+            field["choices"] = [str(x["value"]) for x in value["choices"]]
+        fields.append(field)
+    return fields
+
+
+def get_schema_digest(fields):
+    data = json.dumps(fields, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def store_schema(form, digest, fields=None):
+    """
+    Stores a snapshot of the fields once per form and digest, the fields are
+    only compiled when the snapshot has not been stored by this process yet.
+    """
+    if (form.pk, digest) in _stored_schemas:
+        return
+    if fields is None:
+        fields = get_schema_fields(form)
+    Schema = get_schema_model()
+    # A single INSERT, the snapshot of another process wins on conflicts
+    Schema.objects.bulk_create(
+        [Schema(form=form, digest=digest, fields=fields)], ignore_conflicts=True
+    )
+    _stored_schemas.add((form.pk, digest))
+    _schema_fields[digest] = fields
+
+
+def get_schemas(digests):
+    """
+    Returns {digest: fields} for the digests, with one query for the digests
+    which have not been loaded before.
+    """
+    digests = {x for x in digests if x}
+    missing = digests - _schema_fields.keys()
+    if missing:
+        Schema = get_schema_model()
+        for digest, fields in Schema.objects.filter(digest__in=missing).values_list(
+            "digest", "fields"
+        ):
+            _schema_fields[digest] = fields
+    return {x: _schema_fields[x] for x in digests if x in _schema_fields}
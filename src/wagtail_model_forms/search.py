@@ -0,0 +1,26 @@
+from django.db import connections
+
+from wagtail_model_forms.settings import SEARCH_CONFIG
+
+
+def search_form_submissions(queryset, query):
+    """
+    Filter a form submission queryset on the submitted values.
+
+    PostgreSQL uses full-text search on the search document, which can be backed
+    by a GIN index; other databases fall back to a case-insensitive contains.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if connections[queryset.db].vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        return queryset.annotate(
+            search=SearchVector("search_document", config=SEARCH_CONFIG)
+        ).filter(search=SearchQuery(query, config=SEARCH_CONFIG))
+
+    for term in query.split():
+        queryset = queryset.filter(search_document__icontains=term)
+    return queryset
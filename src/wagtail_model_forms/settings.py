@@ -6,9 +6,50 @@ def get_setting(name: str, default=None):
 
 
 ADD_NEVER_CACHE_HEADERS = get_setting("ADD_NEVER_CACHE_HEADERS", default=True)
+POST_REDIRECT_GET = get_setting("POST_REDIRECT_GET", default=False)
+SUCCESS_CACHE_MAX_AGE = get_setting("SUCCESS_CACHE_MAX_AGE", default=300)
+HANDLER_WORKERS = get_setting("HANDLER_WORKERS", default=4)
+DEFERRED_HANDLERS = get_setting("DEFERRED_HANDLERS", default=[])
+FORM_DEFINITION_MAX_AGE = get_setting("FORM_DEFINITION_MAX_AGE", default=60)
+FORM_DATA_COMPRESSION = get_setting("FORM_DATA_COMPRESSION", default="")
+FORM_DATA_COMPRESSION_MIN_SIZE = get_setting(
+    "FORM_DATA_COMPRESSION_MIN_SIZE", default=1024
+)
 FORM_MODEL = get_setting("FORM_MODEL", default="")
 SUBMISSION_MODEL = get_setting("SUBMISSION_MODEL", default="")
 UPLOADED_FILE_MODEL = get_setting("UPLOADED_FILE_MODEL", default="")
+STATISTIC_MODEL = get_setting("STATISTIC_MODEL", default="")
+SCHEMA_MODEL = get_setting("SCHEMA_MODEL", default="")
+ERASURE_CHECKPOINT_MODEL = get_setting("ERASURE_CHECKPOINT_MODEL", default="")
+EXPORT_JOB_MODEL = get_setting("EXPORT_JOB_MODEL", default="")
+EXPORT_JOBS_MAX_CONCURRENT = get_setting("EXPORT_JOBS_MAX_CONCURRENT", default=2)
+EXPORT_CHUNK_SIZE = get_setting("EXPORT_CHUNK_SIZE", default=1000)
+EXPORT_JOB_TIMEOUT = get_setting("EXPORT_JOB_TIMEOUT", default=3600)
+WEBHOOK_QUEUE_MODEL = get_setting("WEBHOOK_QUEUE_MODEL", default="")
+WEBHOOK_MAX_ATTEMPTS = get_setting("WEBHOOK_MAX_ATTEMPTS", default=5)
+WEBHOOK_DELIVERY_MODEL = get_setting("WEBHOOK_DELIVERY_MODEL", default="")
+WEBHOOK_TIMEOUT = get_setting("WEBHOOK_TIMEOUT", default=10)
+WEBHOOK_BREAKER_THRESHOLD = get_setting("WEBHOOK_BREAKER_THRESHOLD", default=5)
+WEBHOOK_BREAKER_COOLDOWN = get_setting("WEBHOOK_BREAKER_COOLDOWN", default=60)
+WEBHOOK_RETRY_BACKOFF = get_setting("WEBHOOK_RETRY_BACKOFF", default=30)
+WEBHOOK_RETRY_BACKOFF_MAX = get_setting("WEBHOOK_RETRY_BACKOFF_MAX", default=3600)
+WEBHOOK_RETENTION_DAYS = get_setting("WEBHOOK_RETENTION_DAYS", default=30)
+WEBHOOK_SENDING_TIMEOUT = get_setting("WEBHOOK_SENDING_TIMEOUT", default=600)
 REPORTS = get_setting("REPORTS", default=True)
+REPORT_PAGINATION = get_setting("REPORT_PAGINATION", default="exact")
+FORM_CHOOSER_COUNTS = get_setting("FORM_CHOOSER_COUNTS", default=False)
+EXACT_COUNT_LIMIT = get_setting("EXACT_COUNT_LIMIT", default=10000)
+WRITE_DATABASE = get_setting("WRITE_DATABASE", default="")
+READ_DATABASE = get_setting("READ_DATABASE", default="")
+READ_YOUR_WRITES_TIMEOUT = get_setting("READ_YOUR_WRITES_TIMEOUT", default=10)
+UPLOADED_FILE_DEDUPLICATION = get_setting("UPLOADED_FILE_DEDUPLICATION", default=False)
+UPLOADED_FILE_DEDUPLICATION_PATH = get_setting(
+    "UPLOADED_FILE_DEDUPLICATION_PATH", default="form-uploads"
+)
+UPLOADED_IMAGE_MAX_SIZE = get_setting("UPLOADED_IMAGE_MAX_SIZE", default=2048)
+UPLOAD_PROCESSING_WORKERS = get_setting("UPLOAD_PROCESSING_WORKERS", default=4)
+UPLOAD_PROCESSING_TIMEOUT = get_setting("UPLOAD_PROCESSING_TIMEOUT", default=600)
 
 CIRSPY_FORMS_FORM_TAG = get_setting("CIRSPY_FORMS_FORM_TAG", default=False)
+
+SEARCH_CONFIG = get_setting("SEARCH_CONFIG", default="simple")
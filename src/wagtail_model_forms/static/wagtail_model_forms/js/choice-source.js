@@ -0,0 +1,52 @@
+/**
+ * Suggests the choices of a choice source field from its autocomplete
+ * endpoint while typing, instead of rendering every choice into the page.
+ */
+(function () {
+  'use strict';
+
+  var DELAY = 250;
+  var timeouts = new WeakMap();
+
+  function getDatalist(input) {
+    var datalist = input.list;
+    if (!datalist) {
+      datalist = document.createElement('datalist');
+      datalist.id = input.id + '-choices';
+      input.after(datalist);
+      input.setAttribute('list', datalist.id);
+    }
+    return datalist;
+  }
+
+  function search(input) {
+    var url = new URL(input.dataset.autocompleteUrl, window.location.href);
+    url.searchParams.set('q', input.value);
+
+    fetch(url, { credentials: 'same-origin' })
+      .then(function (response) {
+        return response.json();
+      })
+      .then(function (data) {
+        var datalist = getDatalist(input);
+        datalist.replaceChildren();
+        data.results.forEach(function (result) {
+          datalist.append(new Option(result.text, result.id));
+        });
+      });
+  }
+
+  document.addEventListener('input', function (event) {
+    var input = event.target;
+    if (!input.matches || !input.matches('[data-autocomplete-url]')) {
+      return;
+    }
+    clearTimeout(timeouts.get(input));
+    timeouts.set(
+      input,
+      setTimeout(function () {
+        search(input);
+      }, DELAY),
+    );
+  });
+})();
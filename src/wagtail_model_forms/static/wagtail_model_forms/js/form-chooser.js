@@ -0,0 +1,82 @@
+/**
+ * Loads the options of the form filter of the report from the form chooser
+ * endpoint while typing, instead of rendering every form into the page.
+ */
+(function () {
+  'use strict';
+
+  var DELAY = 250;
+  var timeouts = new WeakMap();
+
+  function search(input) {
+    var chooser = input.closest('[data-wagtail-model-forms-form-chooser]');
+    var select = chooser.querySelector('select');
+    var url = new URL(chooser.dataset.url, window.location.href);
+    url.searchParams.set('q', input.value);
+
+    fetch(url, { credentials: 'same-origin' })
+      .then(function (response) {
+        return response.json();
+      })
+      .then(function (data) {
+        var selected = select.value;
+        Array.from(select.options).forEach(function (option) {
+          if (option.value && option.value !== selected) {
+            option.remove();
+          }
+        });
+        data.results.forEach(function (result) {
+          if (String(result.id) !== selected) {
+            select.add(new Option(result.text, result.id));
+          }
+        });
+        if (data.pagination.more) {
+          var more = new Option('…', '');
+          more.disabled = true;
+          select.add(more);
+        }
+      });
+  }
+
+  function isSearchInput(target) {
+    return target.matches && target.matches('[data-form-chooser-search]');
+  }
+
+  // Captured on the document, so typing a query does not submit the filters
+  document.addEventListener(
+    'input',
+    function (event) {
+      var input = event.target;
+      if (!isSearchInput(input)) {
+        return;
+      }
+      event.stopPropagation();
+      clearTimeout(timeouts.get(input));
+      timeouts.set(
+        input,
+        setTimeout(function () {
+          search(input);
+        }, DELAY),
+      );
+    },
+    true,
+  );
+
+  document.addEventListener(
+    'change',
+    function (event) {
+      if (isSearchInput(event.target)) {
+        event.stopPropagation();
+      }
+    },
+    true,
+  );
+
+  document.addEventListener('focusin', function (event) {
+    var input = event.target;
+    if (isSearchInput(input) && !input.dataset.loaded) {
+      input.dataset.loaded = 'true';
+      search(input);
+    }
+  });
+})();
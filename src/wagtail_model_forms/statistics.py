@@ -0,0 +1,255 @@
+import operator
+from collections import Counter
+from functools import reduce
+
+from django.core.cache import cache
+from django.db import IntegrityError, router, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from wagtail_model_forms import (
+    get_form_model,
+    get_statistic_model,
+    get_submission_model,
+)
+
+CHOICE_BLOCK_TYPES = ["dropdown", "radio", "checkboxes", "multiselect"]
+
+NEW_SUBMISSION_COUNTS_CACHE_PREFIX = "wagtail_model_forms_new_submissions_"
+NEW_SUBMISSION_COUNTS_CACHE_TIMEOUT = 60
+
+
+def get_choice_field_names(form):
+    from wagtail_model_forms.models import iter_form_fields
+
+    return [
+        clean_name
+        for clean_name, block_type, value in iter_form_fields(form.get_form_fields())
+        if block_type in CHOICE_BLOCK_TYPES
+    ]
+
+
+def get_statistic_keys(form_submission, choice_field_names):
+    """
+    Returns the (date, field_name, value) keys counted for a submission.
+
+    The daily total of a form is stored with an empty field name and value.
+    """
+    date = timezone.localdate(form_submission.submit_time)
+    keys = [(date, "", "")]
+    data = form_submission.data
+    for field_name in choice_field_names:
+        values = data.get(field_name)
+        if not values:
+            continue
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for value in values:
+            keys.append((date, field_name, str(value)[:255]))
+    return keys
+
+
+def increment_statistic(form, date, field_name, value):
+    Statistic = get_statistic_model()
+    lookup = {"form": form, "date": date, "field_name": field_name, "value": value}
+    if Statistic.objects.filter(**lookup).update(count=F("count") + 1):
+        return
+    try:
+        with transaction.atomic(using=router.db_for_write(Statistic)):
+            Statistic.objects.create(count=1, **lookup)
+    except IntegrityError:
+        Statistic.objects.filter(**lookup).update(count=F("count") + 1)
+
+
+def get_statistic_filter(keys):
+    return reduce(
+        operator.or_,
+        [
+            Q(date=date, field_name=field_name, value=value)
+            for date, field_name, value in keys
+        ],
+    )
+
+
+def record_form_submission(form_submission):
+    """
+    Count a submission, the existing counters are incremented with one query
+    and the missing ones are inserted with another.
+    """
+    Statistic = get_statistic_model()
+    form = form_submission.form
+    keys = set(get_statistic_keys(form_submission, get_choice_field_names(form)))
+
+    queryset = Statistic.objects.filter(get_statistic_filter(keys), form=form)
+    existing = {
+        (date, field_name, value): pk
+        for pk, date, field_name, value in queryset.values_list(
+            "pk", "date", "field_name", "value"
+        )
+    }
+    if existing:
+        Statistic.objects.filter(pk__in=existing.values()).update(count=F("count") + 1)
+    missing = [x for x in keys if x not in existing]
+    try:
+        with transaction.atomic(using=router.db_for_write(Statistic)):
+            Statistic.objects.bulk_create(
+                [
+                    Statistic(
+                        form=form,
+                        date=date,
+                        field_name=field_name,
+                        value=value,
+                        count=1,
+                    )
+                    for date, field_name, value in missing
+                ]
+            )
+    except IntegrityError:
+        # Inserted by a concurrent submission meanwhile
+        for date, field_name, value in missing:
+            increment_statistic(form, date, field_name, value)
+
+
+def get_recorded_keys(form_submission):
+    """
+    Returns the keys counted for a submission, from its own data and the
+    counters of its form, as the fields of the form may have changed since.
+    """
+    Statistic = get_statistic_model()
+    date = timezone.localdate(form_submission.submit_time)
+    data = form_submission.data
+    keys = {(date, "", "")}
+    for field_name, values in data.items():
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for value in values:
+            if value not in (None, ""):
+                keys.add((date, field_name, str(value)[:255]))
+
+    counted = Statistic.objects.filter(
+        Q(field_name="") | Q(field_name__in=list(data)),
+        form_id=form_submission.form_id,
+        date=date,
+    ).values_list("date", "field_name", "value")
+    return [x for x in counted if x in keys]
+
+
+def remove_form_submission(form_submission):
+    Statistic = get_statistic_model()
+    keys = get_recorded_keys(form_submission)
+    if not keys:
+        return
+    queryset = Statistic.objects.filter(
+        get_statistic_filter(keys), form_id=form_submission.form_id
+    )
+    queryset.filter(count__lte=1).delete()
+    queryset.update(count=F("count") - 1)
+
+
+def form_submission_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, get_form_model()):
+        # The statistics of the form are deleted with it
+        return
+    if hasattr(get_form_model(), "handle_statistics"):
+        remove_form_submission(instance)
+
+
+def rebuild_statistics(form, batch_size=1000):
+    """
+    Recount the statistics of a form from its submissions, returns the number of submissions.
+    """
+    Statistic = get_statistic_model()
+    FormSubmission = get_submission_model()
+
+    choice_field_names = get_choice_field_names(form)
+    queryset = FormSubmission.objects.filter(form=form).order_by("pk")
+    counter = Counter()
+    total = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).only("pk", "form_data", "submit_time")[
+                :batch_size
+            ]
+        )
+        if not batch:
+            break
+        for form_submission in batch:
+            counter.update(get_statistic_keys(form_submission, choice_field_names))
+        last_pk = batch[-1].pk
+        total += len(batch)
+
+    with transaction.atomic(using=router.db_for_write(Statistic)):
+        Statistic.objects.filter(form=form).delete()
+        Statistic.objects.bulk_create(
+            [
+                Statistic(
+                    form=form,
+                    date=date,
+                    field_name=field_name,
+                    value=value,
+                    count=count,
+                )
+                for (date, field_name, value), count in counter.items()
+            ],
+            batch_size=batch_size,
+        )
+    return total
+
+
+def get_form_statistics(form, start_date=None, end_date=None):
+    """
+    Returns the daily totals and the per-choice tallies of a form.
+    """
+    Statistic = get_statistic_model()
+    queryset = Statistic.objects.filter(form=form)
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+
+    days = []
+    choices = {}
+    for date, field_name, value, count in queryset.order_by("date").values_list(
+        "date", "field_name", "value", "count"
+    ):
+        if not field_name:
+            days.append((date, count))
+        else:
+            field_choices = choices.setdefault(field_name, Counter())
+            field_choices[value] += count
+    return {
+        "days": days,
+        "total": sum(count for date, count in days),
+        "choices": {
+            field_name: counter.most_common() for field_name, counter in choices.items()
+        },
+    }
+
+
+def get_new_submission_counts(form_ids):
+    """
+    Returns {form_id: number of new submissions} for the forms, from the cache
+    or else with a single aggregate query for the missing forms.
+    """
+    keys = {x: "%s%s" % (NEW_SUBMISSION_COUNTS_CACHE_PREFIX, x) for x in form_ids}
+    cached = cache.get_many(keys.values())
+    counts = {x: cached[key] for x, key in keys.items() if key in cached}
+    missing = [x for x in form_ids if x not in counts]
+    if missing:
+        FormSubmission = get_submission_model()
+        aggregate = dict(
+            FormSubmission.objects.filter(
+                form__in=missing, status=FormSubmission.Status.NEW
+            )
+            .values_list("form")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+        fetched = {x: aggregate.get(x, 0) for x in missing}
+        cache.set_many(
+            {keys[x]: count for x, count in fetched.items()},
+            NEW_SUBMISSION_COUNTS_CACHE_TIMEOUT,
+        )
+        counts.update(fetched)
+    return counts
@@ -0,0 +1,348 @@
+import datetime
+import io
+import json
+import math
+import random
+import string
+
+from django.db import connections, models, router
+from django.utils import timezone
+
+from wagtail_model_forms.compression import dump_form_data
+from wagtail_model_forms.utils import get_search_document, preserve_auto_now_add
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud"
+).split()
+
+# Choice sources depend on the project, the generator sticks to the other types
+FIELD_TYPES = [
+    "singleline",
+    "multiline",
+    "email",
+    "url",
+    "number",
+    "date",
+    "datetime",
+    "dropdown",
+    "radio",
+    "checkbox",
+    "checkboxes",
+    "multiselect",
+    "hidden",
+    "file",
+]
+
+CHOICE_FIELD_TYPES = ["dropdown", "radio", "checkboxes", "multiselect"]
+
+
+def get_words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def get_random_field(rng, block_type, label):
+    value = {"label": label, "help_text": "", "required": rng.random() < 0.5}
+    if block_type in CHOICE_FIELD_TYPES:
+        value["choices"] = [
+            {"value": "%s %s" % (get_words(rng, 1).title(), i), "default_value": False}
+            for i in range(rng.randint(2, 6))
+        ]
+    return (block_type, value)
+
+
+def get_random_fields(rng, count=8, fieldsets=2, rows=1):
+    """
+    Returns the raw stream data of a form with top level fields, fieldsets
+    and fieldrows, like the fields an editor builds in the admin.
+    """
+    labels = iter("%s %s" % (get_words(rng, 2).title(), i) for i in range(10**6))
+
+    def fields(n):
+        return [
+            get_random_field(rng, rng.choice(FIELD_TYPES), next(labels))
+            for _ in range(n)
+        ]
+
+    def fieldrow():
+        return ("fieldrow", {"form_fields": fields(rng.randint(2, 3))})
+
+    stream = fields(count)
+    stream += [fieldrow() for _ in range(rows)]
+    for i in range(fieldsets):
+        stream.append(
+            (
+                "fieldset",
+                {
+                    "legend": "%s %s" % (get_words(rng, 2).title(), i),
+                    "form_fields": fields(rng.randint(2, 4)) + [fieldrow()],
+                },
+            )
+        )
+    return stream
+
+
+def get_random_value(rng, block_type, value):
+    """
+    Returns a submitted value for a field, as the form data would store it.
+    """
+    choices = [str(x["value"]) for x in value.get("choices") or []]
+    if block_type == "multiline":
+        return get_words(rng, rng.randint(5, 40))
+    if block_type == "email":
+        return "%s%s@example.com" % (rng.choice(WORDS), rng.randint(1, 10**6))
+    if block_type == "url":
+        return "https://example.com/%s" % rng.choice(WORDS)
+    if block_type == "number":
+        return str(rng.randint(0, 10**4))
+    if block_type == "date":
+        return str(datetime.date(2020, 1, 1) + datetime.timedelta(rng.randint(0, 2000)))
+    if block_type == "datetime":
+        return "%sT%02d:%02d:00" % (
+            datetime.date(2020, 1, 1) + datetime.timedelta(rng.randint(0, 2000)),
+            rng.randint(0, 23),
+            rng.randint(0, 59),
+        )
+    if block_type in ["dropdown", "radio"]:
+        return rng.choice(choices)
+    if block_type in ["checkboxes", "multiselect"]:
+        return rng.sample(choices, rng.randint(1, len(choices)))
+    if block_type == "checkbox":
+        return rng.random() < 0.5
+    return get_words(rng, rng.randint(1, 4))
+
+
+def get_random_form_data(rng, fields):
+    """
+    Returns {clean_name: value} for the (clean_name, block_type, value) fields,
+    leaving out file fields and some optional fields.
+    """
+    return {
+        clean_name: get_random_value(rng, block_type, value)
+        for clean_name, block_type, value in fields
+        if block_type != "file" and (value["required"] or rng.random() < 0.7)
+    }
+
+
+def get_random_file_name(rng, form_submission_pk):
+    return "synthetic/%s-%s.pdf" % (
+        form_submission_pk,
+        "".join(rng.choices(string.ascii_lowercase, k=8)),
+    )
+
+
+def get_copy_value(value):
+    """
+    Returns a value in the text format of COPY.
+    """
+    if value is None:
+        return "\\N"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_rows(connection, table, columns, rows):
+    """
+    Inserts the rows with COPY, through psycopg 3 or psycopg2.
+    """
+    sql = "COPY %s (%s) FROM STDIN" % (
+        connection.ops.quote_name(table),
+        ", ".join(connection.ops.quote_name(x) for x in columns),
+    )
+    data = "".join("\t".join(get_copy_value(x) for x in row) + "\n" for row in rows)
+    with connection.cursor() as cursor:
+        if hasattr(cursor.cursor, "copy_expert"):
+            cursor.cursor.copy_expert(sql, io.StringIO(data))
+        else:
+            with cursor.cursor.copy(sql) as copy:
+                copy.write(data)
+
+
+def reserve_pks(connection, model, count):
+    """
+    Returns the next primary keys of the sequence of a PostgreSQL table.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+            "FROM generate_series(1, %s)",
+            [model._meta.db_table, model._meta.pk.column, count],
+        )
+        return [x[0] for x in cursor.fetchall()]
+
+
+class SyntheticSubmissionWriter:
+    """
+    Inserts generated submissions and uploaded file rows in batches, with
+    COPY on PostgreSQL and bulk_create on the other databases.
+    """
+
+    def __init__(
+        self,
+        Submission,
+        UploadedFile,
+        file_ratio=0.0,
+        days=365,
+        batch_size=5000,
+        use_copy=None,
+        seed=None,
+    ):
+        self.Submission = Submission
+        self.UploadedFile = UploadedFile
+        self.file_ratio = file_ratio
+        self.days = days
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.using = router.db_for_write(Submission)
+        self.connection = connections[self.using]
+        if use_copy is None:
+            use_copy = self.connection.vendor == "postgresql"
+        self.use_copy = use_copy
+        self.now = timezone.now()
+
+    def get_submission(self, form, fields, digest, page=None):
+        data = get_random_form_data(self.rng, fields)
+        submission = self.Submission(
+            form=form,
+            page=page,
+            form_data=dump_form_data(data),
+            search_document=get_search_document(data),
+            schema_digest=digest,
+        )
+        submission.submit_time = self.now - datetime.timedelta(
+            seconds=self.rng.randint(0, self.days * 86400)
+        )
+        return submission
+
+    def get_uploaded_files(self, submissions):
+        return [
+            self.UploadedFile(
+                form_submission_id=x.pk,
+                file=get_random_file_name(self.rng, x.pk),
+                checksum="%064x" % self.rng.getrandbits(256),
+                created_at=x.submit_time,
+                # There is no stored file to process
+                status=self.UploadedFile.Status.PROCESSED,
+            )
+            for x in submissions
+            if self.rng.random() < self.file_ratio
+        ]
+
+    def write(self, submissions):
+        """
+        Inserts a batch of unsaved submissions and returns the number of
+        uploaded files which were inserted for them.
+        """
+        if self.use_copy:
+            for submission, pk in zip(
+                submissions,
+                reserve_pks(self.connection, self.Submission, len(submissions)),
+            ):
+                submission.pk = pk
+            self.copy(self.Submission, submissions)
+        else:
+            with preserve_auto_now_add(self.Submission, "submit_time"):
+                submissions = self.Submission.objects.using(self.using).bulk_create(
+                    submissions
+                )
+            if any(x.pk is None for x in submissions):
+                # Databases without RETURNING, the batch is the latest rows
+                pks = self.Submission.objects.using(self.using).order_by("-pk")
+                pks = reversed(pks.values_list("pk", flat=True)[: len(submissions)])
+                for submission, pk in zip(submissions, pks):
+                    submission.pk = pk
+
+        uploaded_files = self.get_uploaded_files(submissions)
+        if uploaded_files:
+            if self.use_copy:
+                for uploaded_file, pk in zip(
+                    uploaded_files,
+                    reserve_pks(
+                        self.connection, self.UploadedFile, len(uploaded_files)
+                    ),
+                ):
+                    uploaded_file.pk = pk
+                self.copy(self.UploadedFile, uploaded_files)
+            else:
+                with preserve_auto_now_add(self.UploadedFile, "created_at"):
+                    self.UploadedFile.objects.using(self.using).bulk_create(
+                        uploaded_files
+                    )
+        return len(uploaded_files)
+
+    def get_copy_value(self, field, obj):
+        value = getattr(obj, field.attname)
+        if isinstance(field, models.JSONField):
+            # The adapters of the drivers can't be written to COPY as text
+            return json.dumps(value, cls=field.encoder)
+        return field.get_db_prep_save(value, self.connection)
+
+    def copy(self, model, objs):
+        fields = model._meta.concrete_fields
+        copy_rows(
+            self.connection,
+            model._meta.db_table,
+            [x.column for x in fields],
+            [[self.get_copy_value(x, obj) for x in fields] for obj in objs],
+        )
+
+    def generate(self, forms, count, pages=None):
+        """
+        Generates count submissions spread over the forms (and pages), yields
+        the number of submissions and uploaded files per batch.
+        """
+        from wagtail_model_forms.models import iter_form_fields
+
+        forms = [
+            (x, list(iter_form_fields(x.get_form_fields())), x.get_schema_digest())
+            for x in forms
+        ]
+        pages = pages or [None]
+        remaining = count
+        while remaining > 0:
+            batch = [
+                self.get_submission(
+                    *self.rng.choice(forms), page=self.rng.choice(pages)
+                )
+                for _ in range(min(self.batch_size, remaining))
+            ]
+            files = self.write(batch)
+            remaining -= len(batch)
+            yield len(batch), files
+
+
+def get_random_post_data(rng, fields):
+    """
+    Returns (data, files) to POST a form with random values for the
+    (clean_name, block_type, value) fields.
+    """
+    data = {}
+    files = {}
+    for clean_name, block_type, value in fields:
+        if block_type == "file":
+            files[clean_name] = ("synthetic.txt", get_words(rng, 20).encode())
+            continue
+        field_value = get_random_value(rng, block_type, value)
+        if block_type == "checkbox":
+            if field_value or value["required"]:
+                data[clean_name] = "on"
+        else:
+            data[clean_name] = field_value
+    return data, files
+
+
+def get_percentile(values, percentile):
+    """
+    Returns the nearest-rank percentile of the sorted values.
+    """
+    if not values:
+        return 0
+    index = math.ceil(percentile / 100 * len(values)) - 1
+    return values[min(max(index, 0), len(values) - 1)]
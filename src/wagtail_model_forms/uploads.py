@@ -0,0 +1,353 @@
+import hashlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from django import forms
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.db import transaction
+from django.template.defaultfilters import filesizeformat
+from django.utils.translation import gettext_lazy as _
+
+from wagtail_model_forms.settings import UPLOADED_FILE_DEDUPLICATION_PATH
+
+SNIFF_LENGTH = 2048
+
+# (content type, [(offset, bytes), ...]) of the file formats which are detected
+# from their first bytes, the first matching signature wins
+SIGNATURES = [
+    ("image/png", [(0, b"\x89PNG\r\n\x1a\n")]),
+    ("image/jpeg", [(0, b"\xff\xd8\xff")]),
+    ("image/gif", [(0, b"GIF87a")]),
+    ("image/gif", [(0, b"GIF89a")]),
+    ("image/webp", [(0, b"RIFF"), (8, b"WEBP")]),
+    ("image/bmp", [(0, b"BM")]),
+    ("image/tiff", [(0, b"II*\x00")]),
+    ("image/tiff", [(0, b"MM\x00*")]),
+    ("image/heic", [(4, b"ftypheic")]),
+    ("image/avif", [(4, b"ftypavif")]),
+    ("video/quicktime", [(4, b"ftypqt")]),
+    ("video/mp4", [(4, b"ftyp")]),
+    ("video/webm", [(0, b"\x1a\x45\xdf\xa3")]),
+    ("audio/wav", [(0, b"RIFF"), (8, b"WAVE")]),
+    ("audio/mpeg", [(0, b"ID3")]),
+    ("audio/ogg", [(0, b"OggS")]),
+    ("audio/flac", [(0, b"fLaC")]),
+    ("application/pdf", [(0, b"%PDF-")]),
+    ("application/zip", [(0, b"PK\x03\x04")]),
+    ("application/x-ole-storage", [(0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1")]),
+    ("application/gzip", [(0, b"\x1f\x8b")]),
+    ("application/vnd.rar", [(0, b"Rar!\x1a\x07")]),
+    ("application/x-7z-compressed", [(0, b"7z\xbc\xaf\x27\x1c")]),
+    ("application/x-msdownload", [(0, b"MZ")]),
+    ("application/x-executable", [(0, b"\x7fELF")]),
+]
+
+# Formats stored in a container keep the content type sent by the browser
+# when the container matches, e.g. a .docx file is a zip file
+CONTAINER_TYPES = {
+    "application/zip": (
+        "application/vnd.openxmlformats-officedocument.",
+        "application/vnd.oasis.opendocument.",
+        "application/epub+zip",
+        "application/java-archive",
+        "application/x-zip-compressed",
+    ),
+    "application/x-ole-storage": (
+        "application/msword",
+        "application/vnd.ms-",
+    ),
+    "video/mp4": (
+        "image/heic",
+        "image/heif",
+        "image/avif",
+        "video/",
+        "audio/mp4",
+        "audio/x-m4a",
+    ),
+}
+
+SIGNATURE_TYPES = frozenset(content_type for content_type, parts in SIGNATURES)
+
+UPLOAD_ERRORS_ATTRIBUTE = "_wagtail_model_forms_upload_errors"
+UPLOAD_CHECKSUMS_ATTRIBUTE = "_wagtail_model_forms_upload_checksums"
+
+# Seconds a stored file is locked at most while it is checked and written or deleted
+FILE_LOCK_TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+
+def sniff_content_type(data, default=None):
+    """
+    Returns the content type detected from the first bytes of a file.
+
+    Files without a known signature, e.g. text files, get the default (the type
+    sent by the browser), unless the default is a type which has a signature:
+    a file posted as image/png which does not start like one gets None.
+    """
+    head = bytes(data[:SNIFF_LENGTH])
+    for content_type, parts in SIGNATURES:
+        if all(head[offset : offset + len(value)] == value for offset, value in parts):
+            if default and default.lower().startswith(
+                CONTAINER_TYPES.get(content_type, ())
+            ):
+                return default
+            return content_type
+    if default and default.lower() in SIGNATURE_TYPES:
+        return None
+    return default
+
+
+def parse_allowed_types(value):
+    if not value:
+        return []
+    return [x.strip().lower() for x in value.split(",") if x.strip()]
+
+
+def content_type_allowed(content_type, allowed_types):
+    if not allowed_types:
+        return True
+    if not content_type:
+        return False
+    content_type = content_type.lower()
+    for allowed_type in allowed_types:
+        if allowed_type.endswith("/*"):
+            if content_type.startswith(allowed_type[:-1]):
+                return True
+        elif content_type == allowed_type:
+            return True
+    return False
+
+
+def get_file_limits(fields):
+    """
+    Returns {clean_name: (max_size, allowed_types)} for the file fields, or an empty
+    dict when none of them has limits.
+    """
+    from wagtail_model_forms.models import iter_form_fields
+
+    limits = {}
+    for clean_name, block_type, value in iter_form_fields(fields):
+        if block_type != "file":
+            continue
+        max_size = value.get("max_size")
+        limits[clean_name] = (
+            max_size * 1024 * 1024 if max_size else None,
+            parse_allowed_types(value.get("allowed_types")),
+        )
+    if not any(
+        max_size or allowed_types for max_size, allowed_types in limits.values()
+    ):
+        return {}
+    return limits
+
+
+def get_max_request_size(limits):
+    """
+    Returns the maximum size of a request posting files with these limits, or None
+    when one of the files has no size limit.
+    """
+    max_sizes = [max_size for max_size, allowed_types in limits.values()]
+    if not max_sizes or not all(max_sizes):
+        return None
+    # Allow some overhead for the other fields and the multipart encoding
+    return sum(max_sizes) + 1024 * 1024
+
+
+def get_upload_errors(request):
+    return getattr(request, UPLOAD_ERRORS_ATTRIBUTE, {})
+
+
+def get_upload_checksums(request):
+    return getattr(request, UPLOAD_CHECKSUMS_ATTRIBUTE, {})
+
+
+def get_checksum(file):
+    sha256 = hashlib.sha256()
+    for chunk in file.chunks():
+        sha256.update(chunk)
+    file.seek(0)
+    return sha256.hexdigest()
+
+
+def get_content_addressed_name(checksum, file_name):
+    extension = os.path.splitext(file_name or "")[1].lower()
+    return "%s/%s/%s/%s%s" % (
+        UPLOADED_FILE_DEDUPLICATION_PATH,
+        checksum[:2],
+        checksum[2:4],
+        checksum,
+        extension,
+    )
+
+
+@contextmanager
+def lock_file(name):
+    """
+    Serializes the checks and the writes and deletes of a stored file between
+    processes, through the default cache.
+    """
+    key = "wagtail_model_forms:file:%s" % hashlib.sha256(name.encode()).hexdigest()
+    # The lock expires, so a killed process does not hold it forever
+    while not cache.add(key, True, FILE_LOCK_TIMEOUT):
+        time.sleep(0.05)
+    try:
+        yield
+    finally:
+        cache.delete(key)
+
+
+def store_deduplicated_file(uploaded_file_class, file, checksum=None):
+    """
+    Store a file under its SHA-256 digest, the file is only written when no other
+    upload with the same content exists. Returns (name, checksum).
+
+    Call restore_deduplicated_file once the uploaded file referencing it is
+    created, the stored file may be deleted with its last other reference
+    in between.
+    """
+    storage = uploaded_file_class._meta.get_field("file").storage
+    checksum = checksum or get_checksum(file)
+    name = get_content_addressed_name(checksum, file.name)
+    with lock_file(name):
+        if not storage.exists(name):
+            name = storage.save(name, file)
+    return name, checksum
+
+
+def restore_deduplicated_file(uploaded_file_class, name, file, using=None):
+    """
+    Writes a deduplicated file again when it was deleted with its last other
+    reference before the new reference was committed.
+    """
+
+    def restore():
+        storage = uploaded_file_class._meta.get_field("file").storage
+        with lock_file(name):
+            if not storage.exists(name):
+                file.seek(0)
+                storage.save(name, file)
+                logger.info("Restored deleted upload %s" % name)
+
+    transaction.on_commit(restore, using=using)
+
+
+def delete_file_if_unreferenced(uploaded_file_class, name, using=None):
+    """
+    Delete the stored file when no uploaded file references it anymore.
+    """
+    if not name:
+        return False
+    queryset = uploaded_file_class.objects.using(using).filter(file=name)
+    storage = uploaded_file_class._meta.get_field("file").storage
+    with lock_file(name):
+        if queryset.exists():
+            return False
+        storage.delete(name)
+    logger.info("Deleted unreferenced upload %s" % name)
+    return True
+
+
+def uploaded_file_deleted(sender, instance, using, **kwargs):
+    name = instance.file.name
+    transaction.on_commit(
+        lambda: delete_file_if_unreferenced(sender, name, using=using), using=using
+    )
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """
+    Enforces the size and type limits of the file fields while the upload is streamed in.
+
+    A file is skipped as soon as it passes its size limit or its first bytes do
+    not match the allowed types, so it is never spooled to memory or disk. The
+    SHA-256 digest of every file is computed on the way.
+    """
+
+    def __init__(self, request, limits):
+        super().__init__(request)
+        self.limits = limits
+        self.limit = None
+        self.received = 0
+        self.sniffed = False
+
+    def add_error(self, field_name, message):
+        if not hasattr(self.request, UPLOAD_ERRORS_ATTRIBUTE):
+            setattr(self.request, UPLOAD_ERRORS_ATTRIBUTE, {})
+        getattr(self.request, UPLOAD_ERRORS_ATTRIBUTE)[field_name] = message
+
+    def new_file(self, field_name, file_name, content_type, *args, **kwargs):
+        super().new_file(field_name, file_name, content_type, *args, **kwargs)
+        self.limit = self.limits.get(field_name)
+        self.received = 0
+        self.sniffed = False
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        if self.limit is None:
+            return raw_data
+        max_size, allowed_types = self.limit
+
+        self.received += len(raw_data)
+        if max_size and self.received > max_size:
+            self.add_error(
+                self.field_name,
+                _("The file may not be larger than %(size)s.")
+                % {"size": filesizeformat(max_size)},
+            )
+            raise SkipFile()
+
+        if not self.sniffed:
+            self.sniffed = True
+            content_type = sniff_content_type(raw_data, default=self.content_type)
+            if not content_type_allowed(content_type, allowed_types):
+                self.add_error(self.field_name, _("This file type is not allowed."))
+                raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, UPLOAD_CHECKSUMS_ATTRIBUTE):
+            setattr(self.request, UPLOAD_CHECKSUMS_ATTRIBUTE, {})
+        checksums = getattr(self.request, UPLOAD_CHECKSUMS_ATTRIBUTE)
+        checksums[self.field_name] = self.sha256.hexdigest()
+        return None
+
+
+class LimitedFileField(forms.FileField):
+    """
+    A file field validating the size and the sniffed content type of the uploaded file.
+    """
+
+    def __init__(self, max_size=None, allowed_types=None, **kwargs):
+        self.max_size = max_size
+        self.allowed_types = allowed_types or []
+        super().__init__(**kwargs)
+        if self.allowed_types:
+            self.widget.attrs.setdefault("accept", ",".join(self.allowed_types))
+
+    def to_python(self, data):
+        data = super().to_python(data)
+        if data is None:
+            return data
+
+        if self.max_size and data.size > self.max_size:
+            raise ValidationError(
+                _("The file may not be larger than %(size)s."),
+                code="max_size",
+                params={"size": filesizeformat(self.max_size)},
+            )
+
+        if self.allowed_types:
+            head = data.read(SNIFF_LENGTH)
+            data.seek(0)
+            content_type = sniff_content_type(head, default=data.content_type)
+            if not content_type_allowed(content_type, self.allowed_types):
+                raise ValidationError(
+                    _("This file type is not allowed."), code="content_type"
+                )
+        return data
@@ -0,0 +1,16 @@
+from django.urls import path
+
+from wagtail_model_forms import api
+
+urlpatterns = [
+    path(
+        "choices/<slug:name>/",
+        api.choice_source_autocomplete,
+        name="wagtail_model_forms_choice_source",
+    ),
+    path(
+        "definitions/<int:pk>/",
+        api.form_definition,
+        name="wagtail_model_forms_form_definition",
+    ),
+]
@@ -1,13 +1,79 @@
 import json
+from contextlib import contextmanager
 
-import requests
+from django.core.signing import BadSignature, Signer
 from django.template import Context, Template
 
+from wagtail_model_forms.settings import WEBHOOK_TIMEOUT
+
+SUCCESS_TOKEN_SALT = "wagtail_model_forms.success"
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class LazyModel:
+    """
+    Class attribute which resolves a model through its getter when it is read.
+    """
+
+    def __init__(self, getter):
+        self.getter = getter
+
+    def __get__(self, instance, owner=None):
+        return self.getter()
+
+
+def json_loads(value):
+    """
+    Decode a JSON document, using orjson when it is installed.
+    """
+    if orjson is not None:
+        if isinstance(value, str):
+            # orjson rejects str subclasses such as SafeString
+            value = value.encode()
+        return orjson.loads(value)
+    return json.loads(value)
+
+
+def get_success_token(form_id):
+    """
+    Returns the signed token of a successful submission of a form. The token only
+    depends on the form, so the success page can be cached.
+    """
+    return Signer(salt=SUCCESS_TOKEN_SALT).sign(str(form_id))
 
-def trigger_webhook(webhook, form_submission):
-    form_data = json.loads(form_submission.form_data)
 
-    context = Context(form_data)
+def get_success_form_id(token):
+    """
+    Returns the id of the form of a success token, or None when it is invalid.
+    """
+    try:
+        return int(Signer(salt=SUCCESS_TOKEN_SALT).unsign(token))
+    except (BadSignature, ValueError):
+        return None
+
+
+def get_search_document(form_data):
+    """
+    Flatten the submitted values into a whitespace separated string.
+    """
+    values = []
+    for value in form_data.values():
+        if isinstance(value, (list, tuple)):
+            values.extend(str(x) for x in value if x not in (None, ""))
+        elif value not in (None, "", False):
+            values.append(str(value))
+    return " ".join(values)
+
+
+def render_webhook_request(webhook, form_submission):
+    """
+    Render the url, headers and body templates of a webhook for a submission.
+    """
+    context = Context(dict(form_submission.data))
 
     url = Template(webhook["url"]).render(context)
     method = webhook["method"]
@@ -25,9 +91,34 @@ def trigger_webhook(webhook, form_submission):
             ).render(context)
 
     if request_body and request_body != "":
-        data = json.loads(Template(request_body).render(context))
-    else:
-        data = None
+        data = json_loads(Template(request_body).render(context))
+
+    return {"method": method.upper(), "url": url, "headers": headers, "data": data}
 
-    res = requests.request(method.upper(), url=url, headers=headers, data=data)
+
+def trigger_webhook(webhook, form_submission):
+    import requests
+
+    webhook_request = render_webhook_request(webhook, form_submission)
+    res = requests.request(
+        webhook_request["method"],
+        url=webhook_request["url"],
+        headers=webhook_request["headers"],
+        data=webhook_request["data"],
+        timeout=WEBHOOK_TIMEOUT,
+    )
     return res
+
+
+@contextmanager
+def preserve_auto_now_add(model, field_name):
+    """
+    Keeps the given values of an auto_now_add field in bulk_create.
+    """
+    field = model._meta.get_field(field_name)
+    auto_now_add = field.auto_now_add
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = auto_now_add
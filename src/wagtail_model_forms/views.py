@@ -1,35 +1,153 @@
-import json
+from collections import OrderedDict
+from importlib.util import find_spec
 
 import django_filters
-from django.urls import reverse_lazy
-from django.utils.html import format_html
+from django import forms
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import Q
+from django.http import FileResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse, reverse_lazy
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
 from django.utils.translation import gettext_lazy as _
+from django.views.generic import TemplateView
 from wagtail.admin.filters import DateRangePickerWidget, WagtailFilterSet
-from wagtail.admin.views.generic import DeleteView, EditView, InspectView
+from wagtail.admin.views.generic import (
+    DeleteView,
+    EditView,
+    InspectView,
+    PermissionCheckedMixin,
+    WagtailAdminTemplateMixin,
+)
 from wagtail.admin.views.reports import ReportView
+from wagtail.admin.widgets import Button
+from wagtail.coreutils import multigetattr
+from wagtail.permission_policies import ModelPermissionPolicy
 
-from wagtail_model_forms import get_form_model, get_submission_model
+from wagtail_model_forms import (
+    get_export_job_model,
+    get_form_model,
+    get_submission_model,
+)
+from wagtail_model_forms.compression import decode_form_data
+from wagtail_model_forms.exports import EXPORT_WRITERS, create_export_job
+from wagtail_model_forms.models import AbstractFormSubmission
+from wagtail_model_forms.pagination import EXACT, PAGINATOR_CLASSES
+from wagtail_model_forms.routers import (
+    is_write_database_pinned,
+    pin_write_database,
+    use_write_database,
+)
+from wagtail_model_forms.search import search_form_submissions
+from wagtail_model_forms.settings import (
+    EXPORT_JOB_MODEL,
+    FORM_CHOOSER_COUNTS,
+    REPORT_PAGINATION,
+    STATISTIC_MODEL,
+)
+from wagtail_model_forms.statistics import (
+    get_form_statistics,
+    get_new_submission_counts,
+)
+from wagtail_model_forms.utils import LazyModel
 
-Form = get_form_model()
-FormSubmission = get_submission_model()
+FORM_CHOOSER_PAGE_SIZE = 20
+
+
+def get_forms(request):
+    return get_form_model().objects.all()
+
+
+class FormChooserWidget(forms.Select):
+    """
+    A select with only the selected form as option, the other forms are
+    searched through the form chooser endpoint while typing.
+    """
+
+    template_name = "wagtail_model_forms/widgets/form_chooser.html"
+
+    class Media:
+        js = ["wagtail_model_forms/js/form-chooser.js"]
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["search_url"] = reverse("form_chooser_search")
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        choices = [("", "---------")]
+        values = [x for x in value if x]
+        if values:
+            try:
+                choices += [
+                    (str(x.pk), str(x))
+                    for x in self.choices.queryset.filter(pk__in=values)
+                ]
+            except (ValueError, ValidationError):
+                pass
+        all_choices = self.choices
+        self.choices = choices
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = all_choices
 
 
 class FormSubmissionReportFilterSet(WagtailFilterSet):
+    q = django_filters.CharFilter(
+        label=_("Search"),
+        method="filter_search",
+    )
     submit_time = django_filters.DateFromToRangeFilter(
         label=_("Date / Time"), widget=DateRangePickerWidget
     )
     form_instance = django_filters.ModelChoiceFilter(
         field_name="form",
         label=_("Form"),
-        queryset=Form.objects.all(),
+        queryset=get_forms,
+        widget=FormChooserWidget,
     )
+    status = django_filters.ChoiceFilter(
+        label=_("Status"),
+        choices=AbstractFormSubmission.Status.choices,
+    )
+
+    def __init__(self, data=None, queryset=None, **kwargs):
+        # The model is resolved here instead of in Meta, when the class is defined
+        if queryset is None:
+            queryset = get_submission_model()._default_manager.all()
+        super().__init__(data, queryset, **kwargs)
+
+    def filter_search(self, queryset, name, value):
+        return search_form_submissions(queryset, value)
+
 
-    class Meta:
-        model = FormSubmission
-        fields = ["submit_time", "form_instance", "status"]
+class ReadYourWritesMixin:
+    """
+    Reads the submission models from the write database after an editor changed
+    them, instead of from a replica which may be behind.
+    """
 
+    def is_write_database_pinned(self, request):
+        return request.method == "POST" or is_write_database_pinned(request)
 
-class FormSubmissionReportView(ReportView):
+    def setup(self, request, *args, **kwargs):
+        with use_write_database(self.is_write_database_pinned(request)):
+            super().setup(request, *args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_write_database(self.is_write_database_pinned(request)):
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        if request.method == "POST":
+            pin_write_database(request)
+        return response
+
+
+class FormSubmissionReportView(ReadYourWritesMixin, ReportView):
     index_url_name = "form_submissions_report"
     index_results_url_name = "form_submissions_report_results"
     results_template_name = "wagtail_model_forms/form_submissions_report_results.html"
@@ -50,26 +168,95 @@ class FormSubmissionReportView(ReportView):
         "uploaded_file_download_urls",
     ]
     filterset_class = FormSubmissionReportFilterSet
+    paginator_class = PAGINATOR_CLASSES[REPORT_PAGINATION]
+    # Set in setup, background exports use the view without a request
+    is_export = False
 
     @property
     # COMPAT: move to direct attribute assignment when Wagtail 6.2 is the minimum version
     def page_title(self):
         return self.title
 
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        if EXPORT_JOB_MODEL and request.GET.get("export") in EXPORT_WRITERS:
+            self.is_export = True
+
+    def get(self, request, *args, **kwargs):
+        if self.is_export and EXPORT_JOB_MODEL:
+            job = create_export_job(request, request.GET.get("export"))
+            messages.success(
+                request, _("The export has been queued, it will be available here.")
+            )
+            return redirect("form_submissions_export_job", pk=job.pk)
+        return super().get(request, *args, **kwargs)
+
+    @cached_property
+    def header_more_buttons(self):
+        buttons = super().header_more_buttons.copy()
+        if EXPORT_JOB_MODEL and self.show_export_buttons:
+            buttons.append(
+                Button(
+                    _("Download JSON Lines"),
+                    url=self.get_export_url("jsonl"),
+                    icon_name="download",
+                    priority=110,
+                )
+            )
+            if find_spec("pyarrow") is not None:
+                buttons.append(
+                    Button(
+                        _("Download Parquet"),
+                        url=self.get_export_url("parquet"),
+                        icon_name="download",
+                        priority=120,
+                    )
+                )
+        return buttons
+
     def get_filename(self):
         return "form-submissions"
 
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        context["statistics_enabled"] = bool(STATISTIC_MODEL)
+        paginator = context.get("paginator")
+        context["exact_count"] = getattr(paginator, "count_kind", EXACT) == EXACT
+        context["countless"] = getattr(paginator, "countless", False)
+        return context
+
     def get_queryset(self):
-        return (
-            FormSubmission.objects.all()
+        queryset = (
+            get_submission_model()
+            .objects.all()
             .select_related("form")
             .select_related("page")
             .order_by("-submit_time")
         )
+        if self.is_export:
+            # The export lists the files of every submission
+            queryset = queryset.prefetch_related("uploaded_files")
+        return queryset
+
+    def to_row_dict(self, item):
+        # Submissions made outside a page, e.g. imported ones, have no page
+        row_dict = OrderedDict(
+            (
+                field,
+                ""
+                if field.startswith("page.") and item.page_id is None
+                else multigetattr(item, field),
+            )
+            for field in self.list_export
+        )
+        if "form_data" in row_dict:
+            # Compressed form data is exported as the JSON it encodes
+            row_dict["form_data"] = decode_form_data(row_dict["form_data"])
+        return row_dict
 
 
-class FormSubmissionDetailView(InspectView):
-    model = FormSubmission
+class FormSubmissionDetailView(ReadYourWritesMixin, InspectView):
+    model = LazyModel(get_submission_model)
     index_url_name = "form_submissions_report"
     delete_url_name = "delete_form_submission"
     edit_url_name = "edit_form_submission"
@@ -108,39 +295,177 @@ class FormSubmissionDetailView(InspectView):
 
     def get_field_display_value(self, field_name, field):
         if field_name == "form_data":
-            result = ""
-            form_data = getattr(self.object, field_name)
-            form_data = json.loads(form_data)
-            for key, value in form_data.items():
-                if value:
-                    result += "%s: %s<br>" % (key, value)
-            return format_html(result)
+            labels = {x["name"]: x["label"] for x in self.object.get_schema_fields()}
+            return format_html_join(
+                "",
+                "{}: {}<br>",
+                (
+                    (labels.get(key, key), value)
+                    for key, value in self.object.data.items()
+                    if value
+                ),
+            )
 
         if field_name == "uploaded_files":
-            result = "<ul>"
-            for uploaded_file in getattr(
-                self.object, field_name, FormSubmission.objects.none()
-            ).all():
-                result += '<li><a href="%s" target="_blank">%s</a></li>' % (
-                    uploaded_file.download_url,
-                    uploaded_file.file.name,
-                )
-            result += "</ul>"
-            return format_html(result)
+            uploaded_files = getattr(
+                self.object, field_name, self.model.objects.none()
+            ).all()
+            items = []
+            for uploaded_file in uploaded_files:
+                if uploaded_file.file:
+                    link = format_html(
+                        '<a href="{}" target="_blank">{}</a>',
+                        uploaded_file.download_url,
+                        uploaded_file.file.name,
+                    )
+                    items.append((link,))
+                else:
+                    items.append((uploaded_file.get_status_display(),))
+            return format_html(
+                "<ul>{}</ul>", format_html_join("", "<li>{}</li>", items)
+            )
 
         return super().get_field_display_value(field_name, field)
 
 
-class EditFormSubmissionView(EditView):
-    model = FormSubmission
+class EditFormSubmissionView(ReadYourWritesMixin, EditView):
+    model = LazyModel(get_submission_model)
     index_url_name = "form_submissions_report"
     delete_url_name = "delete_form_submission"
     edit_url_name = "edit_form_submission"
     fields = ["status"]
 
 
-class DeleteFormSubmissionView(DeleteView):
-    model = FormSubmission
+class DeleteFormSubmissionView(ReadYourWritesMixin, DeleteView):
+    model = LazyModel(get_submission_model)
     index_url_name = "form_submissions_report"
     delete_url_name = "delete_form_submission"
     edit_url_name = "edit_form_submission"
+
+
+class FormStatisticsView(ReadYourWritesMixin, WagtailAdminTemplateMixin, TemplateView):
+    template_name = "wagtail_model_forms/form_statistics.html"
+    header_icon = "form"
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.object = get_object_or_404(get_form_model(), pk=kwargs["pk"])
+
+    def get_page_title(self):
+        return _("Statistics")
+
+    def get_page_subtitle(self):
+        return str(self.object)
+
+    def get_breadcrumbs_items(self):
+        return self.breadcrumbs_items + [
+            {
+                "url": reverse_lazy("form_submissions_report"),
+                "label": _("Form submissions"),
+            },
+            {"url": "", "label": str(self.object)},
+        ]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        statistics = get_form_statistics(self.object)
+        context["object"] = self.object
+        context["statistics"] = statistics
+        context["max_day_count"] = max(
+            [count for date, count in statistics["days"]], default=0
+        )
+        return context
+
+
+class ExportJobView(PermissionCheckedMixin, WagtailAdminTemplateMixin, TemplateView):
+    template_name = "wagtail_model_forms/export_job.html"
+    header_icon = "download"
+    # The permissions of the submission detail view, users who lost access to
+    # the submissions can't download their exports anymore
+    any_permission_required = ["add", "change", "delete", "view"]
+
+    @cached_property
+    def permission_policy(self):
+        return ModelPermissionPolicy(get_submission_model())
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.object = get_object_or_404(get_export_job_model(), pk=kwargs["pk"])
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_superuser and self.object.user_id != request.user.pk:
+            raise PermissionDenied
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_page_title(self):
+        return _("Export")
+
+    def get_page_subtitle(self):
+        return str(self.object)
+
+    def get_breadcrumbs_items(self):
+        return self.breadcrumbs_items + [
+            {
+                "url": reverse_lazy("form_submissions_report"),
+                "label": _("Form submissions"),
+            },
+            {"url": "", "label": str(self.object)},
+        ]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["object"] = self.object
+        if self.object.status == self.object.Status.COMPLETED:
+            context["download_url"] = reverse(
+                "form_submissions_export_job_download", args=[self.object.pk]
+            )
+        return context
+
+
+class ExportJobDownloadView(ExportJobView):
+    def get(self, request, *args, **kwargs):
+        if not self.object.file:
+            raise PermissionDenied
+        return FileResponse(
+            self.object.file.open("rb"),
+            as_attachment=True,
+            filename=self.object.file.name.rsplit("/", 1)[-1],
+        )
+
+
+def form_chooser_search(request):
+    """
+    Returns a page of forms whose title contains the query, in the format of
+    the choice source autocomplete.
+    """
+    queryset = get_form_model().objects.order_by("title", "pk")
+    query = request.GET.get("q", "").strip()
+    if query:
+        filters = Q(title__icontains=query)
+        if query.isdigit():
+            filters |= Q(pk=query)
+        queryset = queryset.filter(filters)
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+
+    start = (page - 1) * FORM_CHOOSER_PAGE_SIZE
+    forms = list(
+        queryset.values_list("pk", "title")[start : start + FORM_CHOOSER_PAGE_SIZE + 1]
+    )
+    more = len(forms) > FORM_CHOOSER_PAGE_SIZE
+    forms = forms[:FORM_CHOOSER_PAGE_SIZE]
+
+    results = [{"id": pk, "text": title} for pk, title in forms]
+    if FORM_CHOOSER_COUNTS:
+        with use_write_database(is_write_database_pinned(request)):
+            counts = get_new_submission_counts([x["id"] for x in results])
+        for result in results:
+            result["new_submissions"] = counts[result["id"]]
+            if result["new_submissions"]:
+                result["text"] = _("%(title)s (%(count)s new)") % {
+                    "title": result["text"],
+                    "count": result["new_submissions"],
+                }
+    return JsonResponse({"results": results, "pagination": {"more": more}})
@@ -4,16 +4,15 @@ from wagtail.admin.menu import MenuItem
 from wagtail.admin.site_summary import SummaryItem
 
 from wagtail_model_forms import get_submission_model
-from wagtail_model_forms.settings import REPORTS
-from wagtail_model_forms.views import (
-    DeleteFormSubmissionView,
-    EditFormSubmissionView,
-    FormSubmissionDetailView,
-    FormSubmissionReportView,
+from wagtail_model_forms.pagination import EXACT, get_approximate_count
+from wagtail_model_forms.routers import is_write_database_pinned, use_write_database
+from wagtail_model_forms.settings import (
+    EXPORT_JOB_MODEL,
+    REPORT_PAGINATION,
+    REPORTS,
+    STATISTIC_MODEL,
 )
 
-FormSubmission = get_submission_model()
-
 
 class ReportMenuItem(MenuItem):
     def is_shown(self, request):
@@ -25,11 +24,16 @@ class ReportSummaryItem(SummaryItem):
     template_name = "wagtail_model_forms/summary.html"
 
     def get_context_data(self, parent_context):
-        return {
-            "new_form_submissions": FormSubmission.objects.filter(
-                status=FormSubmission.Status.NEW
-            ).count(),
-        }
+        FormSubmission = get_submission_model()
+        queryset = FormSubmission.objects.filter(status=FormSubmission.Status.NEW)
+        with use_write_database(is_write_database_pinned(self.request)):
+            if REPORT_PAGINATION == "exact":
+                return {"new_form_submissions": queryset.count()}
+            count, kind = get_approximate_count(queryset)
+            return {
+                "new_form_submissions": count,
+                "new_form_submissions_suffix": "" if kind == EXACT else "+",
+            }
 
     def is_shown(self):
         return REPORTS
@@ -43,6 +47,8 @@ if REPORTS:
 
     @hooks.register("register_reports_menu_item")
     def register_report_menu_item():
+        from wagtail_model_forms.views import FormSubmissionReportView
+
         return ReportMenuItem(
             FormSubmissionReportView.title,
             reverse("form_submissions_report"),
@@ -52,7 +58,19 @@ if REPORTS:
 
     @hooks.register("register_admin_urls")
     def register_report_url():
-        return [
+        # The views are imported when the admin URLs are loaded, not with the hooks
+        from wagtail_model_forms.views import (
+            DeleteFormSubmissionView,
+            EditFormSubmissionView,
+            ExportJobDownloadView,
+            ExportJobView,
+            FormStatisticsView,
+            FormSubmissionDetailView,
+            FormSubmissionReportView,
+            form_chooser_search,
+        )
+
+        urls = [
             path(
                 "reports/form-submissions/",
                 FormSubmissionReportView.as_view(),
@@ -78,4 +96,31 @@ if REPORTS:
                 FormSubmissionReportView.as_view(results_only=True),
                 name="form_submissions_report_results",
             ),
+            path(
+                "reports/form-submissions/forms/",
+                form_chooser_search,
+                name="form_chooser_search",
+            ),
         ]
+        if STATISTIC_MODEL:
+            urls.append(
+                path(
+                    "reports/form-submissions/statistics/<int:pk>/",
+                    FormStatisticsView.as_view(),
+                    name="form_statistics",
+                )
+            )
+        if EXPORT_JOB_MODEL:
+            urls += [
+                path(
+                    "reports/form-submissions/exports/<int:pk>/",
+                    ExportJobView.as_view(),
+                    name="form_submissions_export_job",
+                ),
+                path(
+                    "reports/form-submissions/exports/<int:pk>/download/",
+                    ExportJobDownloadView.as_view(),
+                    name="form_submissions_export_job_download",
+                ),
+            ]
+        return urls
@@ -0,0 +1,502 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.core.cache import cache
+from django.db import router, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from wagtail_model_forms import get_webhook_delivery_model, get_webhook_queue_model
+from wagtail_model_forms.settings import (
+    WEBHOOK_BREAKER_COOLDOWN,
+    WEBHOOK_BREAKER_THRESHOLD,
+    WEBHOOK_DELIVERY_MODEL,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_QUEUE_MODEL,
+    WEBHOOK_RETENTION_DAYS,
+    WEBHOOK_RETRY_BACKOFF,
+    WEBHOOK_RETRY_BACKOFF_MAX,
+    WEBHOOK_SENDING_TIMEOUT,
+    WEBHOOK_TIMEOUT,
+)
+from wagtail_model_forms.utils import render_webhook_request
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_BODY_LENGTH = 1000
+
+PRUNE_BATCH_SIZE = 1000
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Per target circuit breaker, its state is shared between processes through the cache.
+
+    After `WEBHOOK_BREAKER_THRESHOLD` consecutive failures the circuit opens and
+    requests are short-circuited. Once `WEBHOOK_BREAKER_COOLDOWN` seconds have
+    passed a single probe request is let through (half-open), its result either
+    closes the circuit or opens it again.
+    """
+
+    def __init__(self, target):
+        digest = hashlib.sha256(target.encode()).hexdigest()
+        self.target = target
+        self.key = "wagtail_model_forms:breaker:%s" % digest
+        self.probe_key = "%s:probe" % self.key
+
+    def get_state(self):
+        return cache.get(self.key) or {"failures": 0, "opened_at": None}
+
+    def allow_request(self):
+        state = self.get_state()
+        if state["opened_at"] is None:
+            return True
+        if time.time() - state["opened_at"] < WEBHOOK_BREAKER_COOLDOWN:
+            return False
+        return cache.add(self.probe_key, True, WEBHOOK_BREAKER_COOLDOWN)
+
+    def record_success(self):
+        cache.delete_many([self.key, self.probe_key])
+
+    def record_failure(self):
+        state = self.get_state()
+        state["failures"] += 1
+        if state["failures"] >= WEBHOOK_BREAKER_THRESHOLD:
+            if state["opened_at"] is None:
+                logger.warning("Webhook circuit opened for %s" % self.target)
+            state["opened_at"] = time.time()
+        cache.set(self.key, state, None)
+        cache.delete(self.probe_key)
+
+
+def get_target(url):
+    parts = urlsplit(url)
+    return "%s://%s" % (parts.scheme, parts.netloc)
+
+
+def log_delivery(method, url, status, form_submission=None, **kwargs):
+    if not WEBHOOK_DELIVERY_MODEL:
+        return None
+    WebhookDelivery = get_webhook_delivery_model()
+    return WebhookDelivery.objects.create(
+        form_submission=form_submission,
+        target=get_target(url)[:255],
+        method=method,
+        url=url,
+        status=status,
+        **kwargs,
+    )
+
+
+def send_request(method, url, headers=None, form_submission=None, **kwargs):
+    """
+    Send a webhook request through the circuit breaker of its target and log the delivery.
+
+    Raises CircuitOpenError when the request is short-circuited and
+    requests.RequestException when the target could not be reached.
+    """
+    import requests
+
+    WebhookDelivery = get_webhook_delivery_model() if WEBHOOK_DELIVERY_MODEL else None
+    breaker = CircuitBreaker(get_target(url))
+
+    if not breaker.allow_request():
+        if WebhookDelivery:
+            log_delivery(
+                method,
+                url,
+                WebhookDelivery.Status.SHORT_CIRCUITED,
+                form_submission=form_submission,
+            )
+        raise CircuitOpenError(breaker.target)
+
+    start = time.perf_counter()
+    try:
+        res = requests.request(
+            method, url=url, headers=headers, timeout=WEBHOOK_TIMEOUT, **kwargs
+        )
+    except requests.RequestException as err:
+        breaker.record_failure()
+        if WebhookDelivery:
+            log_delivery(
+                method,
+                url,
+                WebhookDelivery.Status.FAILED,
+                form_submission=form_submission,
+                latency=(time.perf_counter() - start) * 1000,
+                error=str(err),
+            )
+        raise
+
+    # A client error means the target is up, only server errors count as failures
+    if res.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+    if WebhookDelivery:
+        log_delivery(
+            method,
+            url,
+            WebhookDelivery.Status.SUCCESS if res.ok else WebhookDelivery.Status.FAILED,
+            form_submission=form_submission,
+            latency=(time.perf_counter() - start) * 1000,
+            response_code=res.status_code,
+            response_body=res.text[:RESPONSE_BODY_LENGTH],
+        )
+    return res
+
+
+def get_retry_delay(attempts):
+    """
+    Returns the seconds to wait before the next attempt, doubling after every
+    failed attempt up to WEBHOOK_RETRY_BACKOFF_MAX.
+    """
+    return min(
+        WEBHOOK_RETRY_BACKOFF * 2 ** max(attempts - 1, 0), WEBHOOK_RETRY_BACKOFF_MAX
+    )
+
+
+def get_due_filter(now=None):
+    now = now or timezone.now()
+    return Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+
+
+def get_endpoint_key(method, url, headers, batched=True):
+    """
+    Returns a digest identifying the endpoint queued payloads are grouped on.
+    """
+    value = json.dumps([method, url, headers, batched], sort_keys=True)
+    return hashlib.sha256(value.encode()).hexdigest()
+
+
+def send_webhook(webhook, form_submission):
+    """
+    Send a webhook for a submission, queueing it for a retry when it could not be delivered.
+    """
+    import requests
+
+    webhook_request = render_webhook_request(webhook, form_submission)
+    try:
+        res = send_request(
+            webhook_request["method"],
+            webhook_request["url"],
+            headers=webhook_request["headers"],
+            form_submission=form_submission,
+            data=webhook_request["data"],
+        )
+    except (CircuitOpenError, requests.RequestException) as err:
+        logger.warning(
+            "Webhook (FormSubmission#%s) failed: %s" % (form_submission.id, err)
+        )
+        enqueue_retry(webhook_request, form_submission, str(err))
+        return None
+
+    if res.status_code >= 500:
+        enqueue_retry(webhook_request, form_submission, "HTTP %s" % res.status_code)
+    return res
+
+
+def enqueue_retry(webhook_request, form_submission, error):
+    if not WEBHOOK_QUEUE_MODEL:
+        return None
+    WebhookQueueItem = get_webhook_queue_model()
+    return WebhookQueueItem.objects.create(
+        form_submission=form_submission,
+        endpoint=get_endpoint_key(
+            webhook_request["method"],
+            webhook_request["url"],
+            webhook_request["headers"],
+            batched=False,
+        ),
+        method=webhook_request["method"],
+        url=webhook_request["url"],
+        headers=webhook_request["headers"],
+        payload=webhook_request["data"],
+        batched=False,
+        batch_size=100,
+        attempts=1,
+        next_attempt_at=timezone.now() + timedelta(seconds=get_retry_delay(1)),
+        error=error,
+    )
+
+
+def enqueue_webhook(webhook, form_submission):
+    """
+    Render the webhook for a submission and queue its payload for a batched
+    request, which the send_webhook_batches worker sends.
+    """
+    WebhookQueueItem = get_webhook_queue_model()
+
+    webhook_request = render_webhook_request(webhook, form_submission)
+    payload = webhook_request["data"]
+    if payload is None:
+        payload = dict(form_submission.data)
+
+    endpoint = get_endpoint_key(
+        webhook_request["method"], webhook_request["url"], webhook_request["headers"]
+    )
+    batch_size = webhook.get("batch_size") or 1
+    return WebhookQueueItem.objects.create(
+        form_submission=form_submission,
+        endpoint=endpoint,
+        method=webhook_request["method"],
+        url=webhook_request["url"],
+        headers=webhook_request["headers"],
+        payload=payload,
+        batch_size=batch_size,
+        max_latency=webhook.get("batch_max_latency") or 0,
+    )
+
+
+def get_due_endpoints(now=None):
+    """
+    Returns the endpoints with a full batch or a payload waiting longer than its max latency.
+
+    Payloads waiting for their next attempt are left out.
+    """
+    WebhookQueueItem = get_webhook_queue_model()
+    now = now or timezone.now()
+
+    endpoints = []
+    pending = WebhookQueueItem.objects.filter(
+        get_due_filter(now), status=WebhookQueueItem.Status.PENDING
+    )
+    for endpoint in pending.values_list("endpoint", flat=True).distinct():
+        items = pending.filter(endpoint=endpoint)
+        first = items.order_by("pk").only("batch_size", "max_latency").first()
+        oldest = items.aggregate(oldest=Min("created_at"))["oldest"]
+        if first is None:
+            continue
+        if items.count() >= first.batch_size or oldest <= now - timedelta(
+            seconds=first.max_latency
+        ):
+            endpoints.append(endpoint)
+    return endpoints
+
+
+def reset_stale_webhook_items(timeout=None):
+    """
+    Queue the payloads again which are sending for longer than timeout seconds
+    (WEBHOOK_SENDING_TIMEOUT by default), e.g. when their worker was killed.
+    Returns the number of payloads reset.
+    """
+    WebhookQueueItem = get_webhook_queue_model()
+    if timeout is None:
+        timeout = WEBHOOK_SENDING_TIMEOUT
+    stale = WebhookQueueItem.objects.filter(
+        status=WebhookQueueItem.Status.SENDING,
+        claimed_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    total = stale.update(status=WebhookQueueItem.Status.PENDING, claimed_at=None)
+    if total:
+        logger.warning("Reset %s stale webhook payloads" % total)
+    return total
+
+
+def claim_items(endpoint, limit):
+    """
+    Claim up to limit due payloads of an endpoint for sending.
+
+    The payloads are locked while they are claimed, payloads which are being
+    claimed by another worker are skipped, so a payload is sent by one worker.
+    """
+    WebhookQueueItem = get_webhook_queue_model()
+
+    using = router.db_for_write(WebhookQueueItem)
+    with transaction.atomic(using=using):
+        items = list(
+            WebhookQueueItem.objects.using(using)
+            .select_for_update(skip_locked=True)
+            .filter(
+                get_due_filter(),
+                endpoint=endpoint,
+                status=WebhookQueueItem.Status.PENDING,
+            )
+            .order_by("pk")[:limit]
+        )
+        now = timezone.now()
+        for item in items:
+            item.status = WebhookQueueItem.Status.SENDING
+            item.claimed_at = now
+        WebhookQueueItem.objects.using(using).bulk_update(
+            items, ["status", "claimed_at"]
+        )
+    return items
+
+
+def post_items(items):
+    first = items[0]
+    if first.batched:
+        kwargs = {"json": [item.payload for item in items]}
+    else:
+        kwargs = {"data": first.payload}
+    return send_request(
+        first.method,
+        first.url,
+        headers=first.headers,
+        form_submission=first.form_submission if len(items) == 1 else None,
+        **kwargs,
+    )
+
+
+def is_rejected(status_code):
+    """
+    Returns whether a response status rejects the payload for good, which
+    client errors do except a request timeout or too many requests.
+    """
+    return 400 <= status_code < 500 and status_code not in (408, 429)
+
+
+def deliver_items(items):
+    """
+    Send the items as one request, returns the (sent, failed, skipped) lists.
+
+    Failed items are (item, error, rejected) tuples, rejected items are not
+    retried. A client error on a batch splits it in halves to isolate the
+    rejected payloads, other errors mark the whole batch for a retry. Items
+    which were short-circuited by the circuit breaker are skipped, so a batch
+    which is split keeps the outcome of the halves which were delivered before
+    the circuit opened.
+    """
+    import requests
+
+    try:
+        res = post_items(items)
+    except CircuitOpenError:
+        return [], [], items
+    except requests.RequestException as err:
+        return [], [(item, str(err), False) for item in items], []
+
+    if res.ok:
+        return items, [], []
+
+    error = "HTTP %s: %s" % (res.status_code, res.text[:500])
+    rejected = is_rejected(res.status_code)
+    if rejected and len(items) > 1:
+        middle = len(items) // 2
+        sent, failed, skipped = deliver_items(items[:middle])
+        other_sent, other_failed, other_skipped = deliver_items(items[middle:])
+        return sent + other_sent, failed + other_failed, skipped + other_skipped
+    return [], [(item, error, rejected) for item in items], []
+
+
+def send_webhook_batch(endpoint):
+    """
+    Send the pending payloads of an endpoint as a single batched request.
+
+    Retries of unbatched webhooks are sent one request per payload.
+    """
+    WebhookQueueItem = get_webhook_queue_model()
+
+    first = (
+        WebhookQueueItem.objects.filter(
+            get_due_filter(), endpoint=endpoint, status=WebhookQueueItem.Status.PENDING
+        )
+        .order_by("pk")
+        .first()
+    )
+    if first is None:
+        return 0
+    items = claim_items(endpoint, first.batch_size)
+    if not items:
+        return 0
+
+    logger.info("Webhook batch (%s payloads) to %s" % (len(items), first.url))
+    sent, failed, skipped = [], [], []
+    if first.batched:
+        batches = [items]
+    else:
+        batches = [[item] for item in items]
+    for index, batch in enumerate(batches):
+        batch_sent, batch_failed, batch_skipped = deliver_items(batch)
+        sent += batch_sent
+        failed += batch_failed
+        skipped += batch_skipped
+        if batch_skipped:
+            # The circuit is open, the remaining payloads wait for the next run
+            skipped += [item for batch in batches[index + 1 :] for item in batch]
+            break
+
+    now = timezone.now()
+    # Short-circuited payloads wait for the breaker cooldown without counting as an attempt
+    WebhookQueueItem.objects.filter(pk__in=[item.pk for item in skipped]).update(
+        status=WebhookQueueItem.Status.PENDING,
+        next_attempt_at=now + timedelta(seconds=WEBHOOK_BREAKER_COOLDOWN),
+    )
+    WebhookQueueItem.objects.filter(pk__in=[item.pk for item in sent]).update(
+        status=WebhookQueueItem.Status.SENT, sent_at=now, error=""
+    )
+    for item, error, rejected in failed:
+        item.attempts += 1
+        item.error = error
+        if rejected or item.attempts >= WEBHOOK_MAX_ATTEMPTS:
+            item.status = WebhookQueueItem.Status.FAILED
+            item.next_attempt_at = None
+        else:
+            item.status = WebhookQueueItem.Status.PENDING
+            item.next_attempt_at = now + timedelta(
+                seconds=get_retry_delay(item.attempts)
+            )
+        item.save(update_fields=["attempts", "error", "status", "next_attempt_at"])
+        logger.warning("Webhook payload #%s failed: %s" % (item.pk, error))
+    return len(sent)
+
+
+def send_webhook_batches(timeout=None):
+    """
+    Send every batch and retry which is due, returns the number of payloads sent.
+
+    Stale sending payloads are queued again first, see reset_stale_webhook_items.
+    """
+    reset_stale_webhook_items(timeout=timeout)
+    return sum(send_webhook_batch(endpoint) for endpoint in get_due_endpoints())
+
+
+def delete_in_batches(queryset, batch_size=PRUNE_BATCH_SIZE):
+    total = 0
+    while True:
+        ids = list(queryset.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        total += queryset.model.objects.filter(pk__in=ids).delete()[0]
+
+
+def prune_webhooks(days=None, batch_size=PRUNE_BATCH_SIZE):
+    """
+    Deletes the sent and failed queued payloads and the deliveries older than
+    days (WEBHOOK_RETENTION_DAYS by default) in batches, returns the numbers
+    of (queue items, deliveries) deleted.
+    """
+    if days is None:
+        days = WEBHOOK_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+
+    items = deliveries = 0
+    if WEBHOOK_QUEUE_MODEL:
+        WebhookQueueItem = get_webhook_queue_model()
+        items = delete_in_batches(
+            WebhookQueueItem.objects.filter(
+                status__in=[
+                    WebhookQueueItem.Status.SENT,
+                    WebhookQueueItem.Status.FAILED,
+                ],
+                created_at__lt=cutoff,
+            ),
+            batch_size=batch_size,
+        )
+    if WEBHOOK_DELIVERY_MODEL:
+        WebhookDelivery = get_webhook_delivery_model()
+        deliveries = delete_in_batches(
+            WebhookDelivery.objects.filter(created_at__lt=cutoff),
+            batch_size=batch_size,
+        )
+    return items, deliveries
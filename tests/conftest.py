@@ -1,46 +1,114 @@
+import pytest
 from django.conf import settings
 
+SETTINGS = dict(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+    DATABASES={
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": "db.sqlite",
+        }
+    },
+    INSTALLED_APPS=[
+        "wagtail.embeds",
+        "wagtail.sites",
+        "wagtail.users",
+        "wagtail.snippets",
+        "wagtail.documents",
+        "wagtail.images",
+        "wagtail.search",
+        "wagtail.admin",
+        "wagtail",
+        "wagtail.contrib.forms",
+        "wagtail.contrib.routable_page",
+        "modelcluster",
+        "taggit",
+        "django.contrib.auth",
+        "django.contrib.contenttypes",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+        "django.contrib.sitemaps",
+        "django.contrib.staticfiles",
+        "wagtail_model_forms",
+        "tests.testapp",
+    ],
+    MIDDLEWARE=[
+        "django.middleware.security.SecurityMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ],
+    ROOT_URLCONF="tests.urls",
+    SECRET_KEY="tests",
+    STATIC_URL="/static/",
+    TEMPLATES=[
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "APP_DIRS": True,
+            "OPTIONS": {
+                "context_processors": [
+                    "django.template.context_processors.request",
+                    "django.contrib.auth.context_processors.auth",
+                    "django.contrib.messages.context_processors.messages",
+                ],
+            },
+        }
+    ],
+    USE_TZ=True,
+    WAGTAIL_SITE_NAME="tests",
+    WAGTAILADMIN_BASE_URL="http://localhost",
+    WAGTAIL_MODEL_FORMS_FORM_MODEL="testapp.Form",
+    WAGTAIL_MODEL_FORMS_SUBMISSION_MODEL="testapp.FormSubmission",
+    WAGTAIL_MODEL_FORMS_UPLOADED_FILE_MODEL="testapp.UploadedFile",
+    WAGTAIL_MODEL_FORMS_STATISTIC_MODEL="testapp.FormSubmissionStatistic",
+    WAGTAIL_MODEL_FORMS_ERASURE_CHECKPOINT_MODEL="testapp.ErasureCheckpoint",
+    WAGTAIL_MODEL_FORMS_EXPORT_JOB_MODEL="testapp.ExportJob",
+    WAGTAIL_MODEL_FORMS_SCHEMA_MODEL="testapp.FormSchema",
+    WAGTAIL_MODEL_FORMS_WEBHOOK_QUEUE_MODEL="testapp.WebhookQueueItem",
+    WAGTAIL_MODEL_FORMS_WEBHOOK_DELIVERY_MODEL="testapp.WebhookDelivery",
+)
+
 
 def pytest_configure():
-    settings.configure(
-        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
-        DATABASES={
-            "default": {
-                "ENGINE": "django.db.backends.sqlite3",
-                "NAME": "db.sqlite",
-            }
-        },
-        INSTALLED_APPS=[
-            "wagtail.embeds",
-            "wagtail.sites",
-            "wagtail.users",
-            "wagtail.snippets",
-            "wagtail.documents",
-            "wagtail.images",
-            "wagtail.search",
-            "wagtail.admin",
-            "wagtail",
-            "wagtail.contrib.routable_page",
-            "modelcluster",
-            "taggit",
-            "django.contrib.auth",
-            "django.contrib.contenttypes",
-            "django.contrib.sessions",
-            "django.contrib.messages",
-            "django.contrib.sitemaps",
-            "django.contrib.staticfiles",
-            "wagtail_model_forms",
-        ],
-        MIDDLEWARE=[
-            "django.middleware.security.SecurityMiddleware",
-            "django.contrib.sessions.middleware.SessionMiddleware",
-            "django.middleware.common.CommonMiddleware",
-            "django.middleware.csrf.CsrfViewMiddleware",
-            "django.contrib.auth.middleware.AuthenticationMiddleware",
-            "django.contrib.messages.middleware.MessageMiddleware",
-            "django.middleware.clickjacking.XFrameOptionsMiddleware",
-            "wagtail.middleware.SiteMiddleware",
-        ],
-        SECRET_KEY="tests",
-        STATIC_URL="/static/",
+    settings.configure(**SETTINGS)
+
+
+@pytest.fixture(autouse=True)
+def schema_cache():
+    # The stored schemas are remembered per process, but the database is
+    # rolled back after each test
+    from wagtail_model_forms import schema
+
+    yield
+    schema._stored_schemas.clear()
+    schema._schema_fields.clear()
+
+
+FORM_FIELDS = [("singleline", {"label": "Name", "help_text": "", "required": True})]
+
+
+@pytest.fixture
+def form_fields():
+    """
+    The fields of the form_page form, override this fixture in a module or
+    parametrize it on a test to use other fields.
+    """
+    return FORM_FIELDS
+
+
+@pytest.fixture
+def form_page(form_fields):
+    from wagtail.models import Page
+
+    from tests.testapp.models import Form, FormPage
+
+    form = Form.objects.create(title="Form", fields=form_fields)
+    page = Page.objects.get(depth=2).add_child(
+        instance=FormPage(
+            title="Contact", slug="contact", content=[("form", {"form": form})]
+        )
     )
+    return page, form
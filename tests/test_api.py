@@ -0,0 +1,80 @@
+import pytest
+from django.urls import reverse
+
+from tests.testapp.models import Form
+
+FIELDS = [
+    ("singleline", {"label": "Name", "help_text": "", "required": True}),
+    (
+        "fieldset",
+        {
+            "legend": "Contact details",
+            "form_fields": [
+                (
+                    "fieldrow",
+                    {
+                        "form_fields": [
+                            (
+                                "email",
+                                {"label": "Email", "help_text": "", "required": True},
+                            ),
+                            (
+                                "checkboxes",
+                                {
+                                    "label": "Topics",
+                                    "help_text": "",
+                                    "required": False,
+                                    "choices": [
+                                        {"value": "A", "default_value": True},
+                                        {"value": "B", "default_value": False},
+                                    ],
+                                },
+                            ),
+                        ]
+                    },
+                ),
+            ],
+        },
+    ),
+]
+
+
+@pytest.mark.django_db
+def test_form_definition(client, django_assert_max_num_queries):
+    form = Form.objects.create(title="Contact", fields=FIELDS)
+    url = reverse("wagtail_model_forms_form_definition", args=[form.pk])
+
+    with django_assert_max_num_queries(1):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert "max-age=60" in response["Cache-Control"]
+    definition = response.json()
+
+    assert [x["name"] for x in definition["fields"]] == [
+        "name",
+        "contact-details.email",
+        "contact-details.topics",
+    ]
+    assert definition["fields"][2]["choices"] == [
+        {"value": "A", "default": True},
+        {"value": "B", "default": False},
+    ]
+    assert definition["layout"][1]["children"][0]["type"] == "fieldrow"
+    assert definition["json_schema"]["required"] == ["name", "contact-details.email"]
+    assert definition["json_schema"]["properties"]["contact-details.email"] == {
+        "type": "string",
+        "format": "email",
+        "title": "Email",
+        "minLength": 1,
+    }
+    assert definition["schema_digest"] == form.get_schema_digest()
+
+    # Revalidating with the ETag returns no content
+    response = client.get(url, headers={"If-None-Match": response["ETag"]})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    form.fields = FIELDS[:1]
+    form.save()
+    response = client.get(url, headers={"If-None-Match": response["ETag"]})
+    assert response.status_code == 200
@@ -0,0 +1,106 @@
+from types import SimpleNamespace
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.testapp.models import Form
+from wagtail_model_forms import choices
+from wagtail_model_forms.choices import (
+    ChoiceSource,
+    ChoiceSourceField,
+    register_choice_source,
+)
+
+COLORS = ["Red", "Green", "Blue", "Light green", "Dark green"]
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(choices, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def source():
+    calls = []
+
+    def get_colors():
+        calls.append(1)
+        return COLORS
+
+    source = register_choice_source("colors", get_colors, ttl=60)
+    yield source, calls
+    choices._choice_sources.pop("colors")
+
+
+def test_choice_source_ttl(source, now):
+    source, calls = source
+    assert source.get_choices()[0] == ("Red", "Red")
+    source.get_values()
+    assert len(calls) == 1
+
+    now[0] += 61
+    source.get_values()
+    assert len(calls) == 2
+
+    source.clear()
+    source.get_values()
+    assert len(calls) == 3
+
+
+def test_choice_source_search(source):
+    source, calls = source
+    assert source.search("GREEN", page_size=2) == (
+        [("Green", "Green"), ("Light green", "Light green")],
+        True,
+    )
+    assert source.search("green", page=2, page_size=2) == (
+        [("Dark green", "Dark green")],
+        False,
+    )
+    assert source.search("", page_size=10) == ([(x, x) for x in COLORS], False)
+
+
+@pytest.mark.django_db
+def test_choice_source_queryset_search():
+    for title in COLORS:
+        Form.objects.create(title=title, fields=[])
+    source = ChoiceSource(
+        "forms", Form.objects.order_by("pk"), value_field="pk", label_field="title"
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        results, more = source.search("green", page_size=2)
+    # Filtered and limited in the database, the choices are not loaded
+    assert len(context.captured_queries) == 1
+    assert "LIKE" in context.captured_queries[0]["sql"]
+    assert [label for value, label in results] == ["Green", "Light green"]
+    assert more
+    assert source._choices == []
+
+    results, more = source.search("green", page=2, page_size=2)
+    assert [label for value, label in results] == ["Dark green"]
+    assert not more
+
+
+def test_choice_source_field(source):
+    field = ChoiceSourceField("colors")
+    assert field.clean("Blue") == "Blue"
+    with pytest.raises(ValidationError):
+        field.clean("Purple")
+
+    field = ChoiceSourceField("unknown", required=False)
+    assert field.clean("") == ""
+    with pytest.raises(ValidationError):
+        field.clean("Blue")
+
+
+def test_choice_source_input():
+    html = ChoiceSourceField("colors").widget.render("color", "")
+    assert 'data-autocomplete-url="/forms/choices/colors/"' in html
+    assert "wagtail_model_forms/js/choice-source.js" in str(
+        ChoiceSourceField("colors").widget.media
+    )
@@ -0,0 +1,36 @@
+import decimal
+from decimal import Decimal
+
+import pytest
+
+from wagtail_model_forms.columnar import convert_value
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("12.5", Decimal("12.5000000000")),
+        (3, Decimal("3.0000000000")),
+        ("0.00000000005", Decimal("0E-10")),
+        ("-0.00000000016", Decimal("-2E-10")),
+        # 28 integer digits and 10 decimals is the largest value of the column
+        ("9" * 28 + ".123456789012", Decimal("9" * 28 + ".1234567890")),
+        ("abc", None),
+        ("NaN", None),
+        ("", None),
+    ],
+)
+def test_convert_decimal(value, expected):
+    assert convert_value(value, "decimal") == expected
+
+
+def test_convert_decimal_context():
+    # The column precision does not depend on the context of the thread
+    with decimal.localcontext(decimal.Context(prec=5)):
+        assert convert_value("123456.789", "decimal") == Decimal("123456.7890000000")
+
+
+@pytest.mark.parametrize("value", ["1" + "0" * 28, "-1e30", 10**40])
+def test_convert_decimal_out_of_range(value):
+    with pytest.raises(ValueError, match="does not fit"):
+        convert_value(value, "decimal")
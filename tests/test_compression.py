@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+from tests.testapp.models import Form, FormSubmission
+from wagtail_model_forms.compression import (
+    decode_form_data,
+    encode_form_data,
+    get_compression,
+)
+
+FORM_DATA = {"message": "lorem ipsum dolor sit amet " * 100, "choices": ["a", "b"]}
+
+
+def test_encode_form_data():
+    value = json.dumps(FORM_DATA)
+    encoded = encode_form_data(value, "zlib", min_size=0)
+    assert encoded.startswith("~zlib:")
+    assert get_compression(encoded) == "zlib"
+    assert len(encoded) < len(value) / 5
+    assert decode_form_data(encoded) == value
+
+    # Small or incompressible form data is stored as is
+    assert encode_form_data(value, "zlib", min_size=len(value) + 1) == value
+    assert encode_form_data('{"a": "b"}', "zlib", min_size=0) == '{"a": "b"}'
+    assert encode_form_data(value, "", min_size=0) == value
+
+    # Uncompressed form data reads as before
+    assert get_compression(value) is None
+    assert decode_form_data(value) == value
+
+
+@pytest.mark.django_db
+def test_compress_form_submissions():
+    form = Form.objects.create(title="Form", fields=[])
+    form_submission = FormSubmission.objects.create(
+        form=form, form_data=json.dumps(FORM_DATA)
+    )
+
+    call_command(
+        "compress_form_submissions",
+        "--algorithm=zlib",
+        "--min-size=0",
+        "--sleep=0",
+        stdout=io.StringIO(),
+    )
+    form_submission = FormSubmission.objects.get(pk=form_submission.pk)
+    assert get_compression(form_submission.form_data) == "zlib"
+    assert dict(form_submission.data) == FORM_DATA
+
+    call_command(
+        "compress_form_submissions",
+        "--algorithm=none",
+        "--sleep=0",
+        stdout=io.StringIO(),
+    )
+    form_submission = FormSubmission.objects.get(pk=form_submission.pk)
+    assert json.loads(form_submission.form_data) == FORM_DATA
+
+
+def test_benchmark_form_data_compression():
+    stdout = io.StringIO()
+    call_command(
+        "benchmark_form_data_compression", "--count=20", "--seed=1", stdout=stdout
+    )
+    lines = stdout.getvalue().splitlines()
+    assert lines[2].startswith("none")
+    assert lines[3].startswith("zlib")
+    # The payload is the compressed size without the base64 encoding
+    stored, payload = lines[3].split()[1:3]
+    assert int(payload) < int(stored)
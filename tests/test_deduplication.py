@@ -0,0 +1,95 @@
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models.signals import post_delete
+
+from tests.testapp.models import FormSubmission, UploadedFile
+from wagtail_model_forms import models
+from wagtail_model_forms.uploads import get_checksum, uploaded_file_deleted
+
+pytestmark = pytest.mark.django_db
+
+FIELDS = [("file", {"label": "Upload", "help_text": "", "required": True})]
+
+
+@pytest.fixture
+def deduplication(settings, tmp_path, monkeypatch):
+    settings.MEDIA_ROOT = str(tmp_path)
+    monkeypatch.setattr(models, "UPLOADED_FILE_DEDUPLICATION", True)
+    post_delete.connect(uploaded_file_deleted, sender=UploadedFile)
+    yield
+    post_delete.disconnect(uploaded_file_deleted, sender=UploadedFile)
+
+
+@pytest.fixture
+def form_fields():
+    return FIELDS
+
+
+def submit(client, form_page, content):
+    page, form = form_page
+    response = client.post(
+        page.url,
+        {"form_id": form.pk, "upload": SimpleUploadedFile("report.pdf", content)},
+    )
+    assert response.status_code == 200
+
+
+def test_deduplicated_uploads(
+    client, deduplication, form_page, django_capture_on_commit_callbacks
+):
+    submit(client, form_page, b"%PDF-1.4 same")
+    submit(client, form_page, b"%PDF-1.4 same")
+    submit(client, form_page, b"%PDF-1.4 other")
+
+    first, second, other = UploadedFile.objects.order_by("pk")
+    # The same content is stored once under its digest
+    assert first.file.name == second.file.name
+    assert first.checksum == second.checksum
+    assert first.checksum == get_checksum(SimpleUploadedFile("x", b"%PDF-1.4 same"))
+    assert first.file.name == "form-uploads/%s/%s/%s.pdf" % (
+        first.checksum[:2],
+        first.checksum[2:4],
+        first.checksum,
+    )
+    assert other.file.name != first.file.name
+
+    # The stored file survives until its last reference is deleted
+    with django_capture_on_commit_callbacks(execute=True):
+        FormSubmission.objects.get(pk=first.form_submission_id).delete()
+    assert default_storage.exists(second.file.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FormSubmission.objects.get(pk=second.form_submission_id).delete()
+    assert not default_storage.exists(second.file.name)
+    assert default_storage.exists(other.file.name)
+
+
+def test_deduplicated_upload_restored(
+    client, deduplication, form_page, monkeypatch, django_capture_on_commit_callbacks
+):
+    submit(client, form_page, b"%PDF-1.4 same")
+    first = UploadedFile.objects.get()
+    page, form = form_page
+    store = models.store_deduplicated_file
+
+    def store_and_delete_concurrently(*args, **kwargs):
+        # The last other reference is deleted after the stored file was found,
+        # before the new reference is created
+        result = store(*args, **kwargs)
+        with django_capture_on_commit_callbacks(execute=True):
+            FormSubmission.objects.get(pk=first.form_submission_id).delete()
+        assert not default_storage.exists(first.file.name)
+        return result
+
+    monkeypatch.setattr(
+        models, "store_deduplicated_file", store_and_delete_concurrently
+    )
+    form_submission = FormSubmission.objects.create(form=form, form_data="{}")
+    with django_capture_on_commit_callbacks(execute=True):
+        second = form.create_uploaded_file(
+            form_submission, SimpleUploadedFile("report.pdf", b"%PDF-1.4 same")
+        )
+    assert second.file.name == first.file.name
+    with second.file.open("rb") as f:
+        assert f.read() == b"%PDF-1.4 same"
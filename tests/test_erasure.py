@@ -0,0 +1,126 @@
+import datetime
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from tests.testapp.models import (
+    ErasureCheckpoint,
+    Form,
+    FormSubmission,
+    UploadedFile,
+    WebhookDelivery,
+    WebhookQueueItem,
+)
+from wagtail_model_forms.erasure import PSEUDONYM_PREFIX, pseudonymize
+
+FIELDS = [
+    ("singleline", {"label": "Name", "help_text": "", "required": True}),
+    (
+        "fieldset",
+        {
+            "legend": "Contact",
+            "form_fields": [
+                ("email", {"label": "Email", "help_text": "", "required": True}),
+            ],
+        },
+    ),
+    ("file", {"label": "CV", "help_text": "", "required": False}),
+]
+
+RULES = [
+    ("rule", {"field_type": "email", "action": "erase", "after_days": 90}),
+    ("rule", {"field_name": "name", "action": "pseudonymize", "after_days": 30}),
+    ("rule", {"field_type": "file", "action": "erase", "after_days": 90}),
+]
+
+
+def create_submission(form, days, i):
+    form_submission = FormSubmission.objects.create(
+        form=form,
+        form_data=json.dumps({"name": "Name %s" % i, "contact.email": "%s@x.nl" % i}),
+    )
+    submit_time = timezone.now() - datetime.timedelta(days=days)
+    FormSubmission.objects.filter(pk=form_submission.pk).update(submit_time=submit_time)
+    UploadedFile.objects.create(form_submission=form_submission, file="cv-%s.pdf" % i)
+    return form_submission
+
+
+@pytest.mark.django_db
+def test_erase_form_submissions():
+    form = Form.objects.create(title="Form", fields=FIELDS, erasure_rules=RULES)
+    old = [create_submission(form, 100, i) for i in range(5)]
+    recent = [create_submission(form, 60, i) for i in range(5, 8)]
+    new = create_submission(form, 1, 8)
+
+    call_command(
+        "erase_form_submissions", "--batch-size=2", "--sleep=0", stdout=io.StringIO()
+    )
+
+    for form_submission in old:
+        data = FormSubmission.objects.get(pk=form_submission.pk).data
+        assert data["contact.email"] == ""
+        assert data["name"].startswith(PSEUDONYM_PREFIX)
+        assert not UploadedFile.objects.filter(form_submission=form_submission).exists()
+    for form_submission in recent:
+        data = FormSubmission.objects.get(pk=form_submission.pk).data
+        assert data["contact.email"] != ""
+        assert data["name"].startswith(PSEUDONYM_PREFIX)
+        assert UploadedFile.objects.filter(form_submission=form_submission).exists()
+    assert FormSubmission.objects.get(pk=new.pk).data["name"] == "Name 8"
+
+    # A rerun continues after the checkpoints and does not hash the pseudonyms again
+    name = FormSubmission.objects.get(pk=old[0].pk).data["name"]
+    assert ErasureCheckpoint.objects.filter(form=form).count() == 3
+    call_command("erase_form_submissions", "--sleep=0", stdout=io.StringIO())
+    assert FormSubmission.objects.get(pk=old[0].pk).data["name"] == name
+
+
+@pytest.mark.django_db
+def test_erasure_search_document_and_webhooks():
+    fields = FIELDS[:1] + [
+        ("checkbox", {"label": "Newsletter", "help_text": "", "required": False}),
+    ]
+    rules = [("rule", {"field_type": "", "action": "pseudonymize", "after_days": 30})]
+    form = Form.objects.create(title="Form", fields=fields, erasure_rules=rules)
+    form_submission = FormSubmission.objects.create(
+        form=form, form_data=json.dumps({"name": "Jane Doe", "newsletter": True})
+    )
+    FormSubmission.objects.filter(pk=form_submission.pk).update(
+        submit_time=timezone.now() - datetime.timedelta(days=40)
+    )
+    UploadedFile.objects.create(
+        form_submission=form_submission, file="cv.pdf", text="Curriculum vitae"
+    )
+    WebhookQueueItem.objects.create(
+        form_submission=form_submission,
+        endpoint="endpoint",
+        method="POST",
+        url="https://example.com/hook",
+        payload={"name": "Jane Doe"},
+    )
+    WebhookDelivery.objects.create(
+        form_submission=form_submission,
+        target="https://example.com",
+        method="POST",
+        url="https://example.com/hook",
+        status="success",
+    )
+
+    call_command("erase_form_submissions", "--sleep=0", stdout=io.StringIO())
+
+    form_submission = FormSubmission.objects.get(pk=form_submission.pk)
+    assert form_submission.data["name"].startswith(PSEUDONYM_PREFIX)
+    assert form_submission.data["newsletter"] is False
+    assert "Jane" not in form_submission.search_document
+    assert "Curriculum vitae" in form_submission.search_document
+    assert not WebhookQueueItem.objects.exists()
+    assert not WebhookDelivery.objects.exists()
+
+
+def test_pseudonymize():
+    assert pseudonymize(True) is False
+    assert pseudonymize("Jane") == pseudonymize("Jane")
+    assert pseudonymize(pseudonymize(12)) == pseudonymize(12)
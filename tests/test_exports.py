@@ -0,0 +1,180 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+from django.utils import timezone
+from wagtail.models import Page
+
+from tests.testapp.models import ExportJob, Form, FormPage, FormSubmission
+from wagtail_model_forms import exports
+from wagtail_model_forms.exports import (
+    claim_export_job,
+    iter_chunks,
+    process_export_jobs,
+    reset_stale_export_jobs,
+    run_export_job,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def form_submissions():
+    form = Form.objects.create(title="Form", fields=[])
+    page = Page.objects.get(depth=2).add_child(
+        instance=FormPage(title="Contact", slug="contact")
+    )
+    now = timezone.now()
+    form_submissions = []
+    for i in range(5):
+        form_submission = FormSubmission.objects.create(
+            form=form,
+            # Submissions without a page, e.g. imported ones, are exported too
+            page=page if i % 2 else None,
+            form_data=json.dumps({"name": "Name %s" % i}),
+        )
+        # Two submissions share the same time
+        FormSubmission.objects.filter(pk=form_submission.pk).update(
+            submit_time=now - timedelta(minutes=min(i, 3))
+        )
+        form_submissions.append(form_submission)
+    Form.objects.create(title="Other", fields=[])
+    return form_submissions
+
+
+def read_csv(job):
+    with job.file.open("r") as f:
+        return list(csv.DictReader(io.StringIO(f.read())))
+
+
+def test_iter_chunks(form_submissions):
+    queryset = FormSubmission.objects.all()
+    chunks = list(iter_chunks(queryset, 2, order_field="submit_time"))
+    # Items with the same time are neither skipped nor repeated across chunks
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [x.pk for chunk in chunks for x in chunk] == list(
+        queryset.order_by("-submit_time", "-pk").values_list("pk", flat=True)
+    )
+
+
+def test_export_job(admin_client, form_submissions):
+    form = form_submissions[0].form
+    response = admin_client.get(
+        reverse("form_submissions_report"),
+        {"export": "csv", "form_instance": form.pk, "p": 2},
+    )
+    job = ExportJob.objects.get()
+    assert response.status_code == 302
+    assert response["Location"] == reverse("form_submissions_export_job", args=[job.pk])
+    assert job.filters == {"form_instance": [str(form.pk)]}
+
+    response = admin_client.get(response["Location"])
+    assert b"Pending" in response.content
+    assert b'http-equiv="refresh"' in response.content
+
+    job = claim_export_job()
+    run_export_job(job, chunk_size=2)
+    job.refresh_from_db()
+    assert job.status == ExportJob.Status.COMPLETED
+    assert (job.processed, job.total, job.progress) == (5, 5, 100)
+
+    # In the order of the report, newest first
+    rows = read_csv(job)
+    assert [json.loads(row["Data"])["name"] for row in rows] == [
+        "Name %s" % i for i in [0, 1, 2, 4, 3]
+    ]
+    assert [row["Page"] for row in rows] == ["", "Contact", "", "", "Contact"]
+
+    response = admin_client.get(reverse("form_submissions_export_job", args=[job.pk]))
+    assert b'http-equiv="refresh"' not in response.content
+    download_url = reverse("form_submissions_export_job_download", args=[job.pk])
+    assert download_url.encode() in response.content
+    response = admin_client.get(download_url)
+    assert response.status_code == 200
+    assert b"Name 0" in b"".join(response.streaming_content)
+
+
+def test_export_job_jsonl(form_submissions):
+    job = ExportJob.objects.create(format="jsonl")
+    assert process_export_jobs() == 1
+    job.refresh_from_db()
+    with job.file.open("r") as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["data"]["name"] for row in rows] == [
+        "Name %s" % i for i in [0, 1, 2, 4, 3]
+    ]
+
+
+def test_export_job_failed(form_submissions, monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("Broken")
+
+    monkeypatch.setattr(exports, "get_export_queryset", fail)
+    job = ExportJob.objects.create(format="csv")
+    assert process_export_jobs() == 1
+    job.refresh_from_db()
+    assert job.status == ExportJob.Status.FAILED
+    assert job.error == "Broken"
+    assert job.finished_at is not None
+
+
+def test_claim_export_job(monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_JOBS_MAX_CONCURRENT", 2)
+    first, second, third = [ExportJob.objects.create() for _ in range(3)]
+
+    assert claim_export_job() == first
+    assert claim_export_job() == second
+    # The maximum of concurrently running jobs is reached
+    assert claim_export_job() is None
+
+    # A job running for longer than the timeout is queued again
+    ExportJob.objects.filter(pk=first.pk).update(
+        started_at=timezone.now() - timedelta(seconds=3601)
+    )
+    assert reset_stale_export_jobs() == 1
+    first.refresh_from_db()
+    assert (first.status, first.started_at) == (ExportJob.Status.PENDING, None)
+    assert claim_export_job() == first
+
+
+def create_editor(django_user_model, username):
+    user = django_user_model.objects.create_user(username=username, password="x")
+    user.user_permissions.add(
+        Permission.objects.get(codename="access_admin"),
+        Permission.objects.get(
+            codename="view_formsubmission", content_type__app_label="testapp"
+        ),
+    )
+    return user
+
+
+def test_export_job_permissions(client, django_user_model, form_submissions):
+    user = create_editor(django_user_model, "editor")
+    other = create_editor(django_user_model, "other")
+    job = ExportJob.objects.create(user=user)
+    process_export_jobs()
+    download_url = reverse("form_submissions_export_job_download", args=[job.pk])
+
+    # Denied requests are redirected to the dashboard by the admin
+    client.force_login(other)
+    assert client.get(download_url)["Location"] == reverse("wagtailadmin_home")
+
+    client.force_login(user)
+    assert client.get(download_url).status_code == 200
+
+    # Users who lost access to the submissions can't download their exports
+    user.user_permissions.remove(
+        Permission.objects.get(
+            codename="view_formsubmission", content_type__app_label="testapp"
+        )
+    )
+    assert client.get(download_url)["Location"] == reverse("wagtailadmin_home")
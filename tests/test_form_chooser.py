@@ -0,0 +1,62 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from tests.testapp.models import Form, FormSubmission
+from wagtail_model_forms import views
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def forms():
+    return [Form.objects.create(title="Form %02d" % i, fields=[]) for i in range(30)]
+
+
+def test_report_renders_selected_form_only(admin_client, forms):
+    response = admin_client.get(
+        reverse("form_submissions_report"), {"form_instance": forms[5].pk}
+    )
+    content = response.content.decode()
+    assert content.count('<option value="%s" selected>Form 05</option>' % forms[5].pk)
+    assert "Form 06" not in content
+    assert "data-form-chooser-search" in content
+
+
+def test_form_chooser_search(admin_client, forms):
+    url = reverse("form_chooser_search")
+    data = admin_client.get(url).json()
+    assert [x["text"] for x in data["results"]][:2] == ["Form 00", "Form 01"]
+    assert len(data["results"]) == 20
+    assert data["pagination"]["more"]
+
+    data = admin_client.get(url, {"page": 2}).json()
+    assert len(data["results"]) == 10
+    assert not data["pagination"]["more"]
+
+    data = admin_client.get(url, {"q": "m 1"}).json()
+    assert [x["text"] for x in data["results"]] == [
+        "Form %02d" % i for i in range(10, 20)
+    ]
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+def test_form_chooser_counts(admin_client, forms, monkeypatch):
+    monkeypatch.setattr(views, "FORM_CHOOSER_COUNTS", True)
+    cache.clear()
+    FormSubmission.objects.create(form=forms[0], form_data="{}")
+    FormSubmission.objects.create(
+        form=forms[0], form_data="{}", status=FormSubmission.Status.COMPLETED
+    )
+    url = reverse("form_chooser_search")
+    result = admin_client.get(url, {"q": "Form 00"}).json()["results"][0]
+    assert result["new_submissions"] == 1
+    assert result["text"] == "Form 00 (1 new)"
+
+    # The counts are cached
+    FormSubmission.objects.create(form=forms[0], form_data="{}")
+    result = admin_client.get(url, {"q": "Form 00"}).json()["results"][0]
+    assert result["new_submissions"] == 1
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from django.utils.safestring import SafeString, mark_safe
+
+from tests.testapp.models import Form, FormSubmission
+from wagtail_model_forms import utils
+from wagtail_model_forms.utils import json_loads
+
+DOCUMENT = '{"name": "John", "choices": ["a", "b"], "agree": true}'
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_loads(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(utils, "orjson", None)
+    assert json_loads(DOCUMENT) == json.loads(DOCUMENT)
+    assert json_loads(DOCUMENT.encode()) == json.loads(DOCUMENT)
+
+    value = mark_safe(DOCUMENT)
+    assert isinstance(value, SafeString)
+    assert json_loads(value) == json.loads(DOCUMENT)
+
+
+@pytest.mark.django_db
+def test_data_is_decoded_once(monkeypatch):
+    form = Form.objects.create(title="Form", fields=[])
+    form_submission = FormSubmission.objects.get(
+        pk=FormSubmission.objects.create(form=form, form_data=DOCUMENT).pk
+    )
+    calls = []
+
+    def counting_loads(value):
+        calls.append(value)
+        return json.loads(value)
+
+    monkeypatch.setattr("wagtail_model_forms.models.json_loads", counting_loads)
+    assert form_submission.data["name"] == "John"
+    assert form_submission.data["choices"] == ["a", "b"]
+    assert len(calls) == 1
+
+    with pytest.raises(TypeError):
+        form_submission.data["name"] = "Jane"
@@ -0,0 +1,92 @@
+import logging
+import threading
+
+import pytest
+
+from tests.testapp.models import FormSubmission
+from wagtail_model_forms.handlers import (
+    SubmissionHandler,
+    register_submission_handler,
+    unregister_submission_handler,
+)
+from wagtail_model_forms.models import EMAIL_NOTIFICATIONS_HANDLER, WEBHOOKS_HANDLER
+
+
+@pytest.fixture
+def handlers():
+    calls = {}
+    done = threading.Event()
+
+    def sync_handler(form, form_submission, request):
+        calls["sync"] = (request is not None, threading.current_thread().name)
+
+    def failing_handler(form, form_submission, request):
+        raise ValueError("Handler failed")
+
+    def deferred_handler(form, form_submission, request):
+        calls["deferred"] = (request, threading.current_thread().name)
+        done.set()
+
+    register_submission_handler("sync", sync_handler, order=1)
+    register_submission_handler("failing", failing_handler, deferred=True, order=2)
+    register_submission_handler("deferred", deferred_handler, deferred=True, order=3)
+    yield calls, done
+    for name in ["sync", "failing", "deferred"]:
+        unregister_submission_handler(name)
+
+
+@pytest.mark.django_db
+def test_submission_handlers(
+    client, form_page, handlers, django_capture_on_commit_callbacks
+):
+    page, form = form_page
+    calls, done = handlers
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        response = client.post(page.url, {"form_id": form.pk, "name": "Jane"})
+    assert response.status_code == 200
+    assert FormSubmission.objects.filter(form=form).count() == 1
+
+    # The sync handler runs within the request, the deferred handlers after the
+    # commit on the thread pool, the failing handler does not stop the others
+    assert calls["sync"] == (True, threading.current_thread().name)
+    assert len(callbacks) == 1
+    assert done.wait(5)
+    request, thread_name = calls["deferred"]
+    assert request is None
+    assert thread_name.startswith("wagtail_model_forms")
+
+
+@pytest.mark.django_db
+def test_failing_handler_logged(
+    client, form_page, handlers, caplog, monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr("wagtail_model_forms.handlers.HANDLER_WORKERS", 0)
+    page, form = form_page
+    calls, done = handlers
+
+    with caplog.at_level(logging.ERROR, logger="wagtail_model_forms.handlers"):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(page.url, {"form_id": form.pk, "name": "Jane"})
+    assert response.status_code == 200
+
+    # The handler after the failing one still runs
+    assert calls["deferred"] == (None, threading.current_thread().name)
+    form_submission = FormSubmission.objects.get()
+    (record,) = caplog.records
+    assert record.getMessage() == (
+        "Submission handler failing failed (FormSubmission#%s)" % form_submission.pk
+    )
+    assert record.exc_info[0] is ValueError
+
+
+def test_deferred_handlers_setting(monkeypatch):
+    # The handlers of the mixins are sync unless they are deferred by name
+    assert not EMAIL_NOTIFICATIONS_HANDLER.deferred
+    assert not WEBHOOKS_HANDLER.deferred
+
+    monkeypatch.setattr(
+        "wagtail_model_forms.handlers.DEFERRED_HANDLERS", ["email_notifications"]
+    )
+    assert SubmissionHandler("email_notifications", print).deferred
+    assert not SubmissionHandler("webhooks", print).deferred
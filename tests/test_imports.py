@@ -0,0 +1,109 @@
+import io
+
+import pytest
+from django.core.management import call_command
+
+from tests.testapp.models import Form, FormSubmission
+
+FIELDS = [
+    ("singleline", {"label": "Name", "help_text": "", "required": True}),
+    (
+        "fieldset",
+        {
+            "legend": "Contact",
+            "form_fields": [
+                ("email", {"label": "Email", "help_text": "", "required": True}),
+            ],
+        },
+    ),
+    (
+        "checkboxes",
+        {
+            "label": "Topics",
+            "help_text": "",
+            "required": False,
+            "choices": [
+                {"value": "A", "default_value": False},
+                {"value": "B", "default_value": False},
+            ],
+        },
+    ),
+]
+
+CSV = """Name,E-mail address,Topics,submit_time,Other
+Jane,jane@example.com,"A, B",2020-01-02 10:00:00,x
+John,not-an-email,A,2020-01-03 10:00:00,x
+Joe,joe@example.com,,,x
+"""
+
+
+@pytest.fixture
+def form():
+    return Form.objects.create(title="Form", fields=FIELDS)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "submissions.csv"
+    path.write_text(CSV)
+    return str(path)
+
+
+def import_csv(form, csv_path, *args):
+    stdout = io.StringIO()
+    call_command(
+        "import_form_submissions",
+        "--csv=%s" % csv_path,
+        "--form=%s" % form.pk,
+        "--map=E-mail address=contact.email",
+        *args,
+        stdout=stdout,
+    )
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db
+def test_import_dry_run(form, csv_path):
+    output = import_csv(form, csv_path, "--dry-run")
+    assert "Row 2: contact.email" in output
+    assert "2 valid and 1 invalid rows" in output
+    assert not FormSubmission.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_skip_invalid(form, csv_path):
+    # Without validation the invalid row is imported as well
+    import_csv(form, csv_path)
+    assert FormSubmission.objects.count() == 3
+
+    FormSubmission.objects.all().delete()
+    output = import_csv(form, csv_path, "--skip-invalid")
+    assert "Row 2: contact.email" in output
+    assert "Skipped 1 invalid rows" in output
+    assert sorted(x.data["name"] for x in FormSubmission.objects.all()) == [
+        "Jane",
+        "Joe",
+    ]
+
+
+@pytest.mark.django_db
+def test_import(form, csv_path, tmp_path, django_assert_max_num_queries):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with django_assert_max_num_queries(12):
+        import_csv(form, csv_path, "--batch-size=2", "--checkpoint=%s" % checkpoint)
+
+    jane, john, joe = FormSubmission.objects.order_by("pk")
+    assert dict(jane.data) == {
+        "name": "Jane",
+        "contact.email": "jane@example.com",
+        "topics": ["A", "B"],
+    }
+    assert jane.submit_time.year == 2020
+    assert jane.search_document == "Jane jane@example.com A B"
+    assert jane.schema_digest == form.get_schema_digest()
+    assert joe.submit_time.year > 2020
+
+    # Starting again with the checkpoint does not import the rows twice
+    output = import_csv(form, csv_path, "--checkpoint=%s" % checkpoint)
+    assert "Done, imported 3 submissions" in output
+    assert FormSubmission.objects.count() == 3
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from tests.conftest import SETTINGS
+
+# Modules which are only needed to serve the admin, exports or webhooks
+LAZY_MODULES = [
+    "wagtail_model_forms.views",
+    "wagtail_model_forms.columnar",
+    "pyarrow",
+]
+
+SCRIPT = """
+import sys
+
+import django
+from django.conf import settings
+
+settings.configure(**%r)
+django.setup()
+
+import wagtail_model_forms.wagtail_hooks
+
+print("\\n".join(sys.modules))
+"""
+
+
+def get_imported_modules():
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT % SETTINGS],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.split()
+
+
+def test_admin_modules_are_imported_lazily():
+    # The import time itself depends on the machine, only check which modules
+    # are loaded at startup
+    modules = get_imported_modules()
+    for name in LAZY_MODULES:
+        assert name not in modules
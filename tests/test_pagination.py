@@ -0,0 +1,94 @@
+from functools import partial
+
+import pytest
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.testapp.models import Form
+from wagtail_model_forms import pagination
+from wagtail_model_forms.pagination import (
+    ESTIMATE,
+    EXACT,
+    LOWER_BOUND,
+    ApproximateCountPaginator,
+    CountlessPaginator,
+    get_approximate_count,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def create_forms(count):
+    Form.objects.bulk_create(Form(title="Form %s" % i, fields=[]) for i in range(count))
+    return Form.objects.order_by("pk")
+
+
+@pytest.mark.parametrize(
+    "rows,expected", [(3, (3, EXACT)), (5, (5, EXACT)), (6, (5, LOWER_BOUND))]
+)
+def test_approximate_count(rows, expected):
+    queryset = create_forms(rows)
+    with CaptureQueriesContext(connection) as context:
+        assert get_approximate_count(queryset, limit=5) == expected
+    # Without a planner estimate a single capped count is run
+    assert len(context.captured_queries) == 1
+    assert "EXPLAIN" not in context.captured_queries[0]["sql"]
+
+
+def test_approximate_count_estimate(monkeypatch):
+    queryset = create_forms(3)
+    monkeypatch.setattr(pagination, "get_estimated_count", lambda queryset: 1200)
+    assert get_approximate_count(queryset, limit=5) == (1200, ESTIMATE)
+    # A low estimate is counted exactly
+    assert get_approximate_count(queryset, limit=5000) == (3, EXACT)
+
+
+def test_approximate_count_paginator(monkeypatch):
+    queryset = create_forms(12)
+    monkeypatch.setattr(
+        pagination, "get_approximate_count", partial(get_approximate_count, limit=5)
+    )
+    paginator = ApproximateCountPaginator(queryset, 5)
+    assert paginator.count == 5
+    assert paginator.items_count_label == "5+ forms"
+
+    # Pages past the lower bound remain reachable
+    page = paginator.page(3)
+    assert len(page.object_list) == 2
+    assert not page.has_next()
+    assert paginator.num_pages == 3
+
+
+@pytest.mark.parametrize(
+    "rows,number,has_next,length,label",
+    [
+        (10, 1, True, 5, "5+ forms"),
+        (10, 2, False, 5, "10 forms"),
+        (11, 2, True, 5, "10+ forms"),
+        (11, 3, False, 1, "11 forms"),
+        (1, 1, False, 1, "1 form"),
+        (0, 1, False, 0, "0 forms"),
+    ],
+)
+def test_countless_paginator(rows, number, has_next, length, label):
+    paginator = CountlessPaginator(create_forms(rows), 5)
+    page = paginator.page(number)
+    assert len(page.object_list) == length
+    assert page.has_next() is has_next
+    assert page.has_previous() is (number > 1)
+    assert paginator.num_pages == number + int(has_next)
+    assert paginator.items_count_label == label
+
+
+def test_countless_paginator_out_of_range():
+    queryset = create_forms(10)
+    with CaptureQueriesContext(connection) as context:
+        paginator = CountlessPaginator(queryset, 5)
+        with pytest.raises(EmptyPage):
+            paginator.page(3)
+        with pytest.raises(EmptyPage):
+            paginator.page(0)
+        assert paginator.get_page("x").number == 1
+    # The queryset is never counted
+    assert not any("COUNT(" in x["sql"] for x in context.captured_queries)
@@ -0,0 +1,222 @@
+import json
+import time
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from wagtail.models import Page
+
+from tests.testapp.models import ExportJob, Form, FormPage, FormSubmission, UploadedFile
+from wagtail_model_forms import views
+from wagtail_model_forms.exports import run_export_job
+
+FORMS = 20
+PAGES = 10
+SUBMISSIONS = 3000
+FILE_EVERY = 3
+
+FIELDS = [
+    ("singleline", {"label": "Name", "help_text": "", "required": True}),
+    ("email", {"label": "Email", "help_text": "", "required": True}),
+    (
+        "fieldset",
+        {
+            "legend": "Details",
+            "form_fields": [
+                (
+                    "dropdown",
+                    {
+                        "label": "Country",
+                        "help_text": "",
+                        "required": False,
+                        "choices": [
+                            {"value": "NL", "default_value": False},
+                            {"value": "BE", "default_value": False},
+                        ],
+                    },
+                ),
+            ],
+        },
+    ),
+    ("file", {"label": "CV", "help_text": "", "required": False}),
+]
+
+
+def seed():
+    forms = [
+        Form.objects.create(title="Form %s" % i, fields=FIELDS) for i in range(FORMS)
+    ]
+    root = Page.objects.get(depth=1)
+    pages = [
+        root.add_child(
+            instance=FormPage(
+                title="Page %s" % i,
+                slug="page-%s" % i,
+                content=[("form", {"form": forms[i % FORMS]})],
+            )
+        )
+        for i in range(PAGES)
+    ]
+    FormSubmission.objects.bulk_create(
+        [
+            FormSubmission(
+                form=forms[i % FORMS],
+                page=pages[i % PAGES],
+                form_data=json.dumps(
+                    {
+                        "name": "Name %s" % i,
+                        "email": "name%s@example.com" % i,
+                        "details.country": "NL",
+                    }
+                ),
+                search_document="Name %s name%s@example.com NL" % (i, i),
+            )
+            for i in range(SUBMISSIONS)
+        ],
+        batch_size=1000,
+    )
+    UploadedFile.objects.bulk_create(
+        [
+            UploadedFile(form_submission=form_submission, file="uploads/%s.pdf" % i)
+            for i, form_submission in enumerate(
+                FormSubmission.objects.all()[::FILE_EVERY]
+            )
+        ],
+        batch_size=1000,
+    )
+
+
+@pytest.fixture(scope="module")
+def submissions(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        seed()
+    yield
+    with django_db_blocker.unblock():
+        UploadedFile.objects.all().delete()
+        FormSubmission.objects.all().delete()
+        Page.objects.type(FormPage).delete()
+        Form.objects.all().delete()
+
+
+@pytest.fixture
+def check_budget(admin_client, django_assert_max_num_queries):
+    """
+    Requests a URL and asserts an upper bound on its queries and wall-clock time.
+    """
+
+    def check(url, max_queries, max_seconds, method="get", data=None, status=200):
+        start = time.perf_counter()
+        with django_assert_max_num_queries(max_queries):
+            response = getattr(admin_client, method)(url, data)
+            if hasattr(response, "streaming_content"):
+                b"".join(response.streaming_content)
+        elapsed = time.perf_counter() - start
+        assert response.status_code == status
+        assert elapsed < max_seconds, "%s took %.2fs" % (url, elapsed)
+        return response
+
+    return check
+
+
+pytestmark = [pytest.mark.django_db, pytest.mark.usefixtures("submissions")]
+
+
+@pytest.fixture
+def form_submission():
+    return FormSubmission.objects.order_by("pk").first()
+
+
+def test_report(check_budget):
+    check_budget(reverse("form_submissions_report"), 12, 2)
+
+
+def test_report_results(check_budget):
+    check_budget(reverse("form_submissions_report_results"), 8, 2)
+
+
+def test_report_results_filtered(check_budget):
+    form = Form.objects.first()
+    check_budget(
+        reverse("form_submissions_report_results"),
+        8,
+        2,
+        data={"form_instance": form.pk, "q": "name", "status": "new", "p": 3},
+    )
+
+
+@pytest.mark.parametrize("export_format", ["csv", "xlsx"])
+def test_report_export(check_budget, export_format, monkeypatch):
+    # The export within the request, background exports are tested in test_exports
+    monkeypatch.setattr(views, "EXPORT_JOB_MODEL", "")
+    # The number of queries may not grow with the number of submissions
+    check_budget(
+        reverse("form_submissions_report"), 8, 10, data={"export": export_format}
+    )
+
+
+def test_detail(check_budget, form_submission):
+    check_budget(reverse("form_submissions_detail", args=[form_submission.pk]), 12, 1)
+
+
+def test_edit(check_budget, form_submission):
+    url = reverse("edit_form_submission", args=[form_submission.pk])
+    check_budget(url, 10, 1)
+    check_budget(url, 20, 1, method="post", data={"status": "completed"}, status=302)
+
+
+def test_delete(check_budget, form_submission):
+    url = reverse("delete_form_submission", args=[form_submission.pk])
+    check_budget(url, 10, 1)
+    # 18 plus one query to select the statistic counters of the submission
+    # and two to unlink its queued webhook payloads and webhook deliveries.
+    # The seeded submissions have no counters, so none are updated here.
+    check_budget(url, 21, 1, method="post", status=302)
+
+
+def test_statistics(check_budget):
+    form = Form.objects.first()
+    check_budget(reverse("form_statistics", args=[form.pk]), 10, 1)
+
+
+def test_dashboard(check_budget):
+    check_budget(reverse("wagtailadmin_home"), 22, 2)
+
+
+def test_update_search_index(django_assert_max_num_queries):
+    # A select and a bulk update per batch, the database may split the update
+    with django_assert_max_num_queries(SUBMISSIONS // 1000 * 6 + 2):
+        call_command("update_form_submissions_search_index", "--batch-size=1000")
+
+
+def test_rebuild_statistics(django_assert_max_num_queries):
+    start = time.perf_counter()
+    with django_assert_max_num_queries(FORMS * 6 + 2):
+        call_command("rebuild_form_statistics")
+    assert time.perf_counter() - start < 5
+
+
+def test_export_job(settings, tmp_path, django_assert_max_num_queries):
+    settings.MEDIA_ROOT = str(tmp_path)
+    job = ExportJob.objects.create(format="csv")
+    # A select of the submissions, one of their files and a progress update
+    # per chunk
+    start = time.perf_counter()
+    with django_assert_max_num_queries(SUBMISSIONS // 1000 * 3 + 4):
+        run_export_job(job, chunk_size=1000)
+    assert time.perf_counter() - start < 10
+
+
+def test_compress_form_submissions(django_assert_max_num_queries):
+    FormSubmission.objects.update(form_data=json.dumps({"name": "Name " * 200}))
+    # Two selects and a bulk update per batch, SQLite splits the update
+    start = time.perf_counter()
+    with django_assert_max_num_queries(SUBMISSIONS // 1000 * 8 + 1):
+        call_command(
+            "compress_form_submissions",
+            "--algorithm=zlib",
+            "--min-size=0",
+            "--batch-size=1000",
+            "--sleep=0",
+        )
+    assert time.perf_counter() - start < 10
+    assert FormSubmission.objects.first().form_data.startswith("~zlib:")
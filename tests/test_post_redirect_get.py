@@ -0,0 +1,69 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from tests.testapp.models import Form, FormSubmission
+from wagtail_model_forms import mixins
+from wagtail_model_forms.utils import get_success_token
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def post_redirect_get(monkeypatch):
+    monkeypatch.setattr(mixins, "POST_REDIRECT_GET", True)
+
+
+def get_form_action(client, url, params):
+    response = client.get(url, params)
+    action = re.search(r'action="([^"]*)"', response.content.decode()).group(1)
+    return action.replace("&amp;", "&")
+
+
+def test_redirect(client, form_page):
+    page, form = form_page
+    # Post the form as rendered on the page with campaign parameters
+    action = get_form_action(
+        client, page.url, {"utm_source": "mail", "tag": ["a", "b"]}
+    )
+    response = client.post(action, {"form_id": form.pk, "name": "Jane"})
+    assert response.status_code == 302
+    assert FormSubmission.objects.count() == 1
+
+    url = urlsplit(response["Location"])
+    assert url.path == page.url
+    assert parse_qs(url.query) == {
+        "utm_source": ["mail"],
+        "tag": ["a", "b"],
+        "form_success": [get_success_token(form.pk)],
+    }
+
+    response = client.get(response["Location"])
+    assert response.status_code == 200
+    assert b"Form success" in response.content
+    assert response["Cache-Control"] == "public, max-age=300"
+
+
+def test_invalid_submission(client, form_page):
+    page, form = form_page
+    response = client.post(page.url, {"form_id": form.pk, "name": ""})
+    assert response.status_code == 200
+    assert FormSubmission.objects.count() == 0
+
+
+@pytest.mark.parametrize("token", ["tampered", "other_form", "not_signed"])
+def test_invalid_token(client, form_page, form_fields, token):
+    page, form = form_page
+    other = Form.objects.create(title="Other", fields=form_fields)
+    token = {
+        "tampered": get_success_token(form.pk) + "x",
+        "other_form": get_success_token(other.pk),
+        "not_signed": str(form.pk),
+    }[token]
+
+    response = client.get(page.url, {"form_success": token})
+    assert response.status_code == 200
+    assert b"Form success" not in response.content
+    assert b'name="form_id"' in response.content
+    assert "no-cache" in response["Cache-Control"]
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from tests.conftest import FORM_FIELDS
+from tests.testapp.models import Form, FormPage
+from wagtail_model_forms.prefetch import get_form_map
+
+pytestmark = pytest.mark.django_db
+
+
+def create_page(slug, count):
+    forms = [
+        Form.objects.create(title="Form %s" % i, fields=FORM_FIELDS)
+        for i in range(count)
+    ]
+    return Page.objects.get(depth=2).add_child(
+        instance=FormPage(
+            title=slug,
+            slug=slug,
+            content=[("form", {"form": form}) for form in forms],
+        )
+    )
+
+
+def get_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [query["sql"] for query in context.captured_queries]
+
+
+def test_page_forms_single_query(client):
+    one = create_page("one", 1)
+    many = create_page("many", 5)
+    form_table = connection.ops.quote_name(Form._meta.db_table)
+
+    one_queries = get_queries(client, one.url)
+    many_queries = get_queries(client, many.url)
+
+    # The forms of all blocks are loaded together, the number of queries
+    # does not grow with the number of forms on the page
+    assert len(many_queries) == len(one_queries)
+    form_queries = [sql for sql in many_queries if "FROM %s" % form_table in sql]
+    assert len(form_queries) == 1
+
+
+def test_form_map_cleared(client):
+    page = create_page("contact", 2)
+    assert get_form_map() is None
+
+    client.get(page.url)
+    assert get_form_map() is None
+
+    response = client.post(page.url, {"form_id": Form.objects.first().pk})
+    assert response.status_code == 200
+    assert get_form_map() is None
+
+    # Also when the request fails
+    response = client.post(page.url, {"form_id": 0})
+    assert response.status_code == 404
+    assert get_form_map() is None
@@ -0,0 +1,153 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+from tests.testapp.models import Form, FormSubmission, UploadedFile
+from wagtail_model_forms.processing import (
+    EICAR_SIGNATURE,
+    claim_uploaded_files,
+    register_upload_processor,
+    reset_stale_uploaded_files,
+    unregister_upload_processor,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def create_uploaded_file(name, content):
+    form = Form.objects.create(title="Form", fields=[])
+    form_submission = FormSubmission.objects.create(
+        form=form, form_data=json.dumps({"name": "John"})
+    )
+    return UploadedFile.objects.create(
+        form_submission=form_submission,
+        file=default_storage.save(name, ContentFile(content)),
+    )
+
+
+def process():
+    call_command("process_uploaded_files", "--workers=1", stdout=io.StringIO())
+
+
+def test_process_uploaded_file():
+    uploaded_file = create_uploaded_file("cv.txt", b"curriculum vitae")
+    assert uploaded_file.status == UploadedFile.Status.PENDING
+
+    process()
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.PROCESSED
+    assert uploaded_file.processed_at is not None
+    assert len(uploaded_file.checksum) == 64
+
+
+def test_infected_file_is_removed():
+    uploaded_file = create_uploaded_file("eicar.txt", EICAR_SIGNATURE)
+    name = uploaded_file.file.name
+
+    process()
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.INFECTED
+    assert not uploaded_file.file
+    assert not default_storage.exists(name)
+    assert uploaded_file.form_submission.uploaded_file_download_urls == ""
+
+
+def test_large_image_is_downscaled(django_capture_on_commit_callbacks):
+    output = io.BytesIO()
+    Image.new("RGB", (4000, 1000), "red").save(output, "JPEG")
+    uploaded_file = create_uploaded_file("photo.jpg", output.getvalue())
+    name = uploaded_file.file.name
+
+    with django_capture_on_commit_callbacks(execute=True):
+        process()
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.PROCESSED
+    assert uploaded_file.file.name != name
+    assert not default_storage.exists(name)
+    with uploaded_file.file.open("rb") as f:
+        assert Image.open(f).size == (2048, 512)
+
+
+def test_extracted_text_is_searchable():
+    @register_upload_processor("test", order=50)
+    def set_text(uploaded_file):
+        uploaded_file.text = "extracted text"
+
+    try:
+        uploaded_file = create_uploaded_file("cv.pdf", b"%PDF-1.4")
+        process()
+    finally:
+        unregister_upload_processor("test")
+    form_submission = FormSubmission.objects.get(pk=uploaded_file.form_submission_id)
+    assert form_submission.search_document == "John extracted text"
+
+
+def test_failed_file_is_retried():
+    @register_upload_processor("test", order=50)
+    def fail(uploaded_file):
+        raise ValueError("Broken")
+
+    uploaded_file = create_uploaded_file("cv.txt", b"curriculum vitae")
+    try:
+        process()
+    finally:
+        unregister_upload_processor("test")
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.FAILED
+    assert uploaded_file.processing_error == "Broken"
+
+    call_command(
+        "process_uploaded_files", "--workers=1", "--retry", stdout=io.StringIO()
+    )
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.PROCESSED
+
+
+def test_failed_processing_deletes_written_files(tmp_path):
+    @register_upload_processor("test", order=50)
+    def fail(uploaded_file):
+        raise ValueError("Broken")
+
+    output = io.BytesIO()
+    Image.new("RGB", (4000, 1000), "red").save(output, "JPEG")
+    uploaded_file = create_uploaded_file("photo.jpg", output.getvalue())
+    try:
+        process()
+    finally:
+        unregister_upload_processor("test")
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.FAILED
+
+    # The downscaled file was rolled back, only the original is stored
+    assert [x.name for x in tmp_path.iterdir()] == ["photo.jpg"]
+    assert default_storage.exists(uploaded_file.file.name)
+
+
+def test_stale_processing_file_is_reset():
+    uploaded_file = create_uploaded_file("cv.txt", b"curriculum vitae")
+    assert claim_uploaded_files(10) == [uploaded_file.pk]
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.PROCESSING
+
+    # A file claimed by a running worker is left alone
+    assert reset_stale_uploaded_files() == 0
+
+    # The file of a worker which died is processed by the next run
+    UploadedFile.objects.filter(pk=uploaded_file.pk).update(
+        claimed_at=timezone.now() - timedelta(seconds=601)
+    )
+    process()
+    uploaded_file.refresh_from_db()
+    assert uploaded_file.status == UploadedFile.Status.PROCESSED
@@ -0,0 +1,116 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.urls import reverse
+
+from tests.testapp.models import (
+    ExportJob,
+    Form,
+    FormSchema,
+    FormSubmission,
+    FormSubmissionStatistic,
+    UploadedFile,
+    WebhookDelivery,
+    WebhookQueueItem,
+)
+from wagtail_model_forms import routers
+from wagtail_model_forms.routers import FormSubmissionRouter, use_write_database
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(routers, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def reads(settings, monkeypatch):
+    """
+    Routes the submission reads to a replica and records the aliases, the
+    queries still run on the default database.
+    """
+    settings.DATABASE_ROUTERS = ["wagtail_model_forms.routers.FormSubmissionRouter"]
+    monkeypatch.setattr(routers, "READ_DATABASE", "replica")
+    get_read_database = routers.get_read_database
+    aliases = []
+
+    def record():
+        aliases.append(get_read_database())
+        return None
+
+    monkeypatch.setattr(routers, "get_read_database", record)
+    return aliases
+
+
+@pytest.fixture
+def form_submission():
+    form = Form.objects.create(title="Form", fields=[])
+    return FormSubmission.objects.create(form=form, form_data=json.dumps({}))
+
+
+def test_router(monkeypatch):
+    monkeypatch.setattr(routers, "READ_DATABASE", "replica")
+    router = FormSubmissionRouter()
+    assert router.db_for_read(FormSubmission) == "replica"
+    assert router.db_for_write(FormSubmission) is None
+    assert router.db_for_read(Form) is None
+
+    with use_write_database():
+        assert router.db_for_read(FormSubmission) == "default"
+    assert router.db_for_read(FormSubmission) == "replica"
+
+    monkeypatch.setattr(routers, "WRITE_DATABASE", "primary")
+    assert router.db_for_write(FormSubmission) == "primary"
+    with use_write_database():
+        assert router.db_for_read(FormSubmission) == "primary"
+
+
+def test_router_models(monkeypatch):
+    monkeypatch.setattr(routers, "READ_DATABASE", "replica")
+    router = FormSubmissionRouter()
+    # Every model of the package is routed, the form model is not
+    for model in [
+        ExportJob,
+        FormSchema,
+        FormSubmissionStatistic,
+        UploadedFile,
+        WebhookDelivery,
+        WebhookQueueItem,
+    ]:
+        assert router.db_for_read(model) == "replica"
+    assert router.db_for_read(Form) is None
+
+    # Nothing is migrated on the replica
+    assert router.allow_migrate("replica", "testapp", "formsubmission") is False
+    assert router.allow_migrate("replica", "wagtailcore", "page") is False
+    assert router.allow_migrate("default", "testapp", "formsubmission") is None
+
+
+def test_read_your_writes(admin_client, reads, now, form_submission):
+    report_url = reverse("form_submissions_report")
+    edit_url = reverse("edit_form_submission", args=[form_submission.pk])
+
+    # Reads go to the replica
+    assert admin_client.get(report_url).status_code == 200
+    assert set(reads) == {"replica"}
+
+    # A write reads from the primary and pins the session to it
+    reads.clear()
+    response = admin_client.post(edit_url, {"status": "completed"})
+    assert response.status_code == 302
+    assert set(reads) == {"default"}
+
+    reads.clear()
+    now[0] += routers.READ_YOUR_WRITES_TIMEOUT - 1
+    admin_client.get(report_url)
+    assert set(reads) == {"default"}
+
+    # The pin expires
+    reads.clear()
+    now[0] += 2
+    admin_client.get(report_url)
+    assert set(reads) == {"replica"}
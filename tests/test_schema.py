@@ -0,0 +1,57 @@
+import pytest
+
+from tests.testapp.models import Form, FormSchema
+from wagtail_model_forms import models
+from wagtail_model_forms.schema import get_schema_digest, get_schema_fields
+
+pytestmark = pytest.mark.django_db
+
+FIELDS = [
+    ("singleline", {"label": "Name", "help_text": "", "required": True}),
+]
+
+
+def test_schema_snapshot(monkeypatch):
+    form = Form.objects.create(title="Form", fields=FIELDS)
+    digest = form.schema_digest
+    assert digest == get_schema_digest(get_schema_fields(form))
+
+    # Submissions use the digest stored with the form, the fields are only
+    # compiled once for the snapshot
+    calls = []
+    monkeypatch.setattr(
+        models, "get_schema_fields", lambda x: calls.append(x) or get_schema_fields(x)
+    )
+    form = Form.objects.get(pk=form.pk)
+    first = form.get_form_submission({"name": "Jane"})
+    second = form.get_form_submission({"name": "John"})
+    assert calls == []
+    assert first.schema_digest == second.schema_digest == digest
+    schema = FormSchema.objects.get()
+    assert (schema.form, schema.digest) == (form, digest)
+    assert schema.fields == [{"name": "name", "type": "singleline", "label": "Name"}]
+
+    # Changing the fields stores a new version, old submissions keep theirs
+    form.fields = [
+        ("singleline", {"label": "Full name", "help_text": "", "required": True})
+    ]
+    form.save()
+    assert form.schema_digest != digest
+    third = form.get_form_submission({"name": "Joe"})
+    assert FormSchema.objects.count() == 2
+    assert first.get_schema_fields()[0]["label"] == "Name"
+    assert third.get_schema_fields()[0]["label"] == "Full name"
+
+
+def test_schema_digest_missing():
+    form = Form.objects.create(title="Form", fields=FIELDS)
+    digest = form.schema_digest
+    Form.objects.filter(pk=form.pk).update(schema_digest="")
+
+    # Forms saved before the digest was stored get it on their next submission
+    form = Form.objects.get(pk=form.pk)
+    assert form.get_form_submission({"name": "Jane"}).schema_digest == digest
+    assert Form.objects.get(pk=form.pk).schema_digest == digest
+
+    form.save(update_fields=["title"])
+    assert Form.objects.get(pk=form.pk).schema_digest == digest
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connection
+from django.urls import reverse
+
+from tests.testapp.models import Form, FormSubmission
+from wagtail_model_forms.search import search_form_submissions
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def submissions():
+    form = Form.objects.create(title="Form", fields=[])
+    return [
+        FormSubmission.objects.create(form=form, form_data=json.dumps(form_data))
+        for form_data in [
+            {"name": "John Smith", "city": "Amsterdam"},
+            {"name": "Jane Smith", "city": "Rotterdam"},
+            {"name": "John Doe", "city": "Utrecht"},
+        ]
+    ]
+
+
+def test_search_fallback(submissions):
+    queryset = FormSubmission.objects.order_by("pk")
+    assert list(search_form_submissions(queryset, "smith")) == submissions[:2]
+    assert list(search_form_submissions(queryset, "john SMITH")) == submissions[:1]
+    assert list(search_form_submissions(queryset, "  ")) == submissions
+    assert "LIKE" in str(search_form_submissions(queryset, "smith").query)
+
+
+def test_search_postgresql(monkeypatch):
+    monkeypatch.setattr(connection, "vendor", "postgresql")
+    queryset = search_form_submissions(FormSubmission.objects.all(), "john smith")
+    assert isinstance(queryset.query.annotations["search"], SearchVector)
+    lookup = queryset.query.where.children[0]
+    assert lookup.lookup_name == "exact"
+    assert isinstance(lookup.rhs, SearchQuery)
+
+
+def test_report_search(admin_client, submissions):
+    response = admin_client.get(reverse("form_submissions_report"), {"q": "smith"})
+    assert [x.pk for x in response.context["object_list"]] == [
+        x.pk for x in reversed(submissions[:2])
+    ]
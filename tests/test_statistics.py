@@ -0,0 +1,136 @@
+import datetime
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import translation
+
+from tests.testapp.models import FormSubmission, FormSubmissionStatistic
+from wagtail_model_forms.statistics import get_form_statistics, record_form_submission
+
+pytestmark = pytest.mark.django_db
+
+FIELDS = [
+    ("singleline", {"label": "Name", "help_text": "", "required": True}),
+    (
+        "checkboxes",
+        {
+            "label": "Topics",
+            "help_text": "",
+            "required": False,
+            "choices": [
+                {"value": "News", "default_value": False},
+                {"value": "Events", "default_value": False},
+            ],
+        },
+    ),
+]
+
+
+@pytest.fixture
+def form_fields():
+    return FIELDS
+
+
+def get_counts(form):
+    return sorted(
+        FormSubmissionStatistic.objects.filter(form=form).values_list(
+            "date", "field_name", "value", "count"
+        )
+    )
+
+
+def test_statistics(client, form_page):
+    page, form = form_page
+    for topics in [["News"], ["News", "Events"], []]:
+        response = client.post(
+            page.url, {"form_id": form.pk, "name": "Jane", "topics": topics}
+        )
+        assert response.status_code == 200
+
+    statistics = get_form_statistics(form)
+    assert statistics["total"] == 3
+    assert statistics["choices"] == {"topics": [("News", 2), ("Events", 1)]}
+
+    FormSubmission.objects.filter(form=form).order_by("pk")[1].delete()
+    statistics = get_form_statistics(form)
+    assert statistics["total"] == 2
+    assert statistics["choices"] == {"topics": [("News", 1)]}
+    incremental = get_counts(form)
+
+    FormSubmissionStatistic.objects.all().delete()
+    call_command("rebuild_form_statistics", stdout=io.StringIO())
+    assert get_counts(form) == incremental
+
+
+def test_rebuild_statistics_matches_incremental(client, form_page):
+    page, form = form_page
+    for i in range(12):
+        client.post(
+            page.url,
+            {
+                "form_id": form.pk,
+                "name": "Jane",
+                "topics": [["News"], ["Events"], ["News", "Events"]][i % 3],
+            },
+        )
+    # Spread the submissions over several days
+    for i, pk in enumerate(FormSubmission.objects.values_list("pk", flat=True)):
+        FormSubmission.objects.filter(pk=pk).update(
+            submit_time=F("submit_time") - datetime.timedelta(days=i % 4)
+        )
+    FormSubmissionStatistic.objects.all().delete()
+    call_command("rebuild_form_statistics", stdout=io.StringIO())
+    rebuilt = get_counts(form)
+    assert sum(x[3] for x in rebuilt if not x[1]) == 12
+
+    for form_submission in FormSubmission.objects.all()[:5]:
+        form_submission.delete()
+    incremental = get_counts(form)
+    call_command("rebuild_form_statistics", stdout=io.StringIO())
+    assert get_counts(form) == incremental
+
+
+def test_form_delete(client, form_page):
+    page, form = form_page
+    client.post(page.url, {"form_id": form.pk, "name": "Jane", "topics": ["News"]})
+    page.delete()
+    form.delete()
+    assert not FormSubmissionStatistic.objects.exists()
+
+
+def test_record_batched(client, form_page):
+    page, form = form_page
+    client.post(page.url, {"form_id": form.pk, "name": "Jane", "topics": ["News"]})
+    form_submission = FormSubmission.objects.create(
+        form=form, form_data='{"name": "Jane", "topics": ["News", "Events"]}'
+    )
+    # One query for the existing counters, one to increment and one to insert
+    with CaptureQueriesContext(connection) as context:
+        record_form_submission(form_submission)
+    assert len(context.captured_queries) <= 5
+    assert get_form_statistics(form)["choices"] == {
+        "topics": [("News", 2), ("Events", 1)]
+    }
+
+
+def test_delete_after_form_change(client, form_page):
+    page, form = form_page
+    client.post(page.url, {"form_id": form.pk, "name": "Jane", "topics": ["News"]})
+
+    # The counters of the submission are removed with the fields it was stored with
+    form.fields = FIELDS[:1]
+    form.save()
+    FormSubmission.objects.get().delete()
+    assert get_counts(form) == []
+
+
+def test_summary_translation(admin_client, form_page):
+    page, form = form_page
+    admin_client.post(page.url, {"form_id": form.pk, "name": "Jane", "topics": []})
+    with translation.override("nl"):
+        response = admin_client.get("/admin/", HTTP_ACCEPT_LANGUAGE="nl")
+    assert "Formulierinzending" in response.content.decode()
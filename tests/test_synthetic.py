@@ -0,0 +1,45 @@
+import io
+import random
+
+import pytest
+from django.core.management import call_command
+
+from tests.testapp.models import Form, FormSubmission, UploadedFile
+from wagtail_model_forms.models import iter_form_fields
+from wagtail_model_forms.synthetic import get_percentile, get_random_fields
+
+
+def test_random_fields_are_nested():
+    fields = get_random_fields(random.Random(1), count=4, fieldsets=2, rows=1)
+    block_types = [block_type for block_type, value in fields]
+    assert block_types.count("fieldset") == 2
+    assert block_types.count("fieldrow") == 1
+
+
+@pytest.mark.django_db
+def test_generate_form_submissions():
+    call_command(
+        "generate_form_submissions",
+        "--forms=3",
+        "--submissions=500",
+        "--files=0.5",
+        "--batch-size=200",
+        "--seed=1",
+        stdout=io.StringIO(),
+    )
+    assert Form.objects.count() == 3
+    assert FormSubmission.objects.count() == 500
+    assert 150 < UploadedFile.objects.count() < 350
+
+    for form_submission in FormSubmission.objects.select_related("form")[:50]:
+        form = form_submission.form
+        names = {x for x, _, _ in iter_form_fields(form.get_form_fields())}
+        assert set(form_submission.data) <= names
+        assert form_submission.schema_digest == form.get_schema_digest()
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert get_percentile(values, 50) == 50
+    assert get_percentile(values, 99) == 99
+    assert get_percentile([], 50) == 0
@@ -0,0 +1,117 @@
+import re
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from tests.testapp.models import FormSubmission
+from wagtail_model_forms.uploads import get_upload_errors, sniff_content_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+
+DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+FIELDS = [
+    (
+        "file",
+        {
+            "label": "Upload",
+            "help_text": "",
+            "required": True,
+            "max_size": 1,
+            "allowed_types": "image/png",
+        },
+    )
+]
+
+
+@pytest.fixture(autouse=True)
+def upload_settings(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MIDDLEWARE = [
+        "wagtail_model_forms.middleware.UploadLimitMiddleware"
+    ] + settings.MIDDLEWARE
+
+
+@pytest.fixture
+def form_fields():
+    return FIELDS
+
+
+def post_file(client, form_page, content, content_type="image/png"):
+    page, form = form_page
+    return client.post(
+        "%s?form_id=%s" % (page.url, form.pk),
+        {
+            "form_id": form.pk,
+            "upload": SimpleUploadedFile("upload.png", content, content_type),
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    "data,default,expected",
+    [
+        (PNG, "text/plain", "image/png"),
+        (b"name,email\n", "text/csv", "text/csv"),
+        (b"name,email\n", "image/png", None),
+        (b"PK\x03\x04\x14\x00", DOCX, DOCX),
+        (b"PK\x03\x04\x14\x00", "image/png", "application/zip"),
+        (b"\x00\x00\x00\x18ftypheic", "image/heic", "image/heic"),
+    ],
+)
+def test_sniff_content_type(data, default, expected):
+    assert sniff_content_type(data, default=default) == expected
+
+
+@pytest.mark.django_db
+def test_upload_allowed(client, form_page):
+    response = post_file(client, form_page, PNG)
+    assert response.status_code == 200
+    assert FormSubmission.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_upload_too_large(client, form_page):
+    # Within the request limit, the file is skipped while it streams in
+    content = PNG + b"\x00" * 1024 * 1024
+    response = post_file(client, form_page, content)
+    assert response.status_code == 200
+    assert b"The file may not be larger than 1.0\xc2\xa0MB." in response.content
+    assert "upload" in get_upload_errors(response.wsgi_request)
+    assert FormSubmission.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_upload_type_not_allowed(client, form_page):
+    response = post_file(client, form_page, b"<?php echo 1; ?>")
+    assert response.status_code == 200
+    assert b"This file type is not allowed." in response.content
+    assert "upload" in get_upload_errors(response.wsgi_request)
+    assert FormSubmission.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_upload_request_too_large(client, form_page):
+    # Larger than all the limits together, refused on its Content-Length
+    response = post_file(client, form_page, PNG + b"\x00" * 3 * 1024 * 1024)
+    assert response.status_code == 413
+    assert FormSubmission.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_form_action(client, form_page):
+    page, form = form_page
+    response = client.get(page.url, {"utm_source": "mail", "form_id": "1"})
+    action = re.search(r'action="([^"]*)"', response.content.decode()).group(1)
+    # The query string is kept, the form_id tells the middleware the limits
+    assert action == "%s?utm_source=mail&amp;form_id=%s" % (page.url, form.pk)
+
+    response = client.post(
+        action.replace("&amp;", "&"),
+        {
+            "form_id": form.pk,
+            "upload": SimpleUploadedFile("upload.png", PNG + b"\x00" * 1024 * 1024),
+        },
+    )
+    assert "upload" in get_upload_errors(response.wsgi_request)
@@ -0,0 +1,43 @@
+import json
+import warnings
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from tests.testapp.models import Form, FormSubmission, UploadedFile
+from wagtail_model_forms.schema import get_schema_fields
+
+pytestmark = pytest.mark.django_db
+
+FIELDS = [("singleline", {"label": "<b>Name</b>", "help_text": "", "required": True})]
+
+
+def test_detail_view_escapes(admin_client, settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    form = Form.objects.create(title="Form", fields=FIELDS)
+    name = get_schema_fields(form)[0]["name"]
+    form_submission = FormSubmission.objects.create(
+        form=form,
+        form_data=json.dumps({name: "<script>alert(1)</script>"}),
+    )
+    UploadedFile.objects.create(
+        form_submission=form_submission,
+        file=default_storage.save("<i>report</i>.pdf", ContentFile(b"%PDF-1.4")),
+    )
+    UploadedFile.objects.create(
+        form_submission=form_submission, file="", status=UploadedFile.Status.INFECTED
+    )
+
+    url = reverse("form_submissions_detail", args=[form_submission.pk])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in content
+    assert "<script>alert(1)" not in content
+    assert "&lt;b&gt;Name&lt;/b&gt;:" in content
+    assert "&lt;i&gt;report&lt;/i&gt;.pdf</a></li>" in content
+    assert "<li>Infected</li>" in content
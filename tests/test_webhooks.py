@@ -0,0 +1,276 @@
+import io
+import json
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from tests.testapp.models import (
+    Form,
+    FormSubmission,
+    WebhookDelivery,
+    WebhookQueueItem,
+)
+from wagtail_model_forms import webhooks
+from wagtail_model_forms.webhooks import (
+    CircuitBreaker,
+    CircuitOpenError,
+    claim_items,
+    enqueue_webhook,
+    send_request,
+    send_webhook_batches,
+)
+
+pytestmark = pytest.mark.django_db
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+WEBHOOK = {
+    "url": "https://example.com/hook",
+    "method": "post",
+    "request_headers": [],
+    "request_body": "",
+    "batch_enabled": True,
+    "batch_size": 4,
+    "batch_max_latency": 60,
+}
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = ""
+
+
+@pytest.fixture
+def form_submissions():
+    form = Form.objects.create(title="Form", fields=[])
+    return [
+        FormSubmission.objects.create(form=form, form_data=json.dumps({"name": name}))
+        for name in ["a", "b", "c", "d"]
+    ]
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """
+    Records the JSON payloads of the requests, the status code is 400 for a
+    request with the payload of "c" and 200 otherwise.
+    """
+    calls = []
+
+    def request(method, url, **kwargs):
+        names = [payload["name"] for payload in kwargs["json"]]
+        calls.append(names)
+        return Response(400 if "c" in names else 200)
+
+    monkeypatch.setattr(requests, "request", request)
+    return calls
+
+
+def test_enqueue_webhook_batch(form_submissions, sent):
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+    # A full batch is left to the worker
+    assert sent == []
+    assert WebhookQueueItem.objects.filter(status="pending").count() == 4
+
+    send_webhook_batches()
+    assert sent[0] == ["a", "b", "c", "d"]
+
+
+def test_send_webhook_batch_split(form_submissions, sent):
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+    send_webhook_batches()
+
+    # The rejected batch is split in halves until the bad payload is isolated,
+    # which is rejected for good
+    assert sent == [["a", "b", "c", "d"], ["a", "b"], ["c", "d"], ["c"], ["d"]]
+    statuses = dict(WebhookQueueItem.objects.values_list("payload__name", "status"))
+    assert statuses == {"a": "sent", "b": "sent", "c": "failed", "d": "sent"}
+    assert WebhookQueueItem.objects.get(payload__name="c").attempts == 1
+
+
+def test_send_webhook_batch_too_many_requests(form_submissions, monkeypatch):
+    monkeypatch.setattr(requests, "request", lambda *args, **kwargs: Response(429))
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+    send_webhook_batches()
+
+    # Not a rejection, the batch is retried as a whole
+    items = WebhookQueueItem.objects.all()
+    assert {(item.status, item.attempts) for item in items} == {("pending", 1)}
+
+
+def test_claim_items(form_submissions, sent):
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+    endpoint = WebhookQueueItem.objects.first().endpoint
+
+    # Claimed payloads are not claimed again by another worker
+    claimed = claim_items(endpoint, 3)
+    assert [item.payload["name"] for item in claimed] == ["a", "b", "c"]
+    assert [item.payload["name"] for item in claim_items(endpoint, 3)] == ["d"]
+    assert claim_items(endpoint, 3) == []
+
+    # Payloads left sending by a killed worker are sent again after the timeout
+    old = timezone.now() - timedelta(seconds=601)
+    WebhookQueueItem.objects.filter(pk=claimed[0].pk).update(
+        claimed_at=old, created_at=old
+    )
+    send_webhook_batches()
+    assert sent == [["a"]]
+    statuses = dict(WebhookQueueItem.objects.values_list("payload__name", "status"))
+    assert statuses == {"a": "sent", "b": "sending", "c": "sending", "d": "sending"}
+
+
+def test_send_webhook_batch_circuit_open(form_submissions, sent, monkeypatch):
+    allowed = iter([True, True])
+    monkeypatch.setattr(
+        CircuitBreaker, "allow_request", lambda self: next(allowed, False)
+    )
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+    send_webhook_batches()
+
+    # The circuit opens after the first half was delivered, only the
+    # undelivered half is requeued and it does not count as an attempt
+    assert sent == [["a", "b", "c", "d"], ["a", "b"]]
+    items = WebhookQueueItem.objects.order_by("pk")
+    assert [(item.status, item.attempts) for item in items] == [
+        ("sent", 0),
+        ("sent", 0),
+        ("pending", 0),
+        ("pending", 0),
+    ]
+
+
+def test_send_webhook_batch_retry(form_submissions, monkeypatch):
+    def request(method, url, **kwargs):
+        raise requests.ConnectionError("Connection refused")
+
+    monkeypatch.setattr(requests, "request", request)
+    monkeypatch.setattr(webhooks, "WEBHOOK_MAX_ATTEMPTS", 3)
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+
+    delays = []
+    for attempt in range(3):
+        start = timezone.now()
+        send_webhook_batches()
+        items = WebhookQueueItem.objects.all()
+        assert {item.attempts for item in items} == {attempt + 1}
+        if attempt < 2:
+            delays.append((items[0].next_attempt_at - start).total_seconds())
+            # The payloads are not due before their next attempt
+            assert send_webhook_batches() == 0
+            items.update(next_attempt_at=timezone.now())
+
+    # Exponential backoff, then the payloads fail for good
+    assert [round(delay) for delay in delays] == [30, 60]
+    assert set(WebhookQueueItem.objects.values_list("status", flat=True)) == {"failed"}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+def test_circuit_breaker(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        webhooks,
+        "time",
+        SimpleNamespace(time=lambda: now[0], perf_counter=time.perf_counter),
+    )
+    monkeypatch.setattr(webhooks, "WEBHOOK_BREAKER_THRESHOLD", 2)
+    breaker = CircuitBreaker("https://example.com")
+
+    # Closed until the threshold of consecutive failures
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    # Half-open after the cooldown, a single probe is let through
+    now[0] += 61
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    # A failing probe opens the circuit again
+    breaker.record_failure()
+    assert not breaker.allow_request()
+    now[0] += 61
+    assert breaker.allow_request()
+
+    # A successful probe closes it
+    breaker.record_success()
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+    assert breaker.get_state() == {"failures": 0, "opened_at": None}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+def test_delivery_log(form_submissions, monkeypatch):
+    responses = iter([Response(200), Response(503), requests.Timeout("Timed out")])
+
+    def request(method, url, **kwargs):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(requests, "request", request)
+    monkeypatch.setattr(webhooks, "WEBHOOK_BREAKER_THRESHOLD", 2)
+    url = WEBHOOK["url"]
+    form_submission = form_submissions[0]
+
+    send_request("POST", url, form_submission=form_submission, json={})
+    send_request("POST", url, form_submission=form_submission, json={})
+    with pytest.raises(requests.Timeout):
+        send_request("POST", url, form_submission=form_submission, json={})
+    with pytest.raises(CircuitOpenError):
+        send_request("POST", url, form_submission=form_submission, json={})
+
+    deliveries = WebhookDelivery.objects.order_by("pk")
+    assert [(d.status, d.response_code) for d in deliveries] == [
+        ("success", 200),
+        ("failed", 503),
+        ("failed", None),
+        ("short_circuited", None),
+    ]
+    assert deliveries[2].error == "Timed out"
+    assert deliveries[0].latency is not None
+    assert {d.target for d in deliveries} == {"https://example.com"}
+    assert {d.form_submission_id for d in deliveries} == {form_submission.pk}
+
+
+def test_prune_webhooks(form_submissions):
+    for form_submission in form_submissions:
+        enqueue_webhook(WEBHOOK, form_submission)
+        WebhookDelivery.objects.create(
+            target="https://example.com", method="POST", url=WEBHOOK["url"]
+        )
+    old = timezone.now() - timedelta(days=31)
+    WebhookQueueItem.objects.filter(payload__name__in=["a", "b"]).update(
+        status="sent", created_at=old
+    )
+    # Pending payloads are kept whatever their age
+    WebhookQueueItem.objects.filter(payload__name="c").update(created_at=old)
+    WebhookDelivery.objects.filter(
+        pk__in=WebhookDelivery.objects.order_by("pk").values("pk")[:3]
+    ).update(created_at=old)
+
+    stdout = io.StringIO()
+    call_command("prune_webhooks", "--batch-size=1", stdout=stdout)
+    assert "Deleted 2 webhook payloads and 3 webhook deliveries" in stdout.getvalue()
+    assert sorted(WebhookQueueItem.objects.values_list("payload__name", flat=True)) == [
+        "c",
+        "d",
+    ]
+    assert WebhookDelivery.objects.count() == 1
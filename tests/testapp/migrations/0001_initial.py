@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:03
+
+import django.core.serializers.json
+import django.db.models.deletion
+import wagtail.fields
+import wagtail_model_forms.choices
+import wagtail_model_forms.mixins
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('wagtailcore', '0098_apitoken'),
+        migrations.swappable_dependency(settings.WAGTAIL_PAGE_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Form',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fields', wagtail.fields.StreamField([('fieldset', 32), ('fieldrow', 30), ('singleline', 6), ('multiline', 6), ('email', 6), ('url', 6), ('number', 9), ('date', 12), ('datetime', 15), ('dropdown', 20), ('radio', 20), ('checkbox', 22), ('checkboxes', 20), ('multiselect', 20), ('choicesource', 24), ('file', 28), ('hidden', 25)], blank=True, block_lookup={0: ('wagtail.blocks.CharBlock', (), {'label': 'Legend'}), 1: ('wagtail.blocks.CharBlock', (), {'label': 'Label'}), 2: ('wagtail.blocks.RichTextBlock', (), {'features': ['link', 'document-link'], 'label': 'Help text', 'required': False}), 3: ('wagtail.blocks.BooleanBlock', (), {'default': True, 'help_text': 'Check this box if this field is required to be filled in', 'label': 'Required', 'required': False}), 4: ('wagtail.blocks.CharBlock', (), {'label': 'Default value', 'required': False}), 5: ('wagtail.blocks.CharBlock', (), {'label': 'Placeholder', 'required': False}), 6: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('default_value', 4), ('placeholder', 5)]], {}), 7: ('wagtail.blocks.IntegerBlock', (), {'label': 'Default value', 'required': False}), 8: ('wagtail.blocks.IntegerBlock', (), {'label': 'Placeholder', 'required': False}), 9: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('default_value', 7), ('placeholder', 8)]], {}), 10: ('wagtail.blocks.DateBlock', (), {'label': 'Default value', 'required': False}), 11: ('wagtail.blocks.DateBlock', (), {'label': 'Placeholder', 'required': False}), 12: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('default_value', 10), ('placeholder', 11)]], {}), 13: ('wagtail.blocks.DateTimeBlock', (), {'label': 'Default value', 'required': False}), 14: ('wagtail.blocks.DateTimeBlock', (), {'label': 'Placeholder', 'required': False}), 15: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('default_value', 13), ('placeholder', 14)]], {}), 16: ('wagtail.blocks.CharBlock', (), {'label': 'Choice'}), 17: ('wagtail.blocks.BooleanBlock', (), {'help_text': 'Check this box if you want this to be checked by default', 'label': 'Checked by default', 'required': False}), 18: ('wagtail.blocks.StructBlock', [[('value', 16), ('default_value', 17)]], {}), 19: ('wagtail.blocks.ListBlock', (18,), {'label': 'Choices'}), 20: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('choices', 19)]], {}), 21: ('wagtail.blocks.BooleanBlock', (), {'label': 'Checked by default', 'required': False}), 22: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('default_value', 21)]], {}), 23: ('wagtail.blocks.ChoiceBlock', [], {'choices': wagtail_model_forms.choices.get_choice_source_choices, 'help_text': 'The registered source the choices are loaded from', 'label': 'Source'}), 24: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('placeholder', 5), ('source', 23)]], {}), 25: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3)]], {}), 26: ('wagtail.blocks.IntegerBlock', (), {'label': 'Max size (MB)', 'min_value': 1, 'required': False}), 27: ('wagtail.blocks.CharBlock', (), {'help_text': 'Comma-separated list of MIME types, e.g. application/pdf, image/*', 'label': 'Allowed file types', 'required': False}), 28: ('wagtail.blocks.StructBlock', [[('label', 1), ('help_text', 2), ('required', 3), ('max_size', 26), ('allowed_types', 27)]], {}), 29: ('wagtail.blocks.StreamBlock', [[('singleline', 6), ('multiline', 6), ('email', 6), ('url', 6), ('number', 9), ('date', 12), ('datetime', 15), ('dropdown', 20), ('radio', 20), ('checkbox', 22), ('checkboxes', 20), ('choicesource', 24), ('hidden', 25), ('multiselect', 20), ('file', 28)]], {'icon': 'form', 'use_json_field': True, 'verbose_name': 'Form fields'}), 30: ('wagtail.blocks.StructBlock', [[('form_fields', 29)]], {}), 31: ('wagtail.blocks.StreamBlock', [[('fieldrow', 30), ('singleline', 6), ('multiline', 6), ('email', 6), ('url', 6), ('number', 9), ('date', 12), ('datetime', 15), ('dropdown', 20), ('radio', 20), ('checkbox', 22), ('checkboxes', 20), ('choicesource', 24), ('hidden', 25), ('multiselect', 20), ('file', 28)]], {'icon': 'form', 'use_json_field': True, 'verbose_name': 'Form fields'}), 32: ('wagtail.blocks.StructBlock', [[('legend', 0), ('form_fields', 31)]], {})}, null=True, verbose_name='Form fields')),
+                ('title', models.CharField(max_length=255, verbose_name='title')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FormPage',
+            fields=[
+                ('page_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to=settings.WAGTAIL_PAGE_MODEL)),
+                ('content', wagtail.fields.StreamField([('form', 1)], blank=True, block_lookup={0: ('wagtail_model_forms.blocks.FormChooserBlock', ('testapp.Form',), {}), 1: ('wagtail.blocks.StructBlock', [[('form', 0)]], {})})),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=(wagtail_model_forms.mixins.FormSnippetMixin, 'wagtailcore.page'),
+        ),
+        migrations.CreateModel(
+            name='FormSubmission',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('form_data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('submit_time', models.DateTimeField(auto_now_add=True, verbose_name='submit time')),
+                ('status', models.CharField(choices=[('new', 'New'), ('completed', 'Completed')], default='new', max_length=255, verbose_name='Status')),
+                ('search_document', models.TextField(blank=True, default='', editable=False, verbose_name='Search document')),
+                ('schema_digest', models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64, verbose_name='Schema digest')),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='testapp.form', verbose_name='Form')),
+                ('page', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.WAGTAIL_PAGE_MODEL, verbose_name='Page')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadedFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='')),
+                ('checksum', models.CharField(blank=True, db_index=True, editable=False, max_length=64, verbose_name='Checksum')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('form_submission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploaded_files', to='testapp.formsubmission')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='FormSubmissionStatistic',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('field_name', models.CharField(blank=True, max_length=255, verbose_name='Field name')),
+                ('value', models.CharField(blank=True, max_length=255, verbose_name='Value')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='testapp.form', verbose_name='Form')),
+            ],
+            options={
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('form', 'date', 'field_name', 'value'), name='testapp_formsubmissionstatistic_unique')],
+            },
+        ),
+    ]
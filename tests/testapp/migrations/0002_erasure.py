@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:12
+
+import django.db.models.deletion
+import wagtail.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='form',
+            name='erasure_rules',
+            field=wagtail.fields.StreamField([('rule', 4)], blank=True, block_lookup={0: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('singleline', 'Singleline text'), ('multiline', 'Multiline text'), ('email', 'Email'), ('url', 'URL'), ('number', 'Number'), ('date', 'Date'), ('datetime', 'Date and time'), ('dropdown', 'Dropdown'), ('radio', 'Radio group'), ('checkbox', 'Checkbox'), ('checkboxes', 'Checkboxes'), ('choicesource', 'Choices from source'), ('hidden', 'hidden'), ('multiselect', 'Multiselect'), ('file', 'File')], 'help_text': 'Apply the rule to all fields of this type', 'label': 'Field type', 'required': False}), 1: ('wagtail.blocks.CharBlock', (), {'help_text': 'Apply the rule to the field with this name, e.g. email or details.email', 'label': 'Field name', 'required': False}), 2: ('wagtail.blocks.ChoiceBlock', [], {'choices': [('erase', 'Erase'), ('pseudonymize', 'Pseudonymize')], 'help_text': 'Erasing a file field deletes the uploaded files of the submission', 'label': 'Action'}), 3: ('wagtail.blocks.IntegerBlock', (), {'default': 90, 'help_text': 'Apply the rule to submissions older than this number of days', 'label': 'After days', 'min_value': 0}), 4: ('wagtail.blocks.StructBlock', [[('field_type', 0), ('field_name', 1), ('action', 2), ('after_days', 3)]], {})}, help_text='Erase or pseudonymize fields of old submissions, applied by the erase_form_submissions command', null=True, verbose_name='Erasure rules'),
+        ),
+        migrations.CreateModel(
+            name='ErasureCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(max_length=64, verbose_name='Rule')),
+                ('digest', models.CharField(max_length=64, verbose_name='Digest')),
+                ('last_pk', models.BigIntegerField(default=0, verbose_name='Last processed submission')),
+                ('processed', models.PositiveBigIntegerField(default=0, verbose_name='Processed')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='testapp.form', verbose_name='Form')),
+            ],
+            options={
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('form', 'rule'), name='testapp_erasurecheckpoint_unique')],
+            },
+        ),
+    ]
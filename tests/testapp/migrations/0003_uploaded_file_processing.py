@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0002_erasure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Processed at'),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='processing_error',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Processing error'),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('infected', 'Infected'), ('failed', 'Failed')], db_index=True, default='pending', editable=False, max_length=32, verbose_name='Status'),
+        ),
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='text',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Text'),
+        ),
+    ]
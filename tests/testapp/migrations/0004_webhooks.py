@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0003_uploaded_file_processing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target', models.CharField(db_index=True, max_length=255, verbose_name='Target')),
+                ('method', models.CharField(max_length=10, verbose_name='Method')),
+                ('url', models.TextField(verbose_name='URL')),
+                ('status', models.CharField(choices=[('success', 'Success'), ('failed', 'Failed'), ('short_circuited', 'Short-circuited')], max_length=20, verbose_name='Status')),
+                ('response_code', models.PositiveIntegerField(blank=True, null=True, verbose_name='Response code')),
+                ('response_body', models.TextField(blank=True, verbose_name='Response body')),
+                ('latency', models.FloatField(blank=True, null=True, verbose_name='Latency (ms)')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('form_submission', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='testapp.formsubmission')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='WebhookQueueItem',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('endpoint', models.CharField(db_index=True, max_length=64, verbose_name='Endpoint')),
+                ('method', models.CharField(max_length=10, verbose_name='Method')),
+                ('url', models.TextField(verbose_name='URL')),
+                ('headers', models.JSONField(blank=True, null=True, verbose_name='Request headers')),
+                ('payload', models.JSONField(blank=True, null=True, verbose_name='Payload')),
+                ('batched', models.BooleanField(default=True, verbose_name='Batched')),
+                ('batch_size', models.PositiveIntegerField(default=1, verbose_name='Batch size')),
+                ('max_latency', models.PositiveIntegerField(default=0, verbose_name='Max latency')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20, verbose_name='Status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='sent at')),
+                ('form_submission', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='testapp.formsubmission')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
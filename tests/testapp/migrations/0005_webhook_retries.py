@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0004_webhooks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookqueueitem',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='next attempt at'),
+        ),
+        migrations.AlterField(
+            model_name='webhookdelivery',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='created at'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0005_webhook_retries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookqueueitem',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='claimed at'),
+        ),
+    ]
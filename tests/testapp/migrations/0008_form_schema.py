@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0007_export_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='form',
+            name='schema_digest',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='Schema digest'),
+        ),
+        migrations.CreateModel(
+            name='FormSchema',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(db_index=True, max_length=64, verbose_name='Digest')),
+                ('fields', models.JSONField(default=list, verbose_name='Fields')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('form', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='testapp.form', verbose_name='Form')),
+            ],
+            options={
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('form', 'digest'), name='testapp_formschema_unique')],
+            },
+        ),
+    ]
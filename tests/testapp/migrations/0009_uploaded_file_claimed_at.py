@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0008_form_schema'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadedfile',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Claimed at'),
+        ),
+    ]
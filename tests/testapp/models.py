@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from wagtail.fields import StreamField
+from wagtail.models import Page
+from wagtail.snippets.models import register_snippet
+
+from wagtail_model_forms.blocks import FormBlock
+from wagtail_model_forms.mixins import FormSnippetMixin
+from wagtail_model_forms.models import (
+    AbstractErasureCheckpoint,
+    AbstractExportJob,
+    AbstractForm,
+    AbstractFormSchema,
+    AbstractFormSubmission,
+    AbstractFormSubmissionStatistic,
+    AbstractUploadedFile,
+    AbstractWebhookDelivery,
+    AbstractWebhookQueueItem,
+    ErasureFormMixin,
+    StatisticsFormMixin,
+)
+
+
+class FormSubmission(AbstractFormSubmission):
+    form = models.ForeignKey(
+        "Form",
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Form"),
+    )
+
+
+class UploadedFile(AbstractUploadedFile):
+    pass
+
+
+class FormSubmissionStatistic(AbstractFormSubmissionStatistic):
+    pass
+
+
+class ErasureCheckpoint(AbstractErasureCheckpoint):
+    pass
+
+
+class ExportJob(AbstractExportJob):
+    pass
+
+
+class FormSchema(AbstractFormSchema):
+    pass
+
+
+class WebhookQueueItem(AbstractWebhookQueueItem):
+    pass
+
+
+class WebhookDelivery(AbstractWebhookDelivery):
+    pass
+
+
+@register_snippet
+class Form(ErasureFormMixin, StatisticsFormMixin, AbstractForm):
+    pass
+
+
+class FormPage(FormSnippetMixin, Page):
+    streamfields = ["content"]
+
+    content = StreamField([("form", FormBlock())], blank=True)